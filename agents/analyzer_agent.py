@@ -168,22 +168,21 @@ class AnalyzerAgentV2(BaseAgent):
             return state
 
         # Rank by ROI (descending)
-        sorted_predictions = dict(
-            sorted(roi_predictions.items(), key=lambda x: x[1].roi, reverse=True)
-        )
+        ranked = sorted(roi_predictions.items(), key=lambda x: x[1].roi, reverse=True)
 
-        state.roi_predictions = sorted_predictions
+        state.roi_predictions = dict(ranked)
 
         # Create recommendations (top 5)
         state.final_recommendations = {
             loc: pred.roi
-            for loc, pred in list(sorted_predictions.items())[:5]
+            for loc, pred in ranked[:5]
         }
 
+        top_location, top_prediction = ranked[0]
         self.log_info(f"✓ Generated ROI predictions for {len(roi_predictions)} locations")
         self.log_info(
-            f"✓ Top recommendation: {list(sorted_predictions.keys())[0]} "
-            f"(ROI: {list(sorted_predictions.values())[0].roi})"
+            f"✓ Top recommendation: {top_location} "
+            f"(ROI: {top_prediction.roi})"
         )
 
         return state
@@ -3,17 +3,11 @@ Base agent class that all specialized agents inherit from.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 import logging
 import time
 from models.schemas import PlacementState
-from utils.state_logger import get_state_logger
-
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from utils.state_logger import NullStateLogger, StateLogger, get_state_logger
 
 
 class BaseAgent(ABC):
@@ -41,21 +35,27 @@ class BaseAgent(ABC):
         self.state_logger = get_state_logger() if enable_state_logging else None
         self.step_number: Optional[int] = None
 
-    def execute_with_logging(self, state: PlacementState) -> PlacementState:
+    def execute_with_logging(self, state: PlacementState,
+                             state_logger: Optional[Union[StateLogger, NullStateLogger]] = None
+                             ) -> PlacementState:
         """
         Execute agent with automatic state logging.
 
         Args:
             state: Current placement state
+            state_logger: Logger for this call, overriding the agent's own
+                (agents may be shared by callers with different loggers)
 
         Returns:
             Updated placement state
         """
         start_time = time.time()
+        if state_logger is None:
+            state_logger = self.state_logger
 
         # Log input state
-        if self.state_logger:
-            self.state_logger.log_agent_input(
+        if state_logger:
+            state_logger.log_agent_input(
                 agent_name=self.name,
                 state=state,
                 step_number=self.step_number
@@ -69,8 +69,8 @@ class BaseAgent(ABC):
             execution_time = time.time() - start_time
 
             # Log output state
-            if self.state_logger:
-                self.state_logger.log_agent_output(
+            if state_logger:
+                state_logger.log_agent_output(
                     agent_name=self.name,
                     state=output_state,
                     step_number=self.step_number,
@@ -85,8 +85,8 @@ class BaseAgent(ABC):
 
         except Exception as e:
             # Log error
-            if self.state_logger:
-                self.state_logger.log_error(
+            if state_logger:
+                state_logger.log_error(
                     agent_name=self.name,
                     error=e,
                     state=state
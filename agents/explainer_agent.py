@@ -4,10 +4,14 @@ Uses LLM for natural language generation when available.
 """
 
 import json
+import os
 import random
 from datetime import datetime, timedelta
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from statistics import fmean
+from typing import Dict, List, Optional, Tuple
 from .base_agent import BaseAgent
 from models.schemas import (
     PlacementState, Explanation, FeatureImportance,
@@ -16,11 +20,14 @@ from models.schemas import (
 
 # Import LLM client
 try:
-    from utils.llm_client import get_llm_client
+    from utils.llm_client import BATCH_TERMINAL_STATUSES, get_llm_client
     LLM_AVAILABLE = True
 except ImportError:
     LLM_AVAILABLE = False
 
+# Concurrent LLM requests when explaining several locations at once
+EXPLAIN_MAX_PARALLEL = int(os.getenv("LLM_MAX_PARALLEL", "8"))
+
 
 class ExplainerAgent(BaseAgent):
     """
@@ -58,6 +65,16 @@ class ExplainerAgent(BaseAgent):
                 self.logger.warning(f"Could not initialize LLM client: {e}")
                 self.llm_client = None
 
+    def prewarm(self):
+        """
+        Prepare the LLM connection before execute() needs it.
+
+        Has no dependency on the analysis, so the orchestrator runs it while
+        ROI scoring is still in progress.
+        """
+        if self.llm_client and self.llm_client.enabled:
+            self.llm_client.warm_up()
+
     def execute(self, state: PlacementState) -> PlacementState:
         """
         Generate comprehensive explanation for recommendations.
@@ -74,7 +91,7 @@ class ExplainerAgent(BaseAgent):
         self.log_info("Generating explanations for recommendations")
 
         # Get top recommendation
-        top_location = list(state.final_recommendations.keys())[0]
+        top_location = next(iter(state.final_recommendations))
         top_roi = state.final_recommendations[top_location]
 
         # Try LLM-powered explanation first if available
@@ -88,28 +105,73 @@ class ExplainerAgent(BaseAgent):
                 self.logger.warning(f"LLM explanation failed, falling back to templates: {e}")
 
         # Fallback to template-based explanations
-        feature_importance_text = self._generate_feature_importance(state, top_location)
-        historical_evidence_text = self._generate_historical_evidence(state, top_location)
-        competitor_benchmark_text = self._generate_competitor_benchmark(state, top_location)
-        counterfactual_text = self._generate_counterfactual(state, top_location)
-        confidence_text = self._generate_confidence_assessment(state, top_location)
-
-        # Create explanation object
-        explanation = Explanation(
-            location=top_location,
-            roi_score=top_roi,
-            feature_importance=feature_importance_text,
-            historical_evidence=historical_evidence_text,
-            competitor_benchmark=competitor_benchmark_text,
-            counterfactual=counterfactual_text,
-            confidence_assessment=confidence_text
-        )
-
-        state.explanation = explanation
+        state.explanation = self._template_explanation(state, top_location, top_roi)
         self.log_info(f"Generated comprehensive explanation for {top_location}")
 
         return state
 
+    async def aexplain_locations(self, state: PlacementState, top_k: int = 5) -> Dict[str, Explanation]:
+        """
+        Explain each of the top recommended locations.
+
+        The LLM analyses are independent, so they are requested concurrently
+        with at most EXPLAIN_MAX_PARALLEL in flight. Template explanations
+        are cheap and built inline.
+
+        Args:
+            state: PlacementState with ROI predictions
+            top_k: Number of top recommendations to explain
+
+        Returns:
+            Location -> Explanation, in ranking order
+        """
+        if not self.validate_state(state, ['product', 'roi_predictions', 'final_recommendations']):
+            return {}
+
+        top = list(islice(state.final_recommendations.items(), top_k))
+
+        if self.llm_client and self.llm_client.enabled:
+            try:
+                inputs = [self._llm_inputs(state, location) for location, _ in top]
+                analyses = await self.llm_client.analyze_product_placement_batch(
+                    [
+                        {'product': product_dict, 'location': location_dict, 'roi_score': roi, 'context': context}
+                        for (product_dict, location_dict, context), (_, roi) in zip(inputs, top)
+                    ],
+                    max_concurrency=EXPLAIN_MAX_PARALLEL
+                )
+                self.log_info(f"Generated LLM-powered explanations for {len(top)} locations")
+                return {
+                    location: self._llm_explanation(state, location, roi, analysis, product_dict, location_dict)
+                    for (location, roi), analysis, (product_dict, location_dict, _) in zip(top, analyses, inputs)
+                }
+            except Exception as e:
+                self.logger.warning(f"LLM explanations failed, falling back to templates: {e}")
+
+        return {location: self._template_explanation(state, location, roi) for location, roi in top}
+
+    def _template_explanation(self, state: PlacementState, location: str, roi: float) -> Explanation:
+        """
+        Build an explanation for a location from the template generators.
+
+        Args:
+            state: Current placement state
+            location: Location to explain
+            roi: Predicted ROI
+
+        Returns:
+            Template-based Explanation
+        """
+        return Explanation(
+            location=location,
+            roi_score=roi,
+            feature_importance=self._generate_feature_importance(state, location),
+            historical_evidence=self._generate_historical_evidence(state, location),
+            competitor_benchmark=self._generate_competitor_benchmark(state, location),
+            counterfactual=self._generate_counterfactual(state, location),
+            confidence_assessment=self._generate_confidence_assessment(state, location)
+        )
+
     def _generate_feature_importance(self, state: PlacementState, location: str) -> str:
         """
         Generate SHAP-style feature importance explanation with data provenance.
@@ -246,7 +308,7 @@ class ExplainerAgent(BaseAgent):
             explanation += f"- **{ex['product_name']}** ({ex['category']}): "
             explanation += f"ROI {ex['actual_roi']:.2f} (placed {ex['placement_date']})\n"
 
-        avg_roi = sum(ex['actual_roi'] for ex in examples) / len(examples)
+        avg_roi = fmean(map(itemgetter('actual_roi'), examples))
         explanation += f"\n**Average ROI for similar products**: {avg_roi:.2f}"
 
         if prediction.roi > avg_roi:
@@ -296,7 +358,7 @@ class ExplainerAgent(BaseAgent):
             explanation += f"- **{comp['product_name']}** "
             explanation += f"(${comp['price']:.2f}): ROI {comp['observed_roi']:.2f}\n"
 
-        avg_comp_roi = sum(c['observed_roi'] for c in competitors) / len(competitors)
+        avg_comp_roi = fmean(map(itemgetter('observed_roi'), competitors))
 
         explanation += f"\n**Average competitor ROI**: {avg_comp_roi:.2f}\n"
         explanation += f"**Your predicted ROI**: {prediction.roi:.2f}\n\n"
@@ -400,21 +462,10 @@ class ExplainerAgent(BaseAgent):
         Prioritizes LLM (Gemini) for natural, contextual responses.
         Falls back to template responses only if LLM is unavailable or fails.
         """
-        question_lower = question.lower()
-
         # PRIORITY 1: Use LLM for natural, contextual responses if available
         if self.llm_client and self.llm_client.enabled:
             try:
-                product_dict = {
-                    'name': state.product.product_name,
-                    'category': state.product.category,
-                    'price': state.product.price,
-                    'budget': state.product.budget
-                }
-                context = {
-                    'explanation': state.explanation.model_dump() if state.explanation else {},
-                    'locations_count': len(state.locations) if state.locations else 0
-                }
+                product_dict, context = self._followup_inputs(state)
 
                 # Call Gemini for real-time answer
                 llm_response = self.llm_client.answer_followup_question(
@@ -432,7 +483,114 @@ class ExplainerAgent(BaseAgent):
                 self.logger.warning(f"LLM question answering failed: {e}. Falling back to template response.")
 
         # FALLBACK: Pattern matching for common questions (only if LLM fails or disabled)
-        top_location = list(state.final_recommendations.keys())[0] if state.final_recommendations else None
+        return self._template_answer(state, question)
+
+    def answer_followup_questions(self, state: PlacementState, questions: List[str]) -> List[str]:
+        """
+        Answer several follow-up questions, batched into shared LLM requests.
+
+        Questions the LLM leaves unanswered get template responses.
+
+        Args:
+            state: PlacementState with recommendations
+            questions: User questions
+
+        Returns:
+            One answer per question, in order
+        """
+        if len(questions) <= 1 or not (self.llm_client and self.llm_client.enabled):
+            return [self.answer_followup_question(state, question) for question in questions]
+
+        try:
+            product_dict, context = self._followup_inputs(state)
+            answers = self.llm_client.answer_followup_questions(
+                questions=questions,
+                product=product_dict,
+                recommendations=state.final_recommendations,
+                context=context
+            )
+        except Exception as e:
+            self.logger.warning(f"LLM question answering failed: {e}. Falling back to template responses.")
+            answers = [None] * len(questions)
+
+        return [
+            answer if answer and answer.strip() else self._template_answer(state, question)
+            for question, answer in zip(questions, answers)
+        ]
+
+    def submit_followup_questions(self, state: PlacementState, questions: List[str]) -> Optional[str]:
+        """
+        Queue follow-up questions for offline answering on the LLM Batch API.
+
+        Args:
+            state: PlacementState with recommendations
+            questions: User questions
+
+        Returns:
+            Batch ID for fetch_followup_answers(), or None if batching is
+            unavailable (answer with answer_followup_questions() instead)
+        """
+        if not (self.llm_client and self.llm_client.enabled):
+            return None
+
+        product_dict, context = self._followup_inputs(state)
+        return self.llm_client.submit_followup_batch(
+            questions=questions,
+            product=product_dict,
+            recommendations=state.final_recommendations,
+            context=context
+        )
+
+    def fetch_followup_answers(self, state: PlacementState, batch_id: str, questions: List[str]) -> Optional[List[str]]:
+        """
+        Collect the answers of a batch from submit_followup_questions().
+
+        Questions the batch failed to answer get template responses.
+
+        Args:
+            state: PlacementState the questions were submitted with
+            batch_id: ID returned by submit_followup_questions()
+            questions: The submitted questions, in order
+
+        Returns:
+            One answer per question, or None while the batch is still running
+        """
+        if not (self.llm_client and self.llm_client.enabled):
+            return [self._template_answer(state, question) for question in questions]
+
+        status = self.llm_client.poll_batch(batch_id)
+        if status not in BATCH_TERMINAL_STATUSES:
+            return None
+
+        if status != 'completed':
+            self.logger.warning(f"Follow-up batch {batch_id} ended with status {status}, using template responses")
+        answers = self.llm_client.fetch_batch_results(batch_id)
+        # Batches that fail validation report no requests
+        answers += [""] * (len(questions) - len(answers))
+
+        return [
+            answer if answer and answer.strip() else self._template_answer(state, question)
+            for question, answer in zip(questions, answers)
+        ]
+
+    def _followup_inputs(self, state: PlacementState) -> Tuple[Dict, Dict]:
+        """Product details and context sent to the LLM with follow-up questions."""
+        product_dict = {
+            'name': state.product.product_name,
+            'category': state.product.category,
+            'price': state.product.price,
+            'budget': state.product.budget
+        }
+        context = {
+            'explanation': state.explanation.model_dump() if state.explanation else {},
+            'locations_count': len(state.locations) if state.locations else 0
+        }
+        return product_dict, context
+
+    def _template_answer(self, state: PlacementState, question: str) -> str:
+        """Answer a follow-up question by pattern matching, without the LLM."""
+        question_lower = question.lower()
+        top_location = next(iter(state.final_recommendations or {}), None)
 
         if not top_location:
             return "I need recommendation data to answer questions. Please run an analysis first."
@@ -463,6 +621,33 @@ class ExplainerAgent(BaseAgent):
         Returns:
             Explanation object with LLM-generated content
         """
+        product_dict, location_dict, context = self._llm_inputs(state, location)
+
+        # Generate main analysis
+        self.logger.info(f"Calling LLM for analysis of {location}...")
+        main_analysis = self.llm_client.analyze_product_placement(
+            product=product_dict,
+            location=location_dict,
+            roi_score=roi,
+            context=context
+        )
+        self.logger.info(f"LLM response length: {len(main_analysis) if main_analysis else 0} chars")
+        if main_analysis:
+            self.logger.debug(f"LLM response preview: {main_analysis[:200]}")
+
+        return self._llm_explanation(state, location, roi, main_analysis, product_dict, location_dict)
+
+    def _llm_inputs(self, state: PlacementState, location: str) -> Tuple[Dict, Dict, Dict]:
+        """
+        Build the product, location and context dicts for an LLM analysis.
+
+        Args:
+            state: Current placement state
+            location: Location to analyze
+
+        Returns:
+            (product_dict, location_dict, context)
+        """
         # Get location object
         location_obj = None
         for loc in state.locations:
@@ -497,18 +682,31 @@ class ExplainerAgent(BaseAgent):
             'budget_remaining': state.product.budget - (location_dict['base_placement_cost'] * 4)
         }
 
-        # Generate main analysis
-        self.logger.info(f"Calling LLM for analysis of {location}...")
-        main_analysis = self.llm_client.analyze_product_placement(
-            product=product_dict,
-            location=location_dict,
-            roi_score=roi,
-            context=context
-        )
-        self.logger.info(f"LLM response length: {len(main_analysis) if main_analysis else 0} chars")
-        if main_analysis:
-            self.logger.debug(f"LLM response preview: {main_analysis[:200]}")
+        return product_dict, location_dict, context
+
+    def _llm_explanation(
+        self,
+        state: PlacementState,
+        location: str,
+        roi: float,
+        main_analysis: str,
+        product_dict: Dict,
+        location_dict: Dict
+    ) -> Explanation:
+        """
+        Assemble an Explanation around an LLM placement analysis.
 
+        Args:
+            state: Current placement state
+            location: Analyzed location
+            roi: Predicted ROI
+            main_analysis: LLM response for the location
+            product_dict: Product dict the analysis was generated from
+            location_dict: Location dict the analysis was generated from
+
+        Returns:
+            Explanation object with LLM-generated content
+        """
         # Split into sections (LLM will generate structured text)
         # For simplicity, use the main analysis as feature importance
         # If LLM returns empty, generate a concise template-based explanation
@@ -531,10 +729,13 @@ class ExplainerAgent(BaseAgent):
         competitor_text = f"**Competitive Position:** {product_dict['price_tier'].capitalize()}-tier product at ${product_dict['price']:.2f}. ROI of {roi:.2f} indicates strong competitive positioning."
 
         # Counterfactual (concise)
-        alternatives = list(state.final_recommendations.items())[1:3] if len(state.final_recommendations) > 1 else []
+        alternatives = [
+            (alt_loc, alt_roi) for alt_loc, alt_roi in islice(state.final_recommendations.items(), 3)
+            if alt_loc != location
+        ][:2]
         if alternatives:
             counterfactual = f"**Alternatives:** "
-            alt_parts = [f"{alt_loc} (ROI {alt_roi:.2f}, -{roi - alt_roi:.2f})" for alt_loc, alt_roi in alternatives]
+            alt_parts = [f"{alt_loc} (ROI {alt_roi:.2f}, {alt_roi - roi:+.2f})" for alt_loc, alt_roi in alternatives]
             counterfactual += " | ".join(alt_parts)
         else:
             counterfactual = "Only viable location within budget."
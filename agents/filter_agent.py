@@ -6,13 +6,64 @@ beverages in personal care sections by using LLM reasoning about
 product-location fit.
 """
 
+import json
 import logging
+import re
 from typing import List
 from models.schemas import PlacementState, ShelfLocation
 from agents.base_agent import BaseAgent
 
+# Use orjson for faster parsing when available (its JSONDecodeError
+# subclasses json.JSONDecodeError)
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Static system prompt, kept byte-identical across calls so providers can
+# reuse their cached prefix
+FILTER_SYSTEM_PROMPT = """You are a STRICT retail placement expert. Your job is to REJECT any location that doesn't make perfect sense for the product.
+
+GOLDEN RULE: Better to recommend 2 perfect locations than 5 with irrelevant ones. BE STRICT.
+
+STRICT CATEGORY-LOCATION COMPATIBILITY:
+✓ Beverages → ONLY: Beverage Aisles, Checkout (impulse), Main Entrance (impulse)
+✓ Personal Care/Cosmetics → ONLY: Personal Care Aisles, Checkout (impulse), Main Entrance (impulse)
+✓ Snacks → ONLY: Snack Aisles, Checkout (impulse), Main Entrance (impulse)
+✓ Dairy → ONLY: Dairy Sections, Checkout (impulse), Main Entrance (impulse)
+✓ Bakery → ONLY: Bakery Sections, Checkout (impulse), Main Entrance (impulse)
+
+NEVER ALLOW - ZERO TOLERANCE:
+✗ Beverages in: Personal Care, Bakery, Dairy, Snack-specific aisles
+✗ Personal Care in: Beverage, Snack, Dairy, Bakery aisles
+✗ Snacks in: Personal Care, Dairy, Bakery aisles (beverages OK for impulse)
+✗ Dairy in: Personal Care, Beverage, Snack, Bakery aisles
+✗ Cross-category placements UNLESS it's Checkout or Main Entrance
+
+ENDCAP RULES:
+- Only allow endcaps if they match the product category
+- "End Cap 1 - Beverages" → ONLY for Beverages
+- "End Cap 2 - Snacks" → ONLY for Snacks
+- Generic endcaps → Allow for any category
+
+When in doubt, REJECT. Quality over quantity.
+
+Respond with ONLY a JSON array of location names that make sense. No explanation."""
+
+FILTER_USER_TEMPLATE = """Product: {product_name}
+Category: {category}
+Price: ${price}
+Target Customers: {target_customers}
+
+Available Locations:
+{locations_text}
+
+Return JSON array of location names that make logical sense for this product.
+Example: ["Location 1", "Location 2", "Location 3"]"""
+
 
 class LocationFilterAgent(BaseAgent):
     """
@@ -38,7 +89,8 @@ class LocationFilterAgent(BaseAgent):
             import os
             from dotenv import load_dotenv
 
-            load_dotenv()
+            if os.getenv("FLUX_SKIP_DOTENV") != "1":
+                load_dotenv()
 
             # Use lightweight qwen2.5-coder:3b for filtering (fast classification)
             # Falls back to environment config if qwen not available
@@ -120,44 +172,17 @@ class LocationFilterAgent(BaseAgent):
             })
 
         # Ask LLM to filter with STRICT rules
-        system_prompt = """You are a STRICT retail placement expert. Your job is to REJECT any location that doesn't make perfect sense for the product.
-
-GOLDEN RULE: Better to recommend 2 perfect locations than 5 with irrelevant ones. BE STRICT.
-
-STRICT CATEGORY-LOCATION COMPATIBILITY:
-✓ Beverages → ONLY: Beverage Aisles, Checkout (impulse), Main Entrance (impulse)
-✓ Personal Care/Cosmetics → ONLY: Personal Care Aisles, Checkout (impulse), Main Entrance (impulse)
-✓ Snacks → ONLY: Snack Aisles, Checkout (impulse), Main Entrance (impulse)
-✓ Dairy → ONLY: Dairy Sections, Checkout (impulse), Main Entrance (impulse)
-✓ Bakery → ONLY: Bakery Sections, Checkout (impulse), Main Entrance (impulse)
-
-NEVER ALLOW - ZERO TOLERANCE:
-✗ Beverages in: Personal Care, Bakery, Dairy, Snack-specific aisles
-✗ Personal Care in: Beverage, Snack, Dairy, Bakery aisles
-✗ Snacks in: Personal Care, Dairy, Bakery aisles (beverages OK for impulse)
-✗ Dairy in: Personal Care, Beverage, Snack, Bakery aisles
-✗ Cross-category placements UNLESS it's Checkout or Main Entrance
-
-ENDCAP RULES:
-- Only allow endcaps if they match the product category
-- "End Cap 1 - Beverages" → ONLY for Beverages
-- "End Cap 2 - Snacks" → ONLY for Snacks
-- Generic endcaps → Allow for any category
-
-When in doubt, REJECT. Quality over quantity.
-
-Respond with ONLY a JSON array of location names that make sense. No explanation."""
-
-        user_prompt = f"""Product: {product.product_name}
-Category: {product.category}
-Price: ${product.price}
-Target Customers: {product.target_customers}
-
-Available Locations:
-{chr(10).join([f"- {loc['name']} ({loc['zone']}): {loc['notes']}" for loc in location_list])}
-
-Return JSON array of location names that make logical sense for this product.
-Example: ["Location 1", "Location 2", "Location 3"]"""
+        system_prompt = FILTER_SYSTEM_PROMPT
+
+        user_prompt = FILTER_USER_TEMPLATE.format_map({
+            'product_name': product.product_name,
+            'category': product.category,
+            'price': product.price,
+            'target_customers': product.target_customers,
+            'locations_text': "\n".join([
+                f"- {loc['name']} ({loc['zone']}): {loc['notes']}" for loc in location_list
+            ])
+        })
 
         try:
             response = self.llm_client.generate(
@@ -169,9 +194,6 @@ Example: ["Location 1", "Location 2", "Location 3"]"""
             )
 
             # Parse response - extract JSON array
-            import json
-            import re
-
             if not response or response.strip() == "":
                 self.logger.warning("LLM returned empty response, using rule-based filtering")
                 return self._filter_with_rules(state)
@@ -182,13 +204,13 @@ Example: ["Location 1", "Location 2", "Location 3"]"""
             if match:
                 try:
                     json_str = '[' + match.group(1) + ']'
-                    valid_names = json.loads(json_str)
+                    valid_names = _loads(json_str)
                     self.logger.info(f"LLM filtered to {len(valid_names)}/{len(locations)} locations")
                 except json.JSONDecodeError as e:
                     self.logger.warning(f"JSON parse error: {e}, trying full match")
                     # Try parsing the whole response
                     try:
-                        valid_names = json.loads(response.strip())
+                        valid_names = _loads(response.strip())
                     except:
                         self.logger.warning(f"Could not parse LLM response, using rule-based filtering")
                         return self._filter_with_rules(state)
@@ -6,6 +6,7 @@ from .base_agent import BaseAgent
 from models.schemas import PlacementState, ProductInput
 from uuid import uuid4
 from datetime import datetime
+from typing import List, Tuple
 
 
 class InputAgent(BaseAgent):
@@ -37,11 +38,15 @@ class InputAgent(BaseAgent):
         """
         self.log_info(f"Processing placement request for '{state.product.product_name}'")
 
-        # Validate product input
-        self._validate_product(state)
+        # Validate product input and perform business rule checks
+        errors, warnings = self.check_product(state.product)
+        if errors:
+            self.log_error(errors[0], state)
+            raise ValueError(errors[0])
+        self.log_info("Product validation passed")
 
-        # Perform business rule checks
-        self._check_business_rules(state)
+        for warning in warnings:
+            self.log_warning(warning, state)
 
         # Ensure session ID and timestamp are set
         if not state.session_id:
@@ -54,68 +59,65 @@ class InputAgent(BaseAgent):
 
         return state
 
-    def _validate_product(self, state: PlacementState):
-        """Validate product details."""
-        product = state.product
+    @staticmethod
+    def check_product(product: ProductInput) -> Tuple[List[str], List[str]]:
+        """
+        Run the product validation and business rule checks.
 
-        # Price validation
-        if product.price <= 0:
-            self.log_error("Product price must be positive", state)
-            raise ValueError("Product price must be positive")
+        Pure function of the product, so callers can validate without
+        building a PlacementState.
 
-        # Budget validation
-        if product.budget <= 0:
-            self.log_error("Placement budget must be positive", state)
-            raise ValueError("Placement budget must be positive")
+        Args:
+            product: Product to check
 
-        # Target sales validation
+        Returns:
+            (errors, warnings); business rules are only checked when there
+            are no errors
+        """
+        # Price, budget, target sales and expected ROI must be positive
+        if product.price <= 0:
+            return ["Product price must be positive"], []
+        if product.budget <= 0:
+            return ["Placement budget must be positive"], []
         if product.target_sales <= 0:
-            self.log_error("Target sales must be positive", state)
-            raise ValueError("Target sales must be positive")
-
-        # Expected ROI validation
+            return ["Target sales must be positive"], []
         if product.expected_roi <= 0:
-            self.log_error("Expected ROI must be positive", state)
-            raise ValueError("Expected ROI must be positive")
+            return ["Expected ROI must be positive"], []
 
-        # Product name validation
+        # Product name and category must be non-empty
         if not product.product_name or len(product.product_name.strip()) == 0:
-            self.log_error("Product name cannot be empty", state)
-            raise ValueError("Product name cannot be empty")
-
-        # Category validation
+            return ["Product name cannot be empty"], []
         if not product.category or len(product.category.strip()) == 0:
-            self.log_error("Product category cannot be empty", state)
-            raise ValueError("Product category cannot be empty")
-
-        self.log_info("Product validation passed")
+            return ["Product category cannot be empty"], []
 
-    def _check_business_rules(self, state: PlacementState):
-        """Check business rules and add warnings if needed."""
-        product = state.product
+        warnings = []
 
         # Check if expected ROI is unrealistic
         if product.expected_roi > 3.0:
-            warning = f"Expected ROI of {product.expected_roi:.2f} is very ambitious. " \
-                     f"Most retail placements achieve ROI between 1.0-2.5."
-            self.log_warning(warning, state)
+            warnings.append(
+                f"Expected ROI of {product.expected_roi:.2f} is very ambitious. "
+                f"Most retail placements achieve ROI between 1.0-2.5."
+            )
 
         # Check if budget seems low for target sales
         expected_revenue = product.price * product.target_sales
         if product.budget > expected_revenue:
-            warning = f"Placement budget (${product.budget:.2f}) exceeds expected revenue " \
-                     f"(${expected_revenue:.2f}). This would result in negative ROI."
-            self.log_warning(warning, state)
+            warnings.append(
+                f"Placement budget (${product.budget:.2f}) exceeds expected revenue "
+                f"(${expected_revenue:.2f}). This would result in negative ROI."
+            )
 
         # Check if price seems unusual
         if product.price < 0.50:
-            self.log_warning("Product price seems unusually low (<$0.50)", state)
+            warnings.append("Product price seems unusually low (<$0.50)")
         elif product.price > 50.0:
-            self.log_warning("Product price seems unusually high (>$50)", state)
+            warnings.append("Product price seems unusually high (>$50)")
 
         # Validate target customer description
         if len(product.target_customers.strip()) < 5:
-            self.log_warning("Target customer description is very brief. More detail would improve recommendations.", state)
+            warnings.append("Target customer description is very brief. More detail would improve recommendations.")
+
+        return [], warnings
 
     def validate_input_data(self, product_input: ProductInput) -> tuple[bool, str]:
         """
@@ -128,13 +130,9 @@ class InputAgent(BaseAgent):
             Tuple of (is_valid, error_message)
         """
         try:
-            # Create temporary state for validation
-            temp_state = PlacementState(product=product_input)
-            self._validate_product(temp_state)
-            self._check_business_rules(temp_state)
-
-            if temp_state.errors:
-                return False, "; ".join(temp_state.errors)
+            errors, _ = self.check_product(product_input)
+            if errors:
+                return False, errors[0]
 
             return True, ""
 
@@ -5,7 +5,9 @@ FastAPI Backend for Retail Product Placement Agent System
 import json
 import uuid
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
+from statistics import fmean
 from typing import Dict, Any, Optional
 from fastapi import FastAPI, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
@@ -289,7 +291,7 @@ async def analyze_placement(request: AnalyzeRequest):
         session_id = str(uuid.uuid4())
 
         # Execute workflow with state logging
-        result = orchestrator.execute(product_input, session_id=session_id)
+        result = await orchestrator.aexecute(product_input, session_id=session_id)
 
         if not result.recommendations:
             raise HTTPException(
@@ -328,7 +330,7 @@ async def analyze_placement(request: AnalyzeRequest):
             timestamp=result.timestamp.isoformat()
         )
 
-        logger.info(f"✅ Analysis complete. Top recommendation: {list(result.recommendations.keys())[0]}")
+        logger.info(f"✅ Analysis complete. Top recommendation: {next(iter(result.recommendations))}")
 
         return response
 
@@ -410,7 +412,7 @@ async def get_competitors(location_id: str):
             }
 
         # Calculate stats
-        avg_roi = sum(c['observed_roi'] for c in location_competitors) / len(location_competitors)
+        avg_roi = fmean(map(itemgetter('observed_roi'), location_competitors))
 
         return {
             "location_id": location_id,
@@ -481,7 +483,7 @@ def _generate_simple_explanation(result) -> Dict[str, Any]:
     if not result.recommendations:
         return {"summary": "No recommendations available"}
 
-    top_location = list(result.recommendations.keys())[0]
+    top_location = next(iter(result.recommendations))
     top_roi = result.recommendations[top_location]
 
     # Get location details
@@ -31,6 +31,8 @@ class ProductInput(BaseModel):
         return v.title()
 
     class Config:
+        # Immutable once validated, so state logs can reuse its serialization
+        frozen = True
         json_schema_extra = {
             "example": {
                 "product_name": "Premium Energy Drink",
@@ -58,6 +60,9 @@ class ShelfLocation(BaseModel):
     height: Optional[float] = None
     notes: Optional[str] = None
 
+    class Config:
+        frozen = True
+
 
 class ROIPrediction(BaseModel):
     """Schema for ROI prediction result."""
@@ -0,0 +1,34 @@
+"""
+Split a session's events.jsonl state log into one JSON file per event.
+
+Recreates the per-event files StateLogger wrote before it switched to a
+single append-only log (e.g. step3_analyzeragentv2_output.json).
+
+Usage:
+    python scripts/split_state_log.py logs/state_transitions/<session_id>
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.state_logger import SESSION_LOG_FILENAME, split_session_log
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split a StateLogger events.jsonl into per-event JSON files")
+    parser.add_argument("session_dirs", nargs="+", type=Path, help="Session log directories")
+    args = parser.parse_args()
+
+    for session_dir in args.session_dirs:
+        if not (session_dir / SESSION_LOG_FILENAME).exists():
+            print(f"No {SESSION_LOG_FILENAME} in {session_dir}", file=sys.stderr)
+            continue
+        count = split_session_log(session_dir)
+        print(f"Wrote {count} files to {session_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Tests for the knowledge base loader's keyword search and pickle cache.
+"""
+
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from utils.knowledge_base_loader import KnowledgeBaseLoader
+from utils.knowledge_graph import RetailKnowledgeGraph
+
+
+def make_source(source_id, title, findings, data_points=None):
+    return {
+        'id': source_id,
+        'title': title,
+        'url': f"https://example.com/{source_id}",
+        'publisher': "Example",
+        'year': 2024,
+        'key_findings': findings,
+        'data_points': data_points or {},
+    }
+
+
+def write_kb(kb_path, sources):
+    with open(kb_path, 'w', encoding='utf-8') as f:
+        json.dump({'metadata': {'total_sources': len(sources)}, 'sources': sources}, f)
+
+
+def scan_by_keyword(kb, keyword):
+    """Plain substring scan that keyword search must agree with."""
+    keyword_lower = keyword.lower()
+    return [
+        source for source in kb.sources
+        if keyword_lower in source.title.lower()
+        or any(keyword_lower in finding.lower() for finding in source.key_findings)
+    ]
+
+
+def test_keyword_search_matches_substring_scan():
+    kb = KnowledgeBaseLoader(kb_path="knowledge_base/retail_psychology_sources.json", use_cache=False)
+    assert kb.sources
+
+    keywords = [
+        "", "a", "%", "23", "eye", "EYE LEVEL", "eye-level", "impulse", "end cap",
+        "sales by up to", "shelf 4 (eye level)", "checkout", "xyzzy", "level buy",
+    ]
+    keywords += [source.title[5:17] for source in kb.sources]
+    keywords += [finding[-9:] for source in kb.sources for finding in source.key_findings]
+    for keyword in keywords:
+        assert kb.search_by_keyword(keyword) == scan_by_keyword(kb, keyword), keyword
+
+
+def test_keyword_search_does_not_match_across_fields():
+    with tempfile.TemporaryDirectory() as kb_dir:
+        kb_path = Path(kb_dir) / "sources.json"
+        write_kb(kb_path, [
+            make_source('s1', "Shelf height", ["Eye level sells", "Corners lag"]),
+            make_source('s2', "Eye level sells corners", []),
+        ])
+        kb = KnowledgeBaseLoader(kb_path=str(kb_path), use_cache=False)
+
+        for keyword in ["sells corners", "height eye", "sells", "ll"]:
+            assert kb.search_by_keyword(keyword) == scan_by_keyword(kb, keyword), keyword
+        assert [source.id for source in kb.search_by_keyword("sells corners")] == ['s2']
+
+
+def test_cache_is_written_and_reused():
+    with tempfile.TemporaryDirectory() as kb_dir:
+        kb_path = Path(kb_dir) / "sources.json"
+        write_kb(kb_path, [make_source('s1', "Eye level", ["Eye-level boosts sales"], {'eye_level': 0.23})])
+
+        kb = KnowledgeBaseLoader(kb_path=str(kb_path))
+        assert kb_path.with_suffix('.pkl').exists()
+
+        with patch('utils.knowledge_base_loader.load_json_file', side_effect=AssertionError("JSON parsed")):
+            cached = KnowledgeBaseLoader(kb_path=str(kb_path))
+
+        assert [source.id for source in cached.sources] == ['s1']
+        assert cached.get_data_point('eye_level') == 0.23
+        assert cached.search_by_keyword("boosts") == cached.sources
+
+
+def test_changed_json_rebuilds_cache():
+    with tempfile.TemporaryDirectory() as kb_dir:
+        kb_path = Path(kb_dir) / "sources.json"
+        write_kb(kb_path, [make_source('s1', "Eye level", ["Eye-level boosts sales"])])
+        KnowledgeBaseLoader(kb_path=str(kb_path))
+
+        # Replaced by a copy that is older than the cache file
+        write_kb(kb_path, [make_source('s2', "End caps", ["End caps lift impulse buys"])])
+        os.utime(kb_path, ns=(0, 0))
+
+        kb = KnowledgeBaseLoader(kb_path=str(kb_path))
+        assert [source.id for source in kb.sources] == ['s2']
+        assert kb.search_by_keyword("impulse") == kb.sources
+        assert kb.search_by_keyword("eye-level") == []
+
+        # The rebuilt cache serves the new sources
+        assert [source.id for source in KnowledgeBaseLoader(kb_path=str(kb_path)).sources] == ['s2']
+
+
+def test_incomplete_cache_falls_back_to_json():
+    with tempfile.TemporaryDirectory() as kb_dir:
+        kb_path = Path(kb_dir) / "sources.json"
+        cache_path = kb_path.with_suffix('.pkl')
+        write_kb(kb_path, [make_source('s1', "Eye level", ["Eye-level boosts sales"])])
+        KnowledgeBaseLoader(kb_path=str(kb_path))
+
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        del cached['_trigram_index']
+        with open(cache_path, 'wb') as f:
+            pickle.dump(cached, f)
+
+        kb = KnowledgeBaseLoader(kb_path=str(kb_path))
+        assert [source.id for source in kb.sources] == ['s1']
+        assert len(kb._search_text) == 1
+        assert kb.search_by_keyword("boosts") == kb.sources
+
+
+def test_graph_cache_follows_json():
+    with tempfile.TemporaryDirectory() as kb_dir:
+        graph_path = Path(kb_dir) / "graph.json"
+        graph = RetailKnowledgeGraph()
+        graph.add_concept('end_cap', 'location_type', {'traffic_lift': 1.3})
+        graph.save_to_file(str(graph_path))
+
+        assert 'end_cap' in RetailKnowledgeGraph(str(graph_path)).graph
+        assert graph_path.with_suffix('.pkl').exists()
+
+        graph = RetailKnowledgeGraph()
+        graph.add_concept('checkout', 'location_type', {'traffic_lift': 1.1})
+        graph.save_to_file(str(graph_path))
+        os.utime(graph_path, ns=(0, 0))
+
+        assert list(RetailKnowledgeGraph(str(graph_path)).graph) == ['checkout']
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
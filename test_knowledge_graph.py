@@ -0,0 +1,58 @@
+"""
+Tests for knowledge graph queries.
+"""
+
+import json
+
+from utils.knowledge_graph import RetailKnowledgeGraph
+
+
+def build_graph():
+    graph = RetailKnowledgeGraph()
+    graph.add_concept('energy_drink', 'product_type', {'category': 'Beverages', 'price_tier': 'premium'})
+    graph.add_concept('end_cap', 'location_type', {'zone_type': 'end_cap', 'traffic_lift': 1.3})
+    graph.add_concept('cross_merch', 'strategy', {'name': 'Cross merchandising', 'description': 'Pair items'})
+    graph.add_concept('impulse', 'customer_behavior', {'name': 'Impulse buying', 'impact': 'high'})
+    graph.add_relationship('energy_drink', 'cross_merch', 'benefits_from', {'reason': 'visibility'})
+    graph.add_relationship('cross_merch', 'impulse', 'triggers')
+    graph.add_relationship('end_cap', 'energy_drink', 'suits', {'reason': 'traffic'})
+    graph.add_relationship('end_cap', 'cross_merch', 'enables')
+    return graph
+
+
+def test_query_results_are_plain_copies():
+    graph = build_graph()
+
+    related = graph.query_related_concepts('end_cap', max_depth=2)
+    assert [(item['concept_id'], item['depth']) for item in related] == [
+        ('energy_drink', 1), ('cross_merch', 1), ('impulse', 2)
+    ]
+    assert related[0]['properties'] == {'category': 'Beverages', 'price_tier': 'premium'}
+    assert related[0]['relationship_props'] == {'reason': 'traffic'}
+
+    strategies = graph.query_strategies_for_product('Beverages', 'premium')
+    assert [item['concept_id'] for item in strategies] == ['cross_merch']
+    json.dumps([related, strategies, graph.query_location_insights('end_cap')])
+
+    # Changing a result leaves the graph alone
+    strategies[0]['properties']['name'] = "Changed"
+    related[0]['relationship_props'] |= {'reason': "changed"}
+    assert graph.graph.nodes['cross_merch']['name'] == 'Cross merchandising'
+    assert graph.graph.edges['end_cap', 'energy_drink']['reason'] == 'traffic'
+
+
+def test_query_location_insights():
+    insights = build_graph().query_location_insights('end_cap')
+
+    assert insights['properties'] == {'traffic_lift': 1.3}
+    assert insights['best_for_categories'] == [{'category': 'Beverages', 'reason': 'traffic'}]
+    assert insights['strategies'] == [{'strategy': 'Cross merchandising', 'description': 'Pair items'}]
+    assert insights['customer_behaviors'] == [{'behavior': 'Impulse buying', 'impact': 'high'}]
+    assert build_graph().query_location_insights('checkout') == {}
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,436 @@
+"""
+Tests for the LLM client against a stubbed OpenAI client (no network calls).
+"""
+
+import asyncio
+import inspect
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import numpy as np
+import openai
+
+os.environ.setdefault("FLUX_SKIP_DOTENV", "1")
+
+from utils.llm_client import (
+    CircuitBreaker, CircuitOpenError, LLMClient, LLMClientPool, PersistentResponseCache,
+    RequestBatcher, ResponseCache, SemanticCache, _split_numbered_answers
+)
+
+PRODUCT = {'name': 'Premium Energy Drink', 'category': 'Beverages', 'price': 2.99, 'budget': 5000}
+LOCATION = {
+    'zone_name': 'End Cap 1 - Beverages',
+    'zone_type': 'End Cap',
+    'traffic_level': 'high',
+    'traffic_index': 240,
+    'visibility_factor': 1.4
+}
+COMPETITORS = [{'product_name': 'Rival Cola', 'price': 1.99, 'observed_roi': 1.2}]
+RECOMMENDATIONS = {'End Cap 1 - Beverages': 2.4, 'Checkout Lane 1': 1.9}
+BRIEF_JSON = (
+    '{"placement_rationale": "High traffic", "competitive_analysis": "Priced above rivals", '
+    '"executive_summary": "Place it", "risks": ["Stockouts"], "recommendation": "End cap"}'
+)
+
+
+def default_reply(kwargs):
+    """Answer a chat completion request the way a well-behaved model would."""
+    prompt = kwargs['messages'][-1]['content']
+    if kwargs.get('response_format') or 'json' in prompt.lower():
+        return BRIEF_JSON
+    if 'Q1:' in prompt:
+        return "\n".join(f"A{n}: answer {n}" for n in range(1, prompt.count('\nQ') + 2))
+    return f"reply to {prompt[:20]}"
+
+
+def completion(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))], usage=None)
+
+
+class StubOpenAI:
+    """Records requests and answers them with reply(kwargs)."""
+
+    def __init__(self, reply=default_reply, delay=0.0):
+        self.reply = reply
+        self.delay = delay
+        self.calls = []
+        self.uploads = []
+        self.batch_output = ""
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.models = SimpleNamespace(list=lambda: [])
+        self.files = SimpleNamespace(create=self._upload, content=lambda file_id: SimpleNamespace(text=self.batch_output))
+        self.batches = SimpleNamespace(create=self._create_batch, retrieve=self._retrieve_batch)
+
+    def with_options(self, **_):
+        return self
+
+    def _create(self, **kwargs):
+        with self._lock:
+            self.calls.append(kwargs)
+        if self.delay:
+            time.sleep(self.delay)
+        text = self.reply(kwargs)
+        if kwargs.get('stream'):
+            return StubStream(text)
+        return completion(text)
+
+    def _upload(self, file, purpose):
+        self.uploads.append(file[1].decode('utf-8'))
+        return SimpleNamespace(id="file-1")
+
+    def _create_batch(self, **_):
+        return SimpleNamespace(id="batch-1")
+
+    def _retrieve_batch(self, batch_id):
+        total = self.uploads[-1].count('\n') + 1 if self.uploads else 0
+        return SimpleNamespace(
+            status="completed",
+            request_counts=SimpleNamespace(total=total),
+            output_file_id="file-2"
+        )
+
+
+class StubStream:
+    def __init__(self, text):
+        self.words = text.split(' ')
+
+    def __iter__(self):
+        for i, word in enumerate(self.words):
+            content = word if i == 0 else f" {word}"
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))])
+
+    def close(self):
+        pass
+
+
+class StubAsyncOpenAI:
+    """Async facade over a StubOpenAI."""
+
+    def __init__(self, stub):
+        async def create(**kwargs):
+            return stub._create(**kwargs)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+
+def stub_client(reply=default_reply, delay=0.0, **kwargs):
+    """An enabled LLMClient whose API calls go to a StubOpenAI."""
+    kwargs.setdefault('cache_size', 0)
+    client = LLMClient(api_key="sk-test", model="gpt-4o-mini", **kwargs)
+    stub = StubOpenAI(reply, delay)
+    client.client = stub
+    client._async_client = StubAsyncOpenAI(stub)
+    return client, stub
+
+
+def rate_limit_error(retry_after):
+    request = httpx.Request("POST", "https://api.example.com/v1/chat/completions")
+    response = httpx.Response(429, request=request, headers={"retry-after": str(retry_after)})
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+def bag_of_words(text):
+    """Deterministic embedding for SemanticCache tests."""
+    vector = np.zeros(64, dtype=np.float32)
+    for word in re.findall(r"[a-z]+", text.lower()):
+        vector[zlib.crc32(word.encode()) % 64] += 1.0
+    return vector / np.linalg.norm(vector)
+
+
+def test_pool_supports_every_public_method():
+    """Every public LLMClient method works when called on a pool."""
+    (first, first_stub), (second, second_stub) = stub_client(), stub_client()
+    pool = LLMClientPool([first, second])
+
+    public = {name for name in dir(LLMClient) if not name.startswith('_')}
+    called = set()
+
+    def call(name, *args, **kwargs):
+        called.add(name)
+        result = getattr(pool, name)(*args, **kwargs)
+        return asyncio.run(result) if inspect.iscoroutine(result) else result
+
+    call('warm_up')
+    assert call('generate', "Hello there").startswith("reply to")
+    assert "".join(call('generate_stream', "Hello there")).startswith("reply to")
+    assert len(call('generate_many', [{'prompt': "a"}, {'prompt': "b"}])) == 2
+    assert call('agenerate', "Hello there").startswith("reply to")
+    assert len(call('generate_batch', [("a", None), ("b", "Be brief")])) == 2
+    assert len(call('run_batch', [{'prompt': "a"}, {'prompt': "b"}, {'prompt': "c"}])) == 3
+    assert call('generate_json', "Reply in JSON")['recommendation'] == "End cap"
+    assert call('analyze_product_placement', PRODUCT, LOCATION, 2.4, {}).startswith("reply to")
+    assert len(call('analyze_product_placement_batch', [
+        {'product': PRODUCT, 'location': LOCATION, 'roi_score': 2.4, 'context': {}}
+    ] * 2)) == 2
+    assert len(call('analyze_product_placement_bulk', [
+        {'product': PRODUCT, 'location': LOCATION, 'roi_score': 2.4, 'context': {}}
+    ])) == 1
+    assert call('generate_competitive_analysis', PRODUCT, LOCATION, COMPETITORS, 2.4).startswith("reply to")
+    assert call('generate_combined_brief', PRODUCT, LOCATION, COMPETITORS, 2.4)['risks'] == "Stockouts"
+    assert call('generate_insight_summary', PRODUCT, [LOCATION], RECOMMENDATIONS)['recommendation'] == "End cap"
+    call('load_catalog', {'store': "Downtown"})
+    assert call('answer_followup_question', "Why here?", PRODUCT, RECOMMENDATIONS, {}).startswith("reply to")
+    assert call('answer_followup_questions', ["Why?", "Why not?"], PRODUCT, RECOMMENDATIONS, {}) == [
+        "answer 1", "answer 2"
+    ]
+    assert call('purge_expired') == 0
+
+    # Batch API jobs go to the primary member's endpoint
+    batch_id = call('submit_batch', [{'prompt': "a"}])
+    assert call('submit_followup_batch', ["Why?"], PRODUCT, RECOMMENDATIONS, {}) == batch_id
+    assert call('poll_batch', batch_id) == "completed"
+    first_stub.batch_output = (
+        '{"custom_id": "0", "response": {"body": {"choices": [{"message": {"content": "done"}}]}}}'
+    )
+    assert call('fetch_batch_results', batch_id) == ["done"]
+    assert first_stub.uploads and not second_stub.uploads
+
+    assert called == public, f"untested: {sorted(public - called)}"
+    assert first_stub.calls and second_stub.calls
+
+
+def test_pool_shares_identical_requests_across_members():
+    """Identical concurrent requests make one API call whichever member serves them."""
+    # Only cacheable requests (low temperature, response cache on) are shared
+    (first, first_stub), (second, second_stub) = [stub_client(delay=0.2, cache_size=16) for _ in range(2)]
+    pool = LLMClientPool([first, second])
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(pool.generate("Same prompt", temperature=0.1)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(results)) == 1
+    assert len(first_stub.calls) + len(second_stub.calls) == 1
+
+
+def test_pool_caches_replies_from_any_member():
+    """A reply served by a member on another endpoint is cached for the whole pool."""
+    first, first_stub = stub_client(base_url="https://api.openai.com/v1", cache_size=16)
+    second, second_stub = stub_client(base_url="https://openrouter.ai/api/v1")
+    pool = LLMClientPool([first, second])
+
+    # The primary is resting after a rate limit, so the second member serves
+    pool._cooldown_until[0] = time.monotonic() + 60
+    reply = pool.generate("Same prompt", temperature=0.1)
+
+    # Once the primary is back, the repeat is still served from the cache
+    pool._cooldown_until[0] = 0.0
+    assert pool.generate("Same prompt", temperature=0.1) == reply
+    assert not first_stub.calls and len(second_stub.calls) == 1
+
+
+def test_pool_fails_over_and_cools_down_rate_limited_member():
+    limited = []
+
+    def reply_once_limited(kwargs):
+        if not limited:
+            limited.append(True)
+            raise rate_limit_error(retry_after=7)
+        return default_reply(kwargs)
+
+    (first, first_stub), (second, second_stub) = stub_client(reply_once_limited), stub_client()
+    pool = LLMClientPool([first, second])
+
+    assert pool.generate("Hello there").startswith("reply to")
+    assert len(first_stub.calls) == 1 and len(second_stub.calls) == 1
+
+    # The rate limited member rests for its Retry-After period
+    assert pool._cooldown_until[0] - time.monotonic() > 6
+    assert pool._route() == [1, 0]
+    pool.generate("Hello again")
+    assert len(first_stub.calls) == 1 and len(second_stub.calls) == 2
+
+
+def test_pool_skips_member_with_open_circuit():
+    (first, first_stub), (second, second_stub) = stub_client(), stub_client()
+    pool = LLMClientPool([first, second])
+    first.circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    first.circuit_breaker.record_failure()
+
+    assert pool.generate("Hello there").startswith("reply to")
+    assert not first_stub.calls and len(second_stub.calls) == 1
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(maxsize=2, ttl=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # "b" is now least recently used
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+    assert len(cache) == 2
+
+
+def test_response_cache_expires_entries():
+    cache = ResponseCache(maxsize=8, ttl=0.05)
+    cache.set("a", "1")
+    assert cache.get("a") == "1"
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_persistent_cache_survives_restart():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "responses.db"
+
+        store = PersistentResponseCache(str(path), ttl=60, provider="https://api.example.com", model="m")
+        ResponseCache(store=store).set("key", "stored answer")
+        store.close()
+
+        # A new process starts with an empty in-memory cache backed by the same file
+        store = PersistentResponseCache(str(path), ttl=60)
+        cache = ResponseCache(store=store)
+        assert cache.get("key") == "stored answer"
+        assert len(store) == 1
+        store.close()
+
+        store = PersistentResponseCache(str(path), ttl=0)
+        store.set("stale", "old")
+        assert store.get("stale") is None
+        assert store.purge_expired() == 1
+        store.close()
+
+
+def test_semantic_cache_matches_paraphrases_within_scope():
+    cache = SemanticCache(threshold=0.9, capacity=2, ttl=60, embed_fn=bag_of_words)
+    cache.set("product-1", "Why is this location best?", "Traffic")
+
+    assert cache.get("product-1", "why is this location best") == "Traffic"
+    assert cache.get("product-2", "Why is this location best?") is None
+    assert cache.get("product-1", "What are the risks?") is None
+
+    # The ring buffer overwrites the oldest entry once full
+    cache.set("product-1", "What are the risks?", "Stockouts")
+    cache.set("product-1", "How much will it cost?", "$1000")
+    assert cache.get("product-1", "Why is this location best?") is None
+    assert cache.get("product-1", "What are the risks?") == "Stockouts"
+
+
+def test_semantic_cache_expires_entries():
+    cache = SemanticCache(threshold=0.9, ttl=0.05, embed_fn=bag_of_words)
+    cache.set("scope", "Why here?", "Traffic")
+    time.sleep(0.06)
+    assert cache.get("scope", "Why here?") is None
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    breaker.check()  # Still closed below the threshold
+
+    breaker.record_failure()
+    try:
+        breaker.check()
+        assert False, "circuit should be open"
+    except CircuitOpenError:
+        pass
+
+    # After the timeout one probe is let through; a failure re-opens at once
+    time.sleep(0.06)
+    breaker.check()
+    breaker.record_failure()
+    try:
+        breaker.check()
+        assert False, "circuit should re-open after a failed probe"
+    except CircuitOpenError:
+        pass
+
+    time.sleep(0.06)
+    breaker.check()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.check()  # Success reset the failure count
+
+
+def test_request_batcher_splits_combined_replies():
+    sent = []
+
+    def send(prompt, system_prompt, temperature, max_tokens):
+        sent.append((prompt, max_tokens))
+        items = re.findall(r"^### Item (\d+)\n(.*)$", prompt, re.MULTILINE)
+        return "\n".join(f"### Item {n}\nanswer to {text}" for n, text in items)
+
+    batcher = RequestBatcher(send, window=0.2, max_batch_size=8)
+    results = {}
+    threads = [
+        threading.Thread(target=lambda q=q: results.update({q: batcher.submit(q, "system", 0.5, 100)}))
+        for q in ("first", "second", "third")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {q: f"answer to {q}" for q in ("first", "second", "third")}
+    assert len(sent) == 1 and sent[0][1] == 300
+
+
+def test_request_batcher_falls_back_when_reply_cannot_be_split():
+    sent = []
+
+    def send(prompt, system_prompt, temperature, max_tokens):
+        sent.append(prompt)
+        return "one unstructured answer" if "### Item" in prompt else f"answer to {prompt}"
+
+    batcher = RequestBatcher(send, window=0.2)
+    results = {}
+    threads = [
+        threading.Thread(target=lambda q=q: results.update({q: batcher.submit(q, "system", 0.5, 100)}))
+        for q in ("first", "second")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {"first": "answer to first", "second": "answer to second"}
+    assert len(sent) == 3
+
+
+def test_split_numbered_answers():
+    reply = "**A1:** Traffic is high.\nA3) Prices are competitive.\n\nA2: Risk is low."
+    assert _split_numbered_answers(reply, 4) == [
+        "Traffic is high.", "Risk is low.", "Prices are competitive.", None
+    ]
+    assert _split_numbered_answers("Error generating response: timeout", 2) == [None, None]
+
+
+def test_fetch_batch_results_without_request_counts():
+    client, stub = stub_client()
+    stub.batch_output = (
+        '{"custom_id": "1", "response": {"body": {"choices": [{"message": {"content": "second"}}]}}}'
+    )
+    stub.batches.retrieve = lambda batch_id: SimpleNamespace(
+        status="completed", request_counts=None, output_file_id="file-2"
+    )
+    assert client.fetch_batch_results("batch-1") == ["", "second"]
+
+
+def test_combined_brief_ignores_non_object_reply():
+    client, _ = stub_client(reply=lambda kwargs: '["High traffic", "Priced above rivals"]')
+    assert client.generate_combined_brief(PRODUCT, LOCATION, COMPETITORS, 2.4) == {
+        'placement_rationale': "", 'competitive_analysis': "", 'executive_summary': "", 'risks': ""
+    }
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,112 @@
+"""
+Tests for the orchestrator's state logger wiring and result cache.
+"""
+
+import json
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from models.schemas import ProductInput
+from utils.state_logger import SESSION_LOG_FILENAME, StateLogger, get_state_logger, init_state_logger
+from workflows.orchestrator import OrchestratorV2
+
+PRODUCT = ProductInput(
+    product_name="Premium Energy Drink",
+    category="Beverages",
+    price=3.99,
+    budget=5000,
+    target_sales=500,
+    target_customers="Young adults 18-35",
+    expected_roi=1.5
+)
+
+
+def test_disabled_state_logging_leaves_global_logger():
+    state_logger = init_state_logger()
+    orchestrator = OrchestratorV2(enable_state_logging=False)
+
+    assert not orchestrator.state_logger
+    assert get_state_logger() is state_logger
+
+
+def test_runs_without_session_skip_logging_and_session_lock():
+    with tempfile.TemporaryDirectory() as log_dir:
+        orchestrator = OrchestratorV2()
+        orchestrator.state_logger = StateLogger(log_dir=log_dir, min_level=logging.DEBUG)
+        orchestrator.execute(PRODUCT, session_id="session-1")
+        session_log = Path(log_dir) / "session-1" / SESSION_LOG_FILENAME
+        logged = session_log.read_text(encoding="utf-8")
+        assert json.loads(logged.splitlines()[-1])["event"] == "session_end"
+
+        # Another run holds the session; an unlogged run neither waits for
+        # it nor writes into the last session's log
+        results = []
+        with orchestrator._session_lock:
+            runner = threading.Thread(target=lambda: results.append(
+                orchestrator.execute(PRODUCT.model_copy(update={'price': 4.49}))
+            ))
+            runner.start()
+            runner.join(timeout=120)
+        assert results and results[0].recommendations
+        assert session_log.read_text(encoding="utf-8") == logged
+
+
+def test_identical_input_reuses_independent_copies():
+    orchestrator = OrchestratorV2(enable_state_logging=False)
+    product = PRODUCT.model_copy(update={'price': 5.49})
+
+    first = orchestrator.execute(product)
+    with patch.object(orchestrator.workflow, 'invoke', side_effect=AssertionError("workflow ran")):
+        second = orchestrator.execute(product)
+        third = orchestrator.execute(product.model_copy())
+
+    assert first.recommendations
+    assert second.recommendations == first.recommendations
+    assert len({first.session_id, second.session_id, third.session_id}) == 3
+
+    # Changing one caller's result leaves the cached copy alone
+    expected = third.model_copy(deep=True)
+    first.recommendations.clear()
+    second.explanation.roi_score = 0.0
+    fourth = orchestrator.execute(product)
+    assert fourth.recommendations == expected.recommendations
+    assert fourth.explanation == expected.explanation
+
+
+def test_result_cache_evicts_least_recent_and_expired():
+    orchestrator = OrchestratorV2(enable_state_logging=False)
+    recommendation = orchestrator.execute(PRODUCT)
+
+    with patch('workflows.orchestrator.RESULT_CACHE_SIZE', 2):
+        orchestrator._store_result("a", recommendation)
+        orchestrator._store_result("b", recommendation)
+        # Reading "a" makes "b" the least recently used
+        assert orchestrator._cached_result("a") is not None
+        orchestrator._store_result("c", recommendation)
+    assert orchestrator._cached_result("b") is None
+    assert orchestrator._cached_result("a") is not None
+    assert orchestrator._cached_result("c") is not None
+
+    with patch('workflows.orchestrator.RESULT_CACHE_TTL', -1.0):
+        orchestrator._store_result("d", recommendation)
+    assert orchestrator._cached_result("d") is None
+    assert "d" not in orchestrator._result_cache
+
+
+def test_result_cache_key_changes_after_reset_pool():
+    key = OrchestratorV2(enable_state_logging=False)._result_cache_key(PRODUCT)
+    assert OrchestratorV2(enable_state_logging=False)._result_cache_key(PRODUCT) == key
+    assert OrchestratorV2(data_dir="./data", enable_state_logging=False)._result_cache_key(PRODUCT) == key
+
+    OrchestratorV2.reset_pool()
+    assert OrchestratorV2(enable_state_logging=False)._result_cache_key(PRODUCT) != key
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
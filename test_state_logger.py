@@ -0,0 +1,164 @@
+"""
+Tests for the state transition logger's session log (events.jsonl) and its
+per-event file modes.
+"""
+
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+from models.schemas import PlacementState, ProductInput
+from utils.state_logger import (
+    LOG_BATCH_SIZE, SESSION_LOG_FILENAME, NullStateLogger, StateLogger, split_session_log
+)
+
+PRODUCT = ProductInput(
+    product_name="Premium Energy Drink",
+    category="Beverages",
+    price=2.99,
+    budget=5000,
+    target_sales=1000,
+    target_customers="Young adults",
+    expected_roi=1.5
+)
+
+
+def read_session_log(session_dir: Path) -> list:
+    with open(session_dir / SESSION_LOG_FILENAME, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def log_session(state_logger: StateLogger, session_id: str) -> PlacementState:
+    """Log one event of each kind, as a workflow run would."""
+    state = PlacementState(product=PRODUCT, session_id=session_id)
+    state_logger.start_session(session_id)
+    state_logger.log_agent_input("InputAgent", state, step_number=1)
+    state_logger.log_agent_output("InputAgent", state, step_number=1, metrics={"execution_time_seconds": 0.1})
+    state_logger.log_state_transition("InputAgent", "FilterAgent", state, decision={"valid": True})
+    state_logger.log_decision_point("Budget Check", "budget > 0", True, context={"budget": 5000})
+    state_logger.log_data_transformation("Normalize", {"price": "2.99"}, {"price": 2.99}, agent="InputAgent")
+    state_logger.log_error("FilterAgent", ValueError("no locations"), state)
+    state_logger.end_session(summary={"status": "complete"})
+    return state
+
+
+def test_session_log_round_trips_into_per_event_files():
+    with tempfile.TemporaryDirectory() as log_dir:
+        state_logger = StateLogger(log_dir=log_dir, min_level=logging.DEBUG)
+        log_session(state_logger, "session-1")
+        session_dir = Path(log_dir) / "session-1"
+
+        records = read_session_log(session_dir)
+        assert [record["_file"] for record in records] == [
+            "event_session_start.json",
+            "step1_inputagent_input.json",
+            "step1_inputagent_output.json",
+            "transition_inputagent_to_filteragent.json",
+            "decision_budget_check.json",
+            "transform_normalize.json",
+            "error_filteragent.json",
+            "event_session_end.json",
+        ]
+        assert records[2]["state"]["product"] == {"product_name": "Premium Energy Drink", "category": "Beverages"}
+        assert records[2]["metrics"] == {"execution_time_seconds": 0.1}
+        assert records[-1]["summary"] == {"status": "complete"}
+
+        assert split_session_log(session_dir) == len(records)
+        for record in records:
+            filename = record.pop("_file")
+            with open(session_dir / filename, encoding="utf-8") as f:
+                assert json.load(f) == record
+
+
+def test_split_session_flushes_running_session():
+    with tempfile.TemporaryDirectory() as log_dir:
+        state_logger = StateLogger(log_dir=log_dir, min_level=logging.DEBUG)
+        state_logger.start_session("session-1")
+        state_logger.log_decision_point("Budget Check", "budget > 0", True)
+
+        assert state_logger.split_session("session-1") == 2
+        assert (Path(log_dir) / "session-1" / "decision_budget_check.json").exists()
+
+
+def test_background_writer_keeps_every_record_in_order():
+    count = LOG_BATCH_SIZE * 3 + 7
+    with tempfile.TemporaryDirectory() as log_dir:
+        state_logger = StateLogger(log_dir=log_dir, min_level=logging.DEBUG)
+        state_logger.start_session("session-1")
+        for i in range(count):
+            state_logger.log_event("tick", {"i": i})
+        state_logger.end_session()
+
+        records = read_session_log(Path(log_dir) / "session-1")
+        assert [record["i"] for record in records if record["event"] == "tick"] == list(range(count))
+
+
+def test_logged_payloads_are_snapshotted():
+    with tempfile.TemporaryDirectory() as log_dir:
+        state_logger = StateLogger(log_dir=log_dir, min_level=logging.DEBUG)
+        state = PlacementState(product=PRODUCT)
+        metrics = {"execution_time_seconds": 0.1}
+        decision = {"valid": True}
+        context = {"budget": 5000}
+
+        state_logger.start_session("session-1")
+        state_logger.log_agent_output("InputAgent", state, step_number=1, metrics=metrics)
+        state_logger.log_state_transition("InputAgent", "FilterAgent", state, decision=decision)
+        state_logger.log_decision_point("Budget Check", "budget > 0", True, context=context)
+        # Callers reuse and change their dicts before the writer gets to them
+        metrics["execution_time_seconds"] = 9.9
+        decision["valid"] = False
+        context.clear()
+        state_logger.end_session()
+
+        records = {record["_file"]: record for record in read_session_log(Path(log_dir) / "session-1")}
+        assert records["step1_inputagent_output.json"]["metrics"] == {"execution_time_seconds": 0.1}
+        assert records["transition_inputagent_to_filteragent.json"]["decision"] == {"valid": True}
+        assert records["decision_budget_check.json"]["context"] == {"budget": 5000}
+
+
+def test_legacy_per_file_mode_writes_each_event_to_its_own_file():
+    with tempfile.TemporaryDirectory() as log_dir:
+        state_logger = StateLogger(log_dir=log_dir, legacy_per_file=True, min_level=logging.DEBUG)
+        log_session(state_logger, "session-1")
+        session_dir = Path(log_dir) / "session-1"
+
+        assert not (session_dir / SESSION_LOG_FILENAME).exists()
+        with open(session_dir / "step1_inputagent_output.json", encoding="utf-8") as f:
+            text = f.read()
+        # Pretty-printed, as before the session log existed
+        assert "\n  " in text
+        record = json.loads(text)
+        assert record["event"] == "agent_output"
+        assert "_file" not in record
+        assert (session_dir / "event_session_end.json").exists()
+
+
+def test_events_below_min_level_are_skipped():
+    with tempfile.TemporaryDirectory() as log_dir:
+        state_logger = StateLogger(log_dir=log_dir, min_level=logging.INFO)
+        log_session(state_logger, "session-1")
+
+        events = [record["event"] for record in read_session_log(Path(log_dir) / "session-1")]
+        assert events == ["session_start", "state_transition", "decision_point", "error", "session_end"]
+
+        state_logger = StateLogger(log_dir=log_dir, min_level=logging.ERROR)
+        log_session(state_logger, "session-2")
+
+        events = [record["event"] for record in read_session_log(Path(log_dir) / "session-2")]
+        assert events == ["error"]
+
+
+def test_null_state_logger_discards_events():
+    state_logger = NullStateLogger()
+    assert not state_logger
+    log_session(state_logger, "session-1")
+    assert state_logger.session_log_dir is None
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✓ {name}")
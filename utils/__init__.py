@@ -1,5 +1,5 @@
 """Utility modules for the retail placement system"""
 
-from .llm_client import LLMClient, get_llm_client, set_llm_client
+from .llm_client import LLMClient, LLMClientPool, get_llm_client, set_llm_client
 
-__all__ = ['LLMClient', 'get_llm_client', 'set_llm_client']
+__all__ = ['LLMClient', 'LLMClientPool', 'get_llm_client', 'set_llm_client']
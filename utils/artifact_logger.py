@@ -9,6 +9,13 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+# Use orjson for faster serialization when available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class ArtifactLogger:
     """
@@ -193,9 +200,14 @@ class ArtifactLogger:
         filename = f"analysis_{timestamp_str}_{self.session_id[:8]}.json"
         filepath = self.artifacts_dir / filename
 
-        # Save with pretty formatting
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.log, f, indent=2, ensure_ascii=False)
+        # Serialize once (pretty-printed) for both files
+        if ORJSON_AVAILABLE:
+            content = orjson.dumps(self.log, option=orjson.OPT_INDENT_2)
+        else:
+            content = json.dumps(self.log, indent=2, ensure_ascii=False).encode('utf-8')
+
+        with open(filepath, 'wb') as f:
+            f.write(content)
 
         print(f"💾 Analysis log saved to: {filepath}")
         print(f"⏱️  Total duration: {duration:.2f} seconds")
@@ -204,8 +216,8 @@ class ArtifactLogger:
 
         # Also create a "latest.json" for easy access
         latest_path = self.artifacts_dir / "latest.json"
-        with open(latest_path, 'w', encoding='utf-8') as f:
-            json.dump(self.log, f, indent=2, ensure_ascii=False)
+        with open(latest_path, 'wb') as f:
+            f.write(content)
 
         return str(filepath)
 
@@ -236,6 +248,7 @@ class ArtifactLogger:
 def create_readme():
     """Create a README file explaining the log format."""
     artifacts_dir = Path(__file__).parent.parent / "artifacts" / "logs"
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
     readme_path = artifacts_dir / "README.md"
 
     readme_content = """# Analysis Logs - README
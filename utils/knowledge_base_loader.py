@@ -7,14 +7,91 @@ LLM responses with factual, cited information.
 
 import json
 import logging
+import mmap
+import os
+import pickle
+import sys
+import threading
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass
 
+# Use orjson for faster parsing when available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Keywords that map to topics, in priority order
+_TOPIC_KEYWORDS = (
+    ('eye level', ('eye level', 'eye-level', 'eye_level')),
+    ('endcap', ('endcap', 'end cap', 'end-cap')),
+    ('checkout', ('checkout', 'check-out', 'check out', 'impulse')),
+    ('traffic', ('traffic', 'foot traffic', 'footfall', 'visitor')),
+    ('placement', ('placement', 'positioning', 'location')),
+    ('shelf', ('shelf', 'shelving')),
+    ('psychology', ('psychology', 'behavior', 'behaviour', 'decision')),
+    ('sales', ('sales', 'revenue', 'performance')),
+    ('visibility', ('visibility', 'visible', 'sight', 'view')),
+    ('cost', ('cost', 'price', 'fee', 'pricing', 'investment')),
+)
+
+
+def load_json_file(path: Path) -> Any:
+    """
+    Parse a JSON file straight from a read-only memory map.
+
+    The kernel pages the file in on demand and orjson parses the mapped bytes
+    without an intermediate copy; stdlib json is used when orjson is missing.
+
+    Args:
+        path: Path to JSON file
+
+    Returns:
+        Parsed JSON data
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return json.loads(b"")
+
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f.fileno(), 0, size, os.POSIX_FADV_SEQUENTIAL)
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if ORJSON_AVAILABLE:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+            return json.loads(mm[:])
+
+
+def file_signature(path: Path) -> Tuple[int, int]:
+    """
+    Size and nanosecond modification time of a file.
+
+    Recorded inside pickle caches, which are only used while their source
+    file still has the signature they were built from.
+
+    Args:
+        path: Path to the source file
+
+    Returns:
+        (st_size, st_mtime_ns)
+    """
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+# Bump when the cached loader layout changes to invalidate old cache files
+_CACHE_VERSION = 2
+_CACHE_FIELDS = ('metadata', 'sources', '_data_point_index', '_search_text', '_trigram_index')
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ResearchSource:
     """Represents a single research source."""
     id: str
@@ -42,17 +119,31 @@ class KnowledgeBaseLoader:
     - Extract data points for calculations
     """
 
-    def __init__(self, kb_path: str = "knowledge_base/retail_psychology_sources.json"):
+    def __init__(
+        self,
+        kb_path: str = "knowledge_base/retail_psychology_sources.json",
+        use_cache: bool = True
+    ):
         """
         Initialize knowledge base loader.
 
         Args:
             kb_path: Path to knowledge base JSON file
+            use_cache: Reuse a pickled copy of the parsed knowledge base
+                (stored next to the JSON file) built from the current JSON
         """
         self.kb_path = Path(kb_path)
+        self.cache_path = self.kb_path.with_suffix('.pkl')
+        self.use_cache = use_cache
         self.sources: List[ResearchSource] = []
         self.metadata: Dict[str, Any] = {}
+        self._data_point_index: Dict[str, float] = {}
+        # Lowercased title + findings per source, parallel to self.sources
+        self._search_text: List[str] = []
+        # Trigram -> indices of sources whose search text contains it
+        self._trigram_index: Dict[str, Set[int]] = {}
         self._load_knowledge_base()
+        self._summary_statistics = self._compute_summary_statistics()
 
     def _load_knowledge_base(self):
         """Load knowledge base from JSON file."""
@@ -60,34 +151,140 @@ class KnowledgeBaseLoader:
             logger.warning(f"Knowledge base not found: {self.kb_path}")
             return
 
+        # Taken before parsing, so a file changed mid-load invalidates the cache
+        source_signature = file_signature(self.kb_path)
+        if self.use_cache and self._load_from_cache(source_signature):
+            logger.info(f"✓ Loaded {len(self.sources)} research sources from knowledge base cache")
+            return
+
         try:
-            with open(self.kb_path, 'r') as f:
-                data = json.load(f)
+            data = load_json_file(self.kb_path)
 
             self.metadata = data.get('metadata', {})
 
-            # Parse sources
+            # Parse sources (intern repeated strings so duplicates share storage)
             for source_data in data.get('sources', []):
                 source = ResearchSource(
                     id=source_data.get('id', ''),
-                    title=source_data.get('title', ''),
+                    title=sys.intern(source_data.get('title', '')),
                     url=source_data.get('url', ''),
-                    publisher=source_data.get('publisher', ''),
+                    publisher=sys.intern(source_data.get('publisher', '')),
                     year=source_data.get('year', 2024),
-                    key_findings=source_data.get('key_findings', []),
+                    key_findings=[sys.intern(f) for f in source_data.get('key_findings', [])],
                     data_points=source_data.get('data_points', {})
                 )
                 self.sources.append(source)
+                self._search_text.append(
+                    "\0".join([source.title, *source.key_findings]).lower()
+                )
+
+            # Flat key -> value index (first source wins, matching scan order)
+            for source in self.sources:
+                for key, value in source.data_points.items():
+                    self._data_point_index.setdefault(key, value)
+
+            # Trigram index used to narrow keyword searches
+            for index, text in enumerate(self._search_text):
+                for i in range(len(text) - 2):
+                    self._trigram_index.setdefault(text[i:i + 3], set()).add(index)
 
             logger.info(f"✓ Loaded {len(self.sources)} research sources from knowledge base")
 
         except Exception as e:
             logger.error(f"Failed to load knowledge base: {e}")
+            return
+
+        if self.use_cache:
+            self._save_to_cache(source_signature)
+
+    def _load_from_cache(self, source_signature: Tuple[int, int]) -> bool:
+        """
+        Restore parsed sources and indexes from the pickle cache.
+
+        Args:
+            source_signature: file_signature() of the knowledge base JSON
+
+        Returns:
+            True if a fresh cache was loaded, False otherwise
+        """
+        try:
+            with open(self.cache_path, 'rb') as f:
+                cached = pickle.load(f)
+
+            if (not isinstance(cached, dict)
+                    or cached.get('version') != _CACHE_VERSION
+                    or cached.get('source_signature') != source_signature):
+                return False
+
+            # Check every field before assigning any, so a broken cache
+            # leaves the loader empty for the JSON fallback
+            missing = [field for field in _CACHE_FIELDS if field not in cached]
+            if missing:
+                logger.warning(f"Ignoring incomplete knowledge base cache {self.cache_path}: missing {missing}")
+                return False
+
+            for field in _CACHE_FIELDS:
+                setattr(self, field, cached[field])
+            return True
+
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable knowledge base cache {self.cache_path}: {e}")
+            return False
+
+    def _save_to_cache(self, source_signature: Tuple[int, int]):
+        """
+        Write parsed sources and indexes to the pickle cache.
+
+        Args:
+            source_signature: file_signature() of the JSON they were parsed from
+        """
+        cached = {field: getattr(self, field) for field in _CACHE_FIELDS}
+        cached['version'] = _CACHE_VERSION
+        cached['source_signature'] = source_signature
+
+        tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.warning(f"Could not write knowledge base cache {self.cache_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
 
     def get_all_sources(self) -> List[ResearchSource]:
         """Get all research sources."""
         return self.sources
 
+    def _match_indices(self, keyword_lower: str) -> List[int]:
+        """
+        Get indices of sources whose title or findings contain a keyword.
+
+        Keywords of three or more characters are narrowed to candidate sources
+        sharing all of their trigrams before the substring check.
+
+        Args:
+            keyword_lower: Lowercased search term
+
+        Returns:
+            Matching source indices in load order
+        """
+        if len(keyword_lower) < 3:
+            candidates = range(len(self.sources))
+        else:
+            postings = []
+            for i in range(len(keyword_lower) - 2):
+                posting = self._trigram_index.get(keyword_lower[i:i + 3])
+                if not posting:
+                    return []
+                postings.append(posting)
+
+            postings.sort(key=len)
+            candidates = sorted(postings[0].intersection(*postings[1:]))
+
+        return [i for i in candidates if keyword_lower in self._search_text[i]]
+
     def search_by_keyword(self, keyword: str) -> List[ResearchSource]:
         """
         Search sources by keyword in title or findings.
@@ -98,22 +295,34 @@ class KnowledgeBaseLoader:
         Returns:
             List of matching sources
         """
-        keyword_lower = keyword.lower()
-        matches = []
+        return [self.sources[i] for i in self._match_indices(keyword.lower())]
 
-        for source in self.sources:
-            # Search in title
-            if keyword_lower in source.title.lower():
-                matches.append(source)
-                continue
+    def iter_relevant_for_question(self, question: str) -> Iterator[ResearchSource]:
+        """
+        Lazily yield relevant sources for a user question.
 
-            # Search in findings
-            for finding in source.key_findings:
-                if keyword_lower in finding.lower():
-                    matches.append(source)
-                    break
+        Sources are yielded in topic order without duplicates, so callers can
+        stop as soon as they have enough.
 
-        return matches
+        Args:
+            question: User's question
+
+        Yields:
+            Relevant sources
+        """
+        question_lower = question.lower()
+
+        seen_ids = set()
+        for topic, keywords in _TOPIC_KEYWORDS:
+            if not any(keyword in question_lower for keyword in keywords):
+                continue
+
+            # Search for sources about this topic (keep first occurrence)
+            for index in self._match_indices(topic):
+                source = self.sources[index]
+                if source.id not in seen_ids:
+                    seen_ids.add(source.id)
+                    yield source
 
     def get_relevant_for_question(self, question: str, max_sources: int = 5) -> List[ResearchSource]:
         """
@@ -126,45 +335,13 @@ class KnowledgeBaseLoader:
         Returns:
             List of relevant sources
         """
-        question_lower = question.lower()
-
-        # Keywords that map to topics
-        topic_keywords = {
-            'eye level': ['eye level', 'eye-level', 'eye_level'],
-            'endcap': ['endcap', 'end cap', 'end-cap'],
-            'checkout': ['checkout', 'check-out', 'check out', 'impulse'],
-            'traffic': ['traffic', 'foot traffic', 'footfall', 'visitor'],
-            'placement': ['placement', 'positioning', 'location'],
-            'shelf': ['shelf', 'shelving'],
-            'psychology': ['psychology', 'behavior', 'behaviour', 'decision'],
-            'sales': ['sales', 'revenue', 'performance'],
-            'visibility': ['visibility', 'visible', 'sight', 'view'],
-            'cost': ['cost', 'price', 'fee', 'pricing', 'investment']
-        }
-
-        # Find matching topics
-        relevant_sources = []
-        for topic, keywords in topic_keywords.items():
-            for keyword in keywords:
-                if keyword in question_lower:
-                    # Search for sources about this topic
-                    matches = self.search_by_keyword(topic)
-                    relevant_sources.extend(matches)
-                    break
-
-        # Remove duplicates (keep first occurrence)
-        seen_ids = set()
-        unique_sources = []
-        for source in relevant_sources:
-            if source.id not in seen_ids:
-                unique_sources.append(source)
-                seen_ids.add(source.id)
+        unique_sources = list(islice(self.iter_relevant_for_question(question), max_sources))
 
         # If no specific matches, return general retail sources
         if not unique_sources:
             unique_sources = self.sources[:max_sources]
 
-        return unique_sources[:max_sources]
+        return unique_sources
 
     def get_data_point(self, key: str) -> Optional[float]:
         """
@@ -176,10 +353,7 @@ class KnowledgeBaseLoader:
         Returns:
             First matching data point value, or None
         """
-        for source in self.sources:
-            if key in source.data_points:
-                return source.data_points[key]
-        return None
+        return self._data_point_index.get(key)
 
     def get_context_for_llm(
         self,
@@ -217,26 +391,41 @@ class KnowledgeBaseLoader:
 
         return context
 
-    def get_summary_statistics(self) -> Dict[str, Any]:
-        """Get summary statistics about the knowledge base."""
-        total_findings = sum(len(s.key_findings) for s in self.sources)
-        total_data_points = sum(len(s.data_points) for s in self.sources)
+    def _compute_summary_statistics(self) -> Dict[str, Any]:
+        """Aggregate summary statistics in a single pass over loaded sources."""
+        total_findings = 0
+        total_data_points = 0
+        publishers = set()
+        year_min = year_max = None
 
-        publishers = set(s.publisher for s in self.sources)
-        years = [s.year for s in self.sources]
+        for source in self.sources:
+            total_findings += len(source.key_findings)
+            total_data_points += len(source.data_points)
+            publishers.add(source.publisher)
+            if year_min is None or source.year < year_min:
+                year_min = source.year
+            if year_max is None or source.year > year_max:
+                year_max = source.year
 
         return {
             'total_sources': len(self.sources),
             'total_findings': total_findings,
             'total_data_points': total_data_points,
             'unique_publishers': len(publishers),
-            'year_range': (min(years), max(years)) if years else (None, None),
-            'publishers': sorted(list(publishers))
+            'year_range': (year_min, year_max),
+            'publishers': sorted(publishers)
         }
 
+    def get_summary_statistics(self) -> Dict[str, Any]:
+        """Get summary statistics about the knowledge base."""
+        stats = dict(self._summary_statistics)
+        stats['publishers'] = list(stats['publishers'])
+        return stats
+
 
 # Global knowledge base instance
 _global_kb: Optional[KnowledgeBaseLoader] = None
+_global_kb_lock = threading.Lock()
 
 
 def get_knowledge_base() -> KnowledgeBaseLoader:
@@ -248,7 +437,9 @@ def get_knowledge_base() -> KnowledgeBaseLoader:
     """
     global _global_kb
     if _global_kb is None:
-        _global_kb = KnowledgeBaseLoader()
+        with _global_kb_lock:
+            if _global_kb is None:
+                _global_kb = KnowledgeBaseLoader()
     return _global_kb
 
 
@@ -263,8 +454,10 @@ def init_knowledge_base(kb_path: str = "knowledge_base/retail_psychology_sources
         KnowledgeBaseLoader instance
     """
     global _global_kb
-    _global_kb = KnowledgeBaseLoader(kb_path=kb_path)
-    return _global_kb
+    kb = KnowledgeBaseLoader(kb_path=kb_path)
+    with _global_kb_lock:
+        _global_kb = kb
+    return kb
 
 
 if __name__ == '__main__':
@@ -5,12 +5,19 @@ Stores and queries research-backed knowledge about retail placement strategies
 
 import json
 import logging
+import os
+import pickle
+import threading
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 import networkx as nx
+from utils.knowledge_base_loader import file_signature, load_json_file
 
 logger = logging.getLogger(__name__)
 
+# Bump when the cached graph layout changes to invalidate old cache files
+_CACHE_VERSION = 1
+
 
 class RetailKnowledgeGraph:
     """
@@ -99,45 +106,75 @@ class RetailKnowledgeGraph:
         Returns:
             List of related concepts with relationship info
         """
-        if concept_id not in self.graph:
-            return []
-
-        related = []
-
-        # BFS traversal
-        visited = {concept_id}
-        queue = [(concept_id, 0)]  # (node, depth)
-
-        while queue:
-            current, depth = queue.pop(0)
-
-            if depth >= max_depth:
-                continue
-
-            # Get outgoing edges
-            for neighbor in self.graph.successors(current):
-                edge_data = self.graph[current][neighbor]
+        return [
+            self._related_concept(neighbor, node_data, edge_data, depth)
+            for neighbor, node_data, edge_data, depth in self._traverse(concept_id, relationship_type, max_depth)
+        ]
 
-                # Filter by relationship type if specified
-                if relationship_type and edge_data.get('type') != relationship_type:
-                    continue
+    def _traverse(
+        self,
+        concept_id: str,
+        relationship_type: Optional[str],
+        max_depth: int
+    ) -> Iterator[Tuple[str, Dict[str, Any], Dict[str, Any], int]]:
+        """
+        Breadth-first walk over outgoing edges.
 
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    node_data = self.graph.nodes[neighbor]
+        Yields the graph's own attribute dicts, without copying them; callers
+        must not modify them or hand them out.
 
-                    related.append({
-                        'concept_id': neighbor,
-                        'type': node_data.get('type'),
-                        'properties': {k: v for k, v in node_data.items() if k != 'type'},
-                        'relationship': edge_data.get('type'),
-                        'relationship_props': {k: v for k, v in edge_data.items() if k != 'type'},
-                        'depth': depth + 1
-                    })
+        Args:
+            concept_id: Starting concept ID
+            relationship_type: Filter by relationship type (optional)
+            max_depth: Maximum depth for traversal
 
-                    queue.append((neighbor, depth + 1))
+        Yields:
+            (concept_id, node attributes, edge attributes, depth)
+        """
+        if concept_id not in self.graph:
+            return
 
-        return related
+        # Level-by-level BFS; depth is the loop counter
+        visited = {concept_id}
+        frontier = [concept_id]
+        adjacency = self.graph.succ
+        nodes = self.graph.nodes
+
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+
+            for current in frontier:
+                # Get outgoing edges
+                for neighbor, edge_data in adjacency[current].items():
+                    # Filter by relationship type if specified
+                    if relationship_type and edge_data.get('type') != relationship_type:
+                        continue
+
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        yield neighbor, nodes[neighbor], edge_data, depth
+                        next_frontier.append(neighbor)
+
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+    @staticmethod
+    def _related_concept(
+        concept_id: str,
+        node_data: Dict[str, Any],
+        edge_data: Dict[str, Any],
+        depth: int
+    ) -> Dict[str, Any]:
+        """Build a query_related_concepts() entry, copying the attributes."""
+        return {
+            'concept_id': concept_id,
+            'type': node_data.get('type'),
+            'properties': {k: v for k, v in node_data.items() if k != 'type'},
+            'relationship': edge_data.get('type'),
+            'relationship_props': {k: v for k, v in edge_data.items() if k != 'type'},
+            'depth': depth
+        }
 
     def query_by_type(self, concept_type: str) -> List[Dict[str, Any]]:
         """
@@ -186,16 +223,14 @@ class RetailKnowledgeGraph:
         ]
 
         for product_concept in product_concepts:
-            # Find strategies linked to this product type
-            related = self.query_related_concepts(
+            # Find strategies linked to this product type; only those are copied
+            for neighbor, node_data, edge_data, depth in self._traverse(
                 product_concept,
                 relationship_type='benefits_from',
                 max_depth=2
-            )
-
-            for item in related:
-                if item['type'] == 'strategy':
-                    strategies.append(item)
+            ):
+                if node_data.get('type') == 'strategy':
+                    strategies.append(self._related_concept(neighbor, node_data, edge_data, depth))
 
         return strategies
 
@@ -227,8 +262,8 @@ class RetailKnowledgeGraph:
         location_node = location_nodes[0]
         node_data = self.graph.nodes[location_node]
 
-        # Get related insights
-        related = self.query_related_concepts(location_node, max_depth=2)
+        # Get related insights, reading the graph's attributes in place
+        related = self._traverse(location_node, None, 2)
 
         insights = {
             'zone_type': zone_type,
@@ -238,21 +273,22 @@ class RetailKnowledgeGraph:
             'customer_behaviors': []
         }
 
-        for item in related:
-            if item['type'] == 'product_type':
+        for _, properties, relationship_props, _ in related:
+            concept_type = properties.get('type')
+            if concept_type == 'product_type':
                 insights['best_for_categories'].append({
-                    'category': item['properties'].get('category'),
-                    'reason': item['relationship_props'].get('reason', '')
+                    'category': properties.get('category'),
+                    'reason': relationship_props.get('reason', '')
                 })
-            elif item['type'] == 'strategy':
+            elif concept_type == 'strategy':
                 insights['strategies'].append({
-                    'strategy': item['properties'].get('name'),
-                    'description': item['properties'].get('description', '')
+                    'strategy': properties.get('name'),
+                    'description': properties.get('description', '')
                 })
-            elif item['type'] == 'customer_behavior':
+            elif concept_type == 'customer_behavior':
                 insights['customer_behaviors'].append({
-                    'behavior': item['properties'].get('name'),
-                    'impact': item['properties'].get('impact', '')
+                    'behavior': properties.get('name'),
+                    'impact': properties.get('impact', '')
                 })
 
         return insights
@@ -275,24 +311,81 @@ class RetailKnowledgeGraph:
 
         logger.info(f"Saved knowledge graph to {filepath}")
 
-    def load_from_file(self, filepath: str) -> None:
-        """Load knowledge graph from JSON file."""
-        with open(filepath, 'r') as f:
-            data = json.load(f)
+    def load_from_file(self, filepath: str, use_cache: bool = True) -> None:
+        """
+        Load knowledge graph from JSON file.
+
+        Args:
+            filepath: Path to knowledge graph JSON file
+            use_cache: Reuse a pickled copy of the graph (stored next to the
+                JSON file) built from the current JSON
+        """
+        json_path = Path(filepath)
+        cache_path = json_path.with_suffix('.pkl')
+        # Taken before parsing, so a file changed mid-load invalidates the cache
+        source_signature = file_signature(json_path)
+
+        if use_cache:
+            cached_graph = self._load_cached_graph(source_signature, cache_path)
+            if cached_graph is not None:
+                self.graph.update(cached_graph)
+                logger.info(f"Loaded knowledge graph from cache {cache_path}")
+                return
+
+        data = load_json_file(json_path)
+        loaded = nx.DiGraph()
 
         # Add nodes
         for node in data['nodes']:
             node_id = node.pop('id')
-            self.graph.add_node(node_id, **node)
+            loaded.add_node(node_id, **node)
 
         # Add edges
         for edge in data['edges']:
             source = edge.pop('source')
             target = edge.pop('target')
-            self.graph.add_edge(source, target, **edge)
+            loaded.add_edge(source, target, **edge)
 
+        self.graph.update(loaded)
         logger.info(f"Loaded knowledge graph from {filepath}")
 
+        if use_cache:
+            self._save_cached_graph(loaded, source_signature, cache_path)
+
+    @staticmethod
+    def _load_cached_graph(source_signature: Tuple[int, int], cache_path: Path) -> Optional[nx.DiGraph]:
+        """Return the pickled graph if it was built from the current JSON."""
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+
+            if (not isinstance(cached, dict)
+                    or cached.get('version') != _CACHE_VERSION
+                    or cached.get('source_signature') != source_signature):
+                return None
+
+            cached_graph = cached.get('graph')
+            return cached_graph if isinstance(cached_graph, nx.DiGraph) else None
+
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable knowledge graph cache {cache_path}: {e}")
+            return None
+
+    @staticmethod
+    def _save_cached_graph(graph: nx.DiGraph, source_signature: Tuple[int, int], cache_path: Path) -> None:
+        """Pickle the parsed graph next to its JSON source."""
+        cached = {'version': _CACHE_VERSION, 'source_signature': source_signature, 'graph': graph}
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"Could not write knowledge graph cache {cache_path}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about the knowledge graph."""
         types_count = {}
@@ -305,24 +398,31 @@ class RetailKnowledgeGraph:
             rel_type = data.get('type', 'unknown')
             relationship_types[rel_type] = relationship_types.get(rel_type, 0) + 1
 
+        total_nodes = self.graph.number_of_nodes()
+        total_edges = self.graph.number_of_edges()
+
         return {
-            'total_nodes': self.graph.number_of_nodes(),
-            'total_edges': self.graph.number_of_edges(),
+            'total_nodes': total_nodes,
+            'total_edges': total_edges,
             'node_types': types_count,
             'relationship_types': relationship_types,
             'density': nx.density(self.graph),
-            'average_degree': sum(dict(self.graph.degree()).values()) / self.graph.number_of_nodes() if self.graph.number_of_nodes() > 0 else 0
+            # Every directed edge adds one in-degree and one out-degree
+            'average_degree': (2 * total_edges) / total_nodes if total_nodes > 0 else 0
         }
 
 
 # Initialize global knowledge graph
 _global_kg = None
+_global_kg_lock = threading.Lock()
 
 
 def get_knowledge_graph() -> RetailKnowledgeGraph:
     """Get or create global knowledge graph instance."""
     global _global_kg
     if _global_kg is None:
-        kg_path = Path(__file__).parent.parent / "data" / "knowledge_graph.json"
-        _global_kg = RetailKnowledgeGraph(str(kg_path) if kg_path.exists() else None)
+        with _global_kg_lock:
+            if _global_kg is None:
+                kg_path = Path(__file__).parent.parent / "data" / "knowledge_graph.json"
+                _global_kg = RetailKnowledgeGraph(str(kg_path) if kg_path.exists() else None)
     return _global_kg
@@ -6,17 +6,1041 @@ Includes knowledge base integration for research-backed responses
 
 import os
 import json
+import time
+import atexit
+import asyncio
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
-from openai import OpenAI
-from dotenv import load_dotenv
-from utils.knowledge_base_loader import get_knowledge_base
-
-# Load environment variables from .env file
-load_dotenv()
+import random
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from statistics import fmean
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple, Any
+
+# The openai and httpx packages are slow to import; load them on first
+# client creation (numpy on first SemanticCache)
+if TYPE_CHECKING:
+    import httpx
+    import numpy as np
+    from openai import AsyncOpenAI
+
+# Use orjson for faster (de)serialization when available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Use tiktoken for exact prompt token counts when available
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+if ORJSON_AVAILABLE:
+    _loads = orjson.loads
+
+    def _dumps(obj: Any, sort_keys: bool = False, default: Optional[Callable] = None) -> str:
+        """Serialize to a compact JSON string with orjson."""
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=default, option=option).decode('utf-8')
+else:
+    _loads = json.loads
+
+    def _dumps(obj: Any, sort_keys: bool = False, default: Optional[Callable] = None) -> str:
+        """Serialize to a compact JSON string with the stdlib encoder."""
+        return json.dumps(obj, separators=(',', ':'), sort_keys=sort_keys, default=default)
+
+# Only near-deterministic generations are reused from the response cache
+CACHEABLE_MAX_TEMPERATURE = 0.3
+
+# Prompt + completion token limit assumed when the model's is not given
+DEFAULT_CONTEXT_WINDOW = 128000
+
+FOLLOWUP_MAX_TOKENS = 500
+
+# Follow-up questions answered per request by answer_followup_questions;
+# past this, longer replies cost more than the shared prompt saves
+FOLLOWUP_BATCH_SIZE = 8
+
+# Longest a follow-up answer waits for the knowledge base to finish loading
+KNOWLEDGE_BASE_TIMEOUT = 0.5
+
+# Backoff defaults: up to 5 attempts, full jitter from 0.5s doubling to a 30s cap
+RETRY_ATTEMPTS = 5
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+# Rest period for a pooled endpoint that returned 429 without Retry-After
+RATE_LIMIT_COOLDOWN = 10.0
+
+# Bulk runs larger than this go through the provider's Batch API
+BATCH_API_MIN_REQUESTS = 50
+BATCH_POLL_INTERVAL = 30.0
+BATCH_TERMINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+# Connection warm-up (see LLMClient.warm_up)
+WARM_UP_TIMEOUT = 5.0
+
+# Models that accept response_format={"type": "json_object"}, minus the
+# gpt-3.5 snapshots that predate it
+JSON_MODE_MODEL_PREFIXES = ('gpt-4', 'gpt-5', 'gpt-3.5-turbo')
+JSON_MODE_UNSUPPORTED_MODELS = ('gpt-3.5-turbo-0301', 'gpt-3.5-turbo-0613', 'gpt-3.5-turbo-16k')
+
+# Markdown code fence some models wrap JSON answers in
+_CODE_FENCE_PATTERN = re.compile(r'^```(?:json)?\s*(.*?)\s*```$', re.DOTALL | re.IGNORECASE)
+
+# "A1:" labels starting each answer of a batched follow-up reply
+_ANSWER_LABEL_PATTERN = re.compile(r'^[ \t*#]*A(\d+)\s*[:.)]\**', re.MULTILINE)
+
+# Static system prompts, kept byte-identical across calls so providers can
+# reuse their cached prefix
+PLACEMENT_ANALYSIS_SYSTEM_PROMPT = """You are an expert retail analyst specializing in product placement optimization.
+Provide SHORT, CONCISE, and FACTUAL explanations (3-5 bullet points maximum).
+
+Focus on:
+- WHY this placement works (data-driven)
+- Top 3 success factors only
+- 1-2 key considerations
+
+Use professional business language. Be direct and brief. NO lengthy paragraphs or sections."""
+
+COMPETITIVE_ANALYSIS_SYSTEM_PROMPT = """You are a competitive intelligence analyst for retail product placement.
+Analyze competitive positioning and provide strategic insights.
+
+Focus on:
+- Market position relative to competitors
+- Pricing strategy implications
+- Differentiation opportunities
+- Competitive advantages/disadvantages
+- Strategic recommendations"""
+
+FOLLOWUP_SYSTEM_PROMPT = """You are a retail analytics expert. Answer questions about product placement recommendations.
+
+Be SHORT and CONCISE (3-5 sentences maximum):
+- Use specific numbers from the analysis
+- Be factual and data-driven
+- Cite research when available (e.g., "Research shows...")
+- Professional business language
+- Direct answers only
+
+NO lengthy paragraphs or unnecessary details."""
+
+INSIGHT_SUMMARY_SYSTEM_PROMPT = """You are an executive analyst preparing a placement strategy summary.
+Generate a JSON response with these sections:
+
+{
+  "executive_summary": "2-3 sentence overview",
+  "key_insights": ["insight 1", "insight 2", "insight 3"],
+  "success_factors": ["factor 1", "factor 2", "factor 3"],
+  "risks": ["risk 1", "risk 2"],
+  "recommendation": "Primary recommendation with rationale"
+}"""
+
+COMBINED_BRIEF_SYSTEM_PROMPT = """You are an expert retail analyst preparing a complete placement brief.
+Generate a JSON response with these sections:
+
+{
+  "placement_rationale": "3-5 short bullet points on why this placement works",
+  "competitive_analysis": "Position relative to competitors and how to win",
+  "executive_summary": "2-3 sentence overview",
+  "risks": "1-2 key risks and how to mitigate them"
+}
+
+Be concise, factual and data-driven. Use professional business language."""
+
+# Sections returned by generate_combined_brief()
+COMBINED_BRIEF_SECTIONS = ('placement_rationale', 'competitive_analysis', 'executive_summary', 'risks')
+
+# User prompt templates, filled with str.format_map per call
+PLACEMENT_ANALYSIS_TEMPLATE = """Product: {name} (${price:.2f}, {category})
+Location: {zone_name} ({zone_type})
+Traffic: {traffic_level} ({traffic_index} visitors/day)
+Visibility: {visibility_factor}x
+ROI: {roi_score:.2f}x
+
+Explain in 3-5 SHORT bullet points why this placement works. Be concise and factual."""
+
+COMPETITIVE_ANALYSIS_TEMPLATE = """Analyze competitive positioning for this product placement:
+
+**Our Product:**
+- {name} (${price:.2f})
+- Predicted ROI: {predicted_roi:.2f}
+
+**Location:** {zone_name}
+
+**Competitors in this location ({competitor_count} total):**
+{competitor_summary}
+
+**Average Competitor ROI:** {avg_competitor_roi:.2f}
+
+Provide strategic analysis of our competitive position and recommendations for success."""
+
+FOLLOWUP_TEMPLATE = """Question: {question}
+
+Product: {name} (${price:.2f}, {category}, Budget: ${budget})
+
+Top Recommendations:
+{recommendations_text}
+
+Analysis Context: {context_text}
+
+{research_context}
+
+Answer in 3-5 concise sentences with specific data points. If research is provided, reference it naturally (e.g., "Studies show...")."""
+
+FOLLOWUP_BATCH_TEMPLATE = """Questions:
+{questions_text}
+
+Product: {name} (${price:.2f}, {category}, Budget: ${budget})
+
+Top Recommendations:
+{recommendations_text}
+
+Analysis Context: {context_text}
+
+{research_context}
+
+Answer each question in 3-5 concise sentences with specific data points. Start each answer on a new line with its label (A1:, A2:, ...). If research is provided, reference it naturally (e.g., "Studies show...")."""
+
+INSIGHT_SUMMARY_TEMPLATE = """Generate executive summary for this placement analysis:
+
+Product: {name} (${price:.2f}, {category})
+Budget: ${budget}
+
+Top Locations:
+{locations_text}
+
+Respond with JSON only."""
+
+COMBINED_BRIEF_TEMPLATE = """Prepare the placement brief for:
+
+Product: {name} (${price:.2f}, {category})
+Location: {zone_name} ({zone_type})
+Traffic: {traffic_level} ({traffic_index} visitors/day)
+Visibility: {visibility_factor}x
+Predicted ROI: {roi_score:.2f}x
+
+Competitors in this location ({competitor_count} total):
+{competitor_summary}
+Average Competitor ROI: {avg_competitor_roi:.2f}
+
+Analysis Context: {context_text}
+
+Respond with JSON only."""
+
+_EMPTY_CONTEXT_TEXT = "Basic analysis only"
+
+# Bounds on the context block sent with follow-up questions
+CONTEXT_MAX_CHARS = 4000
+CONTEXT_MAX_STRING_CHARS = 600
+CONTEXT_MAX_LIST_ITEMS = 5
+
+
+def _shrink_context_value(value: Any) -> Any:
+    """Cut long strings and lists inside a context value."""
+    if isinstance(value, str):
+        if len(value) > CONTEXT_MAX_STRING_CHARS:
+            return value[:CONTEXT_MAX_STRING_CHARS] + "…"
+        return value
+    if isinstance(value, dict):
+        return {k: _shrink_context_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [_shrink_context_value(v) for v in value[:CONTEXT_MAX_LIST_ITEMS]]
+        if len(value) > CONTEXT_MAX_LIST_ITEMS:
+            items.append(f"… {len(value) - CONTEXT_MAX_LIST_ITEMS} more")
+        return items
+    return value
+
+
+def _format_context(context: Optional[Dict[str, Any]], max_chars: int = CONTEXT_MAX_CHARS) -> str:
+    """
+    Serialize prompt context compactly, skipping the dump when empty.
+
+    Long strings and lists are shortened first, then the whole block is
+    capped at max_chars.
+    """
+    if not context:
+        return _EMPTY_CONTEXT_TEXT
+    text = _dumps(_shrink_context_value(context), default=str)
+    return text if len(text) <= max_chars else text[:max_chars] + "…"
+
+
+@lru_cache(maxsize=64)
+def _system_message(system_prompt: str, cache_control: bool) -> Dict[str, Any]:
+    """
+    Build the system message for a prompt once and share it across requests.
+
+    The returned dict is reused by reference and must not be mutated.
+    """
+    if cache_control:
+        return {
+            "role": "system",
+            "content": [{
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"}
+            }]
+        }
+    return {"role": "system", "content": system_prompt}
+
+
+@lru_cache(maxsize=1)
+def _load_env():
+    """
+    Load environment variables from the .env file once.
+
+    Runs on first client creation rather than at import. FLUX_SKIP_DOTENV=1
+    skips it, e.g. for tests that set the environment themselves.
+    """
+    if os.getenv("FLUX_SKIP_DOTENV") != "1":
+        from dotenv import load_dotenv
+        load_dotenv()
+
+
+@lru_cache(maxsize=1)
+def _knowledge_base_future() -> Future:
+    """
+    Start loading the knowledge base on a background thread, once per process.
+
+    Returns:
+        Future resolving to the global KnowledgeBaseLoader
+    """
+    future: Future = Future()
+
+    def load():
+        try:
+            from utils.knowledge_base_loader import get_knowledge_base
+            future.set_result(get_knowledge_base())
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=load, name="knowledge-base-warmup", daemon=True).start()
+    return future
+
+
+@lru_cache(maxsize=1)
+def _token_encoding() -> Optional[Any]:
+    """Load the tiktoken encoding once, or None if it is unavailable."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable, estimating token counts: {e}")
+        return None
+
+
+def _count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, or estimate about 4 characters per token."""
+    encoding = _token_encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _fit_context(context: Dict[str, Any], budget: int) -> Dict[str, Any]:
+    """
+    Drop context entries, last first, until the serialized context fits.
+
+    Args:
+        context: Prompt context in priority order (most important first)
+        budget: Maximum tokens for the serialized context
+
+    Returns:
+        The context itself if it fits, otherwise a trimmed copy
+    """
+    keys = list(context)
+    while keys and _count_tokens(_format_context({k: context[k] for k in keys})) > budget:
+        keys.pop()
+
+    if len(keys) == len(context):
+        return context
+
+    logger.warning(f"Trimmed prompt context to fit token budget: dropped {list(context)[len(keys):]}")
+    return {k: context[k] for k in keys}
+
+
+def _split_numbered_answers(response: Optional[str], count: int) -> List[Optional[str]]:
+    """
+    Split a batched follow-up reply into its "A<n>:" answers.
+
+    Args:
+        response: Model reply
+        count: Number of questions asked
+
+    Returns:
+        Answer per question, None where the reply has no usable answer
+    """
+    answers: List[Optional[str]] = [None] * count
+    if not response or response.startswith("Error generating response"):
+        return answers
+
+    matches = list(_ANSWER_LABEL_PATTERN.finditer(response))
+    for match, next_match in zip(matches, matches[1:] + [None]):
+        index = int(match.group(1)) - 1
+        end = next_match.start() if next_match else len(response)
+        answer = response[match.end():end].strip()
+        if 0 <= index < count and answer and answers[index] is None:
+            answers[index] = answer
+    return answers
+
+
+_get_observed_roi = itemgetter('observed_roi')
+
+
+@lru_cache(maxsize=256)
+def _format_competitors(rows: Tuple[Tuple[str, float, float], ...]) -> str:
+    """Format (name, price, roi) competitor rows as a prompt bullet list."""
+    return "\n".join([f"- {name}: ${price:.2f}, ROI {roi:.2f}" for name, price, roi in rows])
+
+
+def _cached_prompt_tokens(usage: Any) -> Optional[int]:
+    """Prompt tokens served from the provider's prefix cache, if reported."""
+    if usage is None:
+        return None
+    # Anthropic-style usage (also passed through by OpenRouter)
+    cache_read = getattr(usage, 'cache_read_input_tokens', None)
+    if cache_read is not None:
+        return cache_read
+    details = getattr(usage, 'prompt_tokens_details', None)
+    return getattr(details, 'cached_tokens', None) if details is not None else None
+
+
+@lru_cache(maxsize=1)
+def _retryable_errors() -> Tuple[type, ...]:
+    """Transient API errors worth retrying with backoff."""
+    from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+    return (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+
+def _is_auth_error(error: Exception) -> bool:
+    """True for invalid or revoked API credentials, which no retry can fix."""
+    from openai import AuthenticationError
+    return isinstance(error, AuthenticationError)
+
+
+def _rate_limit_cooldown(error: Exception) -> Optional[float]:
+    """Seconds to rest an endpoint after a 429, or None for other errors."""
+    from openai import RateLimitError
+    if not isinstance(error, RateLimitError):
+        return None
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000.0
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except ValueError:
+        pass
+    return RATE_LIMIT_COOLDOWN
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the request rate to the provider.
+
+    Callers reserve a token and sleep for the returned delay, so bursts are
+    smoothed out instead of turning into 429 responses.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token and return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when the circuit breaker is rejecting calls."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling the provider for a cooldown after repeated failures.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to reject calls once open
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def check(self):
+        """Raise CircuitOpenError while the circuit is open."""
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Half-open: let the next call through to probe the provider
+                self._opened_at = None
+                self._failures = self.failure_threshold - 1
+                return
+        raise CircuitOpenError("LLM provider circuit open after repeated failures")
+
+    def record_success(self):
+        """Reset the failure count after a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff delay for a retry attempt (0-based)."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+# Process-wide HTTP connection pool shared by all LLM clients
+_shared_http_client: Optional["httpx.Client"] = None
+_shared_http_client_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    """Check whether httpx can negotiate HTTP/2 (needs the `h2` package)."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# Connection pool settings shared by the sync and async HTTP clients. Idle
+# connections are kept for 5 minutes so bursts of calls skip the TLS handshake.
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 50
+HTTP_KEEPALIVE_EXPIRY = 300.0
+HTTP_READ_TIMEOUT = 60.0
+HTTP_CONNECT_TIMEOUT = 10.0
+
+
+def _http_pool_settings() -> Dict[str, Any]:
+    """Pool limits and timeouts for an httpx client."""
+    import httpx
+    return {
+        'limits': httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        ),
+        'timeout': httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT)
+    }
+
+
+def get_shared_http_client() -> "httpx.Client":
+    """
+    Get the shared keep-alive HTTP client used for LLM API calls.
+
+    Reusing one tuned pool avoids repeated TCP/TLS handshakes across clients
+    and bursts of requests. The pool is closed at interpreter exit.
+
+    Returns:
+        Shared httpx.Client instance
+    """
+    global _shared_http_client
+    if _shared_http_client is None:
+        with _shared_http_client_lock:
+            if _shared_http_client is None:
+                import httpx
+                settings = _http_pool_settings()
+                transport = httpx.HTTPTransport(
+                    http2=_http2_available(),
+                    retries=2,
+                    limits=settings['limits']
+                )
+                _shared_http_client = httpx.Client(transport=transport, timeout=settings['timeout'])
+                atexit.register(_shared_http_client.close)
+    return _shared_http_client
+
+
+# Process-wide async HTTP pool. It lives on one background event loop so its
+# keep-alive connections outlast each generate_many() call and caller loop.
+_shared_async_pool: Optional[Tuple[asyncio.AbstractEventLoop, "httpx.AsyncClient"]] = None
+_shared_async_pool_lock = threading.Lock()
+
+
+def get_shared_async_pool() -> Tuple[asyncio.AbstractEventLoop, "httpx.AsyncClient"]:
+    """
+    Get the background event loop and the keep-alive async HTTP client on it.
+
+    Coroutines using the client must run on the returned loop (see
+    asyncio.run_coroutine_threadsafe). Both are closed at interpreter exit.
+
+    Returns:
+        (event loop, shared httpx.AsyncClient)
+    """
+    global _shared_async_pool
+    if _shared_async_pool is None:
+        with _shared_async_pool_lock:
+            if _shared_async_pool is None:
+                import httpx
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-async-pool", daemon=True).start()
+                http_client = httpx.AsyncClient(http2=_http2_available(), **_http_pool_settings())
+                _shared_async_pool = (loop, http_client)
+                atexit.register(_close_shared_async_pool)
+    return _shared_async_pool
+
+
+def _close_shared_async_pool():
+    """Close the shared async HTTP client and stop its event loop."""
+    loop, http_client = _shared_async_pool
+    try:
+        asyncio.run_coroutine_threadsafe(http_client.aclose(), loop).result(timeout=5.0)
+    except Exception as e:
+        logger.debug(f"Closing async HTTP pool failed: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+
+
+class PersistentResponseCache:
+    """
+    SQLite-backed response cache shared across processes and runs.
+
+    Uses WAL journaling so concurrent readers do not block the writer.
+    Storage errors are logged and treated as cache misses.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 1800.0,
+        provider: Optional[str] = None,
+        model: Optional[str] = None
+    ):
+        """
+        Initialize persistent response cache.
+
+        Args:
+            path: SQLite database file
+            ttl: Seconds a cached response stays valid
+            provider: Provider base URL recorded with each entry
+            model: Model name recorded with each entry
+        """
+        self.path = Path(path).expanduser()
+        self.ttl = ttl
+        self.provider = provider or ''
+        self.model = model or ''
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), timeout=5.0, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, provider TEXT, model TEXT, response TEXT, "
+            "created_at REAL, ttl REAL, hits INTEGER DEFAULT 0)"
+        )
+        self._db.commit()
+        atexit.register(self.close)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a stored response, or None if missing or expired."""
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT response FROM responses WHERE key = ? AND created_at + ttl > ?",
+                    (key, time.time())
+                ).fetchone()
+                if row is None:
+                    return None
+                self._db.execute("UPDATE responses SET hits = hits + 1 WHERE key = ?", (key,))
+                self._db.commit()
+                return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: str):
+        """Store a response, replacing any previous entry for the key."""
+        try:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(key, provider, model, response, created_at, ttl, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                    (key, self.provider, self.model, value, time.time(), self.ttl)
+                )
+                self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and return how many were removed."""
+        try:
+            with self._lock:
+                cursor = self._db.execute(
+                    "DELETE FROM responses WHERE created_at + ttl <= ?", (time.time(),)
+                )
+                self._db.commit()
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache purge failed: {e}")
+            return 0
+
+    def clear(self):
+        """Drop all stored responses."""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL for LLM responses.
+
+    Keys are BLAKE2b digests of the full request, so identical templated
+    prompts are answered from memory instead of a network round-trip.
+    An optional persistent store is consulted on a miss and written through
+    on every set.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 1800.0,
+        store: Optional[PersistentResponseCache] = None
+    ):
+        """
+        Initialize response cache.
+
+        Args:
+            maxsize: Maximum number of cached responses
+            ttl: Seconds a cached response stays valid
+            store: Persistent cache backing the in-memory entries (optional)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.store = store
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key from the request parameters."""
+        payload = _dumps(parts, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return a cached response, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at >= time.monotonic():
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+
+        if self.store is None:
+            return None
+
+        value = self.store.get(key)
+        if value is not None:
+            self._remember(key, value)
+        return value
+
+    def set(self, key: str, value: str):
+        """Store a response, evicting the least recently used entry if full."""
+        self._remember(key, value)
+        if self.store is not None:
+            self.store.set(key, value)
+
+    def _remember(self, key: str, value: str):
+        """Insert a response into the in-memory LRU."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticCache:
+    """
+    Similarity cache for paraphrased follow-up questions.
+
+    Stores question embeddings in a fixed-size ring buffer and returns the
+    cached answer of the closest question in the same scope (e.g. the same
+    product and recommendations) when cosine similarity meets the threshold.
+    Uses a sentence-transformers model when installed, otherwise a hashed
+    bag-of-words embedding that only matches near-identical wording.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        capacity: int = 2048,
+        ttl: float = 1800.0,
+        embed_fn: Optional[Callable[[str], "np.ndarray"]] = None,
+        dim: int = 384
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            capacity: Number of entries kept in the ring buffer
+            ttl: Seconds a cached answer stays valid
+            embed_fn: Custom text -> unit vector function (optional)
+            dim: Embedding dimension for the default embedding
+        """
+        import numpy as np
+
+        self.threshold = threshold
+        self.capacity = capacity
+        self.ttl = ttl
+        self._embed_fn = embed_fn or self._default_embedder(dim)
+        self._vectors: Optional["np.ndarray"] = None
+        self._scopes: List[Optional[str]] = [None] * capacity
+        self._answers: List[Optional[str]] = [None] * capacity
+        self._expires = np.zeros(capacity)
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _default_embedder(dim: int) -> Callable[[str], "np.ndarray"]:
+        """Pick sentence-transformers if available, else hashed bag-of-words."""
+        try:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer('all-MiniLM-L6-v2')
+            return lambda text: model.encode(text, normalize_embeddings=True)
+        except ImportError:
+            pass
+
+        import numpy as np
+
+        def embed(text: str) -> np.ndarray:
+            vector = np.zeros(dim, dtype=np.float32)
+            for token in re.findall(r"[a-z0-9]+", text.lower()):
+                digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+                vector[int.from_bytes(digest, 'little') % dim] += 1.0
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm else vector
+
+        return embed
+
+    def get(self, scope: str, question: str) -> Optional[str]:
+        """Return the answer to the most similar cached question, if close enough."""
+        import numpy as np
+
+        query = np.asarray(self._embed_fn(question), dtype=np.float32)
+
+        with self._lock:
+            if self._vectors is None:
+                return None
+
+            scores = self._vectors @ query
+            now = time.monotonic()
+            for i in np.argsort(scores)[::-1]:
+                if scores[i] < self.threshold:
+                    break
+                if self._scopes[i] == scope and self._expires[i] >= now:
+                    return self._answers[i]
+
+        return None
+
+    def set(self, scope: str, question: str, answer: str):
+        """Cache an answer, overwriting the oldest entry when full."""
+        import numpy as np
+
+        vector = np.asarray(self._embed_fn(question), dtype=np.float32)
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.capacity, vector.shape[0]), dtype=np.float32)
+
+            slot = self._next
+            self._vectors[slot] = vector
+            self._scopes[slot] = scope
+            self._answers[slot] = answer
+            self._expires[slot] = time.monotonic() + self.ttl
+            self._next = (slot + 1) % self.capacity
+
+
+class RequestBatcher:
+    """
+    Coalesces concurrent short prompts that share a system prompt.
+
+    The first caller of a group waits up to `window` seconds (or until the
+    group is full), then sends all prompts as numbered items in a single
+    request and splits the answer back per item. If the answer cannot be
+    split, each prompt is sent on its own.
+    """
+
+    _ITEM_HEADER = re.compile(r'^#{2,}\s*Item\s+(\d+)\s*$', re.MULTILINE | re.IGNORECASE)
+
+    def __init__(
+        self,
+        send_fn: Callable[[str, Optional[str], Optional[float], Optional[int]], str],
+        window: float = 0.05,
+        max_batch_size: int = 8
+    ):
+        """
+        Initialize request batcher.
+
+        Args:
+            send_fn: Sends one unbatched request
+                (prompt, system_prompt, temperature, max_tokens) -> text
+            window: Seconds the first caller waits for siblings
+            max_batch_size: Maximum prompts per combined request
+        """
+        self.send_fn = send_fn
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._groups: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ) -> str:
+        """Queue a prompt and block until its answer is available."""
+        key = (system_prompt, temperature, max_tokens)
+        future: Future = Future()
+
+        with self._lock:
+            group = self._groups.get(key)
+            leader = group is None
+            if leader:
+                group = self._groups[key] = {'items': [], 'full': threading.Event()}
+            group['items'].append((prompt, future))
+            if len(group['items']) >= self.max_batch_size:
+                del self._groups[key]
+                group['full'].set()
+
+        if leader:
+            group['full'].wait(self.window)
+            with self._lock:
+                if self._groups.get(key) is group:
+                    del self._groups[key]
+            self._dispatch(key, group['items'])
+
+        return future.result()
+
+    def _dispatch(self, key: tuple, items: List[tuple]):
+        """Send a group and resolve each item's future."""
+        system_prompt, temperature, max_tokens = key
+
+        if len(items) > 1:
+            try:
+                answers = self._send_combined(items, system_prompt, temperature, max_tokens)
+            except Exception as e:
+                logger.warning(f"Batched LLM request failed, sending items individually: {e}")
+                answers = None
+            if answers is not None:
+                for (_, future), answer in zip(items, answers):
+                    future.set_result(answer)
+                return
+
+        for prompt, future in items:
+            try:
+                future.set_result(self.send_fn(prompt, system_prompt, temperature, max_tokens))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _send_combined(
+        self,
+        items: List[tuple],
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ) -> Optional[List[str]]:
+        """Send items as one numbered prompt; None if the answer can't be split."""
+        count = len(items)
+        parts = [
+            f"Answer each of the following {count} items independently. Start the answer "
+            f"to item N with a line containing only '### Item N', for N = 1 to {count}."
+        ]
+        parts.extend(f"### Item {i}\n{prompt}" for i, (prompt, _) in enumerate(items, 1))
+
+        text = self.send_fn(
+            "\n\n".join(parts),
+            system_prompt,
+            temperature,
+            max_tokens * count if max_tokens else None
+        )
+
+        headers = list(self._ITEM_HEADER.finditer(text))
+        if [int(m.group(1)) for m in headers] != list(range(1, count + 1)):
+            logger.warning(f"Could not split batched LLM response into {count} items")
+            return None
+
+        ends = [m.start() for m in headers[1:]] + [len(text)]
+        return [text[m.end():end].strip() for m, end in zip(headers, ends)]
+
 
 class LLMClient:
     """
@@ -34,7 +1058,14 @@ class LLMClient:
         base_url: Optional[str] = None,
         model: str = "gpt-4o-mini",
         temperature: float = 0.7,
-        max_tokens: int = 1500
+        max_tokens: int = 1500,
+        cache_size: int = 1024,
+        cache_ttl: float = 1800.0,
+        semantic_cache_threshold: Optional[float] = None,
+        requests_per_minute: float = 500,
+        cache_db: Optional[str] = None,
+        context_window: int = DEFAULT_CONTEXT_WINDOW,
+        batch_window: float = 0.0
     ):
         """
         Initialize LLM client.
@@ -45,7 +1076,25 @@ class LLMClient:
             model: Model to use
             temperature: Sampling temperature (0-1)
             max_tokens: Maximum tokens in response
+            cache_size: Max responses kept in the exact-match cache (0 disables)
+            cache_ttl: Seconds a cached response stays valid
+            semantic_cache_threshold: Reuse follow-up answers for questions at
+                least this similar (0-1); None disables the semantic cache
+            requests_per_minute: Client-side rate limit for API calls
+            cache_db: SQLite file that persists cached responses across
+                processes and restarts; None keeps the cache in memory only
+            context_window: Model prompt + completion token limit; follow-up
+                context is trimmed to stay within it
+            batch_window: Seconds to collect concurrent plain-text prompts with
+                the same system prompt into one request; 0 disables batching
         """
+        # Static catalog shared by follow-up questions (see load_catalog)
+        self._catalog: Dict[str, Any] = {}
+        self._catalog_digest: Optional[str] = None
+        self._followup_system_prompt = FOLLOWUP_SYSTEM_PROMPT
+
+        _load_env()
+
         # Auto-detect API key from environment
         if api_key is None:
             api_key = os.getenv('OPENAI_API_KEY') or os.getenv('OPENROUTER_API_KEY')
@@ -66,17 +1115,94 @@ class LLMClient:
 
         self.enabled = True
         self.model = model
+        self._api_key = api_key
+        self.base_url = base_url
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.context_window = context_window
+        self.response_cache = None
+        if cache_size > 0:
+            store = None
+            if cache_db:
+                try:
+                    store = PersistentResponseCache(cache_db, cache_ttl, provider=base_url, model=model)
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"Persistent response cache unavailable at {cache_db}: {e}")
+            self.response_cache = ResponseCache(cache_size, cache_ttl, store=store)
+
+        # Client-side rate limiting, retries and circuit breaking
+        self.rate_limiter = TokenBucket(rate=requests_per_minute / 60.0, capacity=requests_per_minute)
+        self.circuit_breaker = CircuitBreaker()
+        # Set by LLMClientPool: raise 429s at once so another key can take over
+        self.failover_on_rate_limit = False
+        # Monotonic time of the last warm_up() request
+        self._warmed_at = float('-inf')
+
+        # Concurrent sibling prompts can be coalesced into one request
+        self.batcher = (
+            RequestBatcher(self._send, window=batch_window) if batch_window > 0 else None
+        )
+
+        # Concurrent identical cacheable requests share one API call
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
 
-        # Initialize OpenAI client (compatible with OpenRouter)
+        # Anthropic models need the system prefix explicitly marked cacheable;
+        # OpenAI caches long stable prefixes automatically
+        self.supports_cache_control = (
+            model.lower().startswith(('anthropic/', 'claude'))
+            or 'anthropic' in (base_url or '').lower()
+        )
+        # Native JSON mode, matched on the model name without a provider prefix.
+        # Anthropic models get the prompt instruction instead.
+        model_name = model.lower().rsplit('/', 1)[-1]
+        self.supports_json_mode = (
+            model_name.startswith(JSON_MODE_MODEL_PREFIXES)
+            and not model_name.startswith(JSON_MODE_UNSUPPORTED_MODELS)
+        )
+        # Only OpenAI itself offers the asynchronous Batch API
+        self.supports_batch_api = 'api.openai.com' in (base_url or 'https://api.openai.com/v1')
+        self.semantic_cache = (
+            SemanticCache(threshold=semantic_cache_threshold, ttl=cache_ttl)
+            if semantic_cache_threshold is not None else None
+        )
+
+        # Initialize OpenAI client (compatible with OpenRouter) on the shared pool.
+        # Retries are handled here with backoff, so disable the SDK's own.
+        from openai import OpenAI
         self.client = OpenAI(
             api_key=api_key,
-            base_url=base_url
+            base_url=base_url,
+            http_client=get_shared_http_client(),
+            max_retries=0
         )
+        # Async counterpart for generate_many(), built on the shared async pool
+        self._async_client: Optional["AsyncOpenAI"] = None
+
+        # Load the knowledge base off the request path
+        _knowledge_base_future()
 
         logger.info(f"LLM Client initialized with model: {model}")
 
+    def warm_up(self):
+        """
+        Open a pooled connection to the API ahead of the first real request.
+
+        Lists the provider's models (no tokens billed) so the TCP/TLS
+        handshake is done by the time a completion is sent. Skipped while
+        a previous warm-up connection would still be kept alive.
+        """
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if now - self._warmed_at < HTTP_KEEPALIVE_EXPIRY:
+            return
+        self._warmed_at = now
+        try:
+            self.client.with_options(timeout=WARM_UP_TIMEOUT).models.list()
+        except Exception as e:
+            logger.debug(f"LLM warm-up request failed: {e}")
+
     def generate(
         self,
         prompt: str,
@@ -96,48 +1222,540 @@ class LLMClient:
             json_mode: Force JSON response format
 
         Returns:
-            Generated text
+            Generated text
+        """
+        if not self.enabled:
+            logger.warning("LLM client not enabled, returning empty response")
+            return ""
+
+        try:
+            return self._generate(prompt, system_prompt, temperature, max_tokens, json_mode)
+        except Exception as e:
+            logger.error(f"LLM generation error: {e}")
+            return f"Error generating response: {str(e)}"
+
+    def _generate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        json_mode: bool
+    ) -> str:
+        """Generate a completion, raising API errors to the caller."""
+        kwargs = self._build_request(prompt, system_prompt, temperature, max_tokens, json_mode)
+
+        # Serve repeated low-temperature requests from the response cache
+        cache_key = self._response_cache_key(kwargs)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("LLM response cache hit")
+                return cached
+
+        def send() -> str:
+            content = self._generate_uncached(prompt, system_prompt, temperature, max_tokens, json_mode, kwargs)
+            if cache_key is not None and content:
+                self.response_cache.set(cache_key, content)
+            return content
+
+        # Join an identical request already in flight instead of sending another
+        return self._singleflight(cache_key, send)
+
+    def _generate_uncached(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        json_mode: bool,
+        kwargs: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Send a request, bypassing the response cache and in-flight requests.
+
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt (optional)
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+            json_mode: Force JSON response format
+            kwargs: The request _build_request() returns for these arguments,
+                if already built
+
+        Returns:
+            Generated text
+        """
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Calling LLM with model: {self.model}, max_tokens: {max_tokens or self.max_tokens}")
+        try:
+            if self.batcher is not None and system_prompt and not json_mode:
+                return self.batcher.submit(prompt, system_prompt, temperature, max_tokens)
+            if kwargs is None:
+                kwargs = self._build_request(prompt, system_prompt, temperature, max_tokens, json_mode)
+            return self._finish_response(self._create_with_retry(kwargs), None)
+        except Exception as e:
+            self._disable_on_auth_error(e)
+            raise
+
+    def _singleflight(self, cache_key: Optional[str], send: Callable[[], str]) -> str:
+        """Call send(), sharing its result with concurrent calls for the same cache key."""
+        if cache_key is None:
+            return send()
+
+        with self._inflight_lock:
+            pending = self._inflight.get(cache_key)
+            if pending is None:
+                future = self._inflight[cache_key] = Future()
+
+        if pending is not None:
+            return pending.result()
+
+        try:
+            content = send()
+            future.set_result(content)
+            return content
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[cache_key]
+
+    def _disable_on_auth_error(self, error: Exception):
+        """Stop calling the API once it has rejected our credentials."""
+        if self.enabled and _is_auth_error(error):
+            logger.error("LLM API rejected the API key; disabling LLM features for this client")
+            self.enabled = False
+
+    def _send(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ) -> str:
+        """Send a single uncached, unbatched request."""
+        kwargs = self._build_request(prompt, system_prompt, temperature, max_tokens, False)
+        return self._finish_response(self._create_with_retry(kwargs), None)
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        json_mode: bool = False
+    ) -> Iterator[str]:
+        """
+        Generate text completion, yielding chunks as they arrive.
+
+        JSON-mode requests are not streamed (the payload is only valid once
+        complete); they yield the full generate() result as one chunk.
+
+        Args:
+            prompt: User prompt
+            system_prompt: System prompt (optional)
+            temperature: Override default temperature
+            max_tokens: Override default max tokens
+            json_mode: Force JSON response format
+
+        Yields:
+            Text chunks of the completion. A failure ends the stream with an
+            "Error generating response: ..." chunk, as generate() returns.
+        """
+        if not self.enabled or json_mode:
+            yield self.generate(prompt, system_prompt, temperature, max_tokens, json_mode)
+            return
+
+        kwargs = self._build_request(prompt, system_prompt, temperature, max_tokens, json_mode)
+
+        cache_key = self._response_cache_key(kwargs)
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+
+        try:
+            stream = self._create_with_retry({**kwargs, "stream": True})
+        except Exception as e:
+            self._disable_on_auth_error(e)
+            logger.error(f"LLM generation error: {e}")
+            yield f"Error generating response: {str(e)}"
+            return
+
+        parts = []
+        try:
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            logger.error(f"LLM streaming error: {e}")
+            yield f"Error generating response: {str(e)}"
+            return
+        finally:
+            stream.close()
+
+        content = "".join(parts).strip()
+        if cache_key is not None and content:
+            self.response_cache.set(cache_key, content)
+
+    def _create_with_retry(self, kwargs: Dict[str, Any]) -> Any:
+        """Call the chat completions API with rate limiting and bounded backoff."""
+        for attempt in range(RETRY_ATTEMPTS):
+            self.circuit_breaker.check()
+            self.rate_limiter.acquire()
+            try:
+                response = self.client.chat.completions.create(**kwargs)
+            except _retryable_errors() as e:
+                self.circuit_breaker.record_failure()
+                if attempt == RETRY_ATTEMPTS - 1 or (
+                    self.failover_on_rate_limit and _rate_limit_cooldown(e) is not None
+                ):
+                    raise
+                delay = _backoff_delay(attempt)
+                logger.warning(f"LLM call failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+            else:
+                self.circuit_breaker.record_success()
+                return response
+
+    async def _acreate_with_retry(self, async_client: "AsyncOpenAI", kwargs: Dict[str, Any]) -> Any:
+        """Async variant of _create_with_retry()."""
+        for attempt in range(RETRY_ATTEMPTS):
+            self.circuit_breaker.check()
+            await self.rate_limiter.acquire_async()
+            try:
+                response = await async_client.chat.completions.create(**kwargs)
+            except _retryable_errors() as e:
+                self.circuit_breaker.record_failure()
+                if attempt == RETRY_ATTEMPTS - 1 or (
+                    self.failover_on_rate_limit and _rate_limit_cooldown(e) is not None
+                ):
+                    raise
+                delay = _backoff_delay(attempt)
+                logger.warning(f"LLM call failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            else:
+                self.circuit_breaker.record_success()
+                return response
+
+    def _build_request(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        json_mode: bool
+    ) -> Dict[str, Any]:
+        """Build chat completion parameters for a single prompt."""
+        messages = []
+
+        if system_prompt:
+            messages.append(_system_message(system_prompt, self.supports_cache_control))
+
+        messages.append({"role": "user", "content": prompt})
+
+        # Prepare request parameters
+        kwargs = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": temperature or self.temperature,
+            "max_tokens": max_tokens or self.max_tokens
+        }
+
+        # Add JSON mode if requested (only for supported models)
+        if json_mode and self.supports_json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+
+        return kwargs
+
+    def _response_cache_key(self, kwargs: Dict[str, Any]) -> Optional[str]:
+        """
+        Return the response cache key for a request, or None if not cacheable.
+
+        Keyed on the request body alone, not the endpoint, so a pool finds a
+        reply whichever member served it.
+        """
+        if self.response_cache is None or kwargs["temperature"] > CACHEABLE_MAX_TEMPERATURE:
+            return None
+        return ResponseCache.make_key(kwargs)
+
+    def _finish_response(self, response: Any, cache_key: Optional[str]) -> str:
+        """Extract and clean completion text, caching it when allowed."""
+        content = response.choices[0].message.content
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"LLM raw response: {content[:200] if content else 'None'}")
+            cached_tokens = _cached_prompt_tokens(getattr(response, 'usage', None))
+            if cached_tokens is not None:
+                logger.debug(f"LLM prompt cache read tokens: {cached_tokens}")
+
+        if not content or content.strip() == "":
+            logger.warning("LLM returned empty content")
+            return ""
+
+        content = content.strip()
+        if cache_key is not None:
+            self.response_cache.set(cache_key, content)
+
+        return content
+
+    async def generate_many(
+        self,
+        items: List[Dict[str, Any]],
+        concurrency: int = 20
+    ) -> List[str]:
+        """
+        Generate completions for many prompts concurrently.
+
+        Requests share the process-wide async connection pool (HTTP/2 when
+        the `h2` package is installed), whose connections stay open between
+        calls, and at most `concurrency` are in flight at once. Identical
+        cacheable items in the batch share a single API call.
+
+        Args:
+            items: Keyword arguments for each request, as accepted by generate()
+                (prompt, system_prompt, temperature, max_tokens, json_mode)
+            concurrency: Maximum number of concurrent requests
+
+        Returns:
+            Generated texts in the same order as items
+        """
+        if not self.enabled:
+            logger.warning("LLM client not enabled, returning empty responses")
+            return [""] * len(items)
+
+        loop, http_client = get_shared_async_pool()
+        future = asyncio.run_coroutine_threadsafe(self._generate_many(items, concurrency, http_client), loop)
+        return await asyncio.wrap_future(future)
+
+    async def _generate_many(
+        self,
+        items: List[Dict[str, Any]],
+        concurrency: int,
+        http_client: "httpx.AsyncClient"
+    ) -> List[str]:
+        """Body of generate_many(), run on the shared async pool's loop."""
+        semaphore = asyncio.Semaphore(concurrency)
+        inflight: Dict[str, asyncio.Task] = {}
+        async_client = self._get_async_client(http_client)
+
+        async def call(kwargs: Dict[str, Any], cache_key: Optional[str]) -> str:
+            try:
+                async with semaphore:
+                    response = await self._acreate_with_retry(async_client, kwargs)
+                return self._finish_response(response, cache_key)
+            except Exception as e:
+                self._disable_on_auth_error(e)
+                logger.error(f"LLM generation error: {e}")
+                return f"Error generating response: {str(e)}"
+
+        async def run_one(item: Dict[str, Any]) -> str:
+            kwargs = self._build_request(
+                item['prompt'],
+                item.get('system_prompt'),
+                item.get('temperature'),
+                item.get('max_tokens'),
+                item.get('json_mode', False)
+            )
+
+            cache_key = self._response_cache_key(kwargs)
+            if cache_key is None:
+                return await call(kwargs, None)
+
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # Duplicates await the first item's call
+            task = inflight.get(cache_key)
+            if task is None:
+                task = inflight[cache_key] = asyncio.ensure_future(call(kwargs, cache_key))
+            return await asyncio.shield(task)
+
+        return list(await asyncio.gather(*(run_one(item) for item in items)))
+
+    def _generate_to(
+        self,
+        stream_to: Optional[Callable[[str], None]],
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Generate text, streaming chunks to stream_to when it is given."""
+        if stream_to is None:
+            return self.generate(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+
+        parts = []
+        for chunk in self.generate_stream(prompt, system_prompt, temperature, max_tokens):
+            stream_to(chunk)
+            parts.append(chunk)
+        # A stream cut short reports just the error, like generate()
+        if parts and parts[-1].startswith("Error generating response"):
+            return parts[-1]
+        return "".join(parts).strip()
+
+    async def agenerate(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        json_mode: bool = False
+    ) -> str:
+        """
+        Async variant of generate() for use inside an event loop.
+
+        Runs generate() in a worker thread so the loop is not blocked, while
+        keeping its caching, request coalescing and retries.
+        """
+        return await asyncio.to_thread(
+            self.generate, prompt, system_prompt, temperature, max_tokens, json_mode
+        )
+
+    async def generate_batch(
+        self,
+        prompts: List[Tuple[str, Optional[str]]],
+        max_concurrency: int = 8
+    ) -> List[str]:
+        """
+        Generate completions for (prompt, system_prompt) pairs concurrently.
+
+        Args:
+            prompts: (prompt, system_prompt) pairs
+            max_concurrency: Maximum number of concurrent requests
+
+        Returns:
+            Generated texts in the same order as prompts
+        """
+        return await self.generate_many(
+            [{'prompt': prompt, 'system_prompt': system_prompt} for prompt, system_prompt in prompts],
+            concurrency=max_concurrency
+        )
+
+    def run_batch(self, items: List[Dict[str, Any]], concurrency: int = 20) -> List[str]:
+        """
+        Synchronous wrapper around generate_many() for non-async callers.
+
+        Args:
+            items: Keyword arguments for each request, as accepted by generate()
+            concurrency: Maximum number of concurrent requests
+
+        Returns:
+            Generated texts in the same order as items
         """
-        if not self.enabled:
-            logger.warning("LLM client not enabled, returning empty response")
-            return ""
+        return asyncio.run(self.generate_many(items, concurrency=concurrency))
 
-        try:
-            messages = []
+    def submit_batch(self, requests: List[Dict[str, Any]], completion_window: str = "24h") -> str:
+        """
+        Submit requests to the provider's Batch API.
 
-            if system_prompt:
-                messages.append({"role": "system", "content": system_prompt})
+        Batched requests cost half as much per token and do not count against
+        the rate limit, but may take up to `completion_window` to finish.
 
-            messages.append({"role": "user", "content": prompt})
+        Args:
+            requests: Keyword arguments for each request, as accepted by generate()
+            completion_window: Time the provider has to complete the batch
 
-            # Prepare request parameters
-            kwargs = {
-                "model": self.model,
-                "messages": messages,
-                "temperature": temperature or self.temperature,
-                "max_tokens": max_tokens or self.max_tokens
-            }
+        Returns:
+            Batch ID for poll_batch() and fetch_batch_results()
+        """
+        lines = [
+            _dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_request(
+                    item['prompt'],
+                    item.get('system_prompt'),
+                    item.get('temperature'),
+                    item.get('max_tokens'),
+                    item.get('json_mode', False)
+                )
+            })
+            for i, item in enumerate(requests)
+        ]
+
+        batch_file = self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=completion_window
+        )
+        logger.info(f"Submitted batch {batch.id} with {len(requests)} requests")
+        return batch.id
 
-            # Add JSON mode if requested (only for supported models)
-            if json_mode and "gpt-4" in self.model.lower():
-                kwargs["response_format"] = {"type": "json_object"}
+    def poll_batch(self, batch_id: str) -> str:
+        """
+        Get the status of a submitted batch.
 
-            # Make API call
-            logger.debug(f"Calling LLM with model: {kwargs['model']}, max_tokens: {kwargs.get('max_tokens')}")
-            response = self.client.chat.completions.create(**kwargs)
+        Args:
+            batch_id: ID returned by submit_batch()
 
-            content = response.choices[0].message.content
-            logger.debug(f"LLM raw response: {content[:200] if content else 'None'}")
+        Returns:
+            Batch status ("validating", "in_progress", "completed", "failed", ...)
+        """
+        return self.client.batches.retrieve(batch_id).status
 
-            if not content or content.strip() == "":
-                logger.warning("LLM returned empty content")
-                return ""
+    def fetch_batch_results(self, batch_id: str) -> List[str]:
+        """
+        Download the completions of a finished batch.
 
-            return content.strip()
+        Args:
+            batch_id: ID returned by submit_batch()
 
-        except Exception as e:
-            logger.error(f"LLM generation error: {e}")
-            return f"Error generating response: {str(e)}"
+        Returns:
+            Generated texts in submission order ("" for failed requests)
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        # request_counts is missing until the provider has validated the input
+        counts = batch.request_counts
+        results = [""] * (counts.total if counts is not None else 0)
+        if not batch.output_file_id:
+            logger.error(f"Batch {batch_id} has no output ({batch.status})")
+            return results
+
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = _loads(line)
+            body = (record.get('response') or {}).get('body') or {}
+            choices = body.get('choices')
+            if not choices:
+                logger.warning(f"Batch request {record.get('custom_id')} failed: {record.get('error') or body.get('error')}")
+                continue
+            content = choices[0]['message'].get('content')
+            index = int(record['custom_id'])
+            if index >= len(results):
+                results.extend([""] * (index + 1 - len(results)))
+            results[index] = content.strip() if content else ""
+        return results
+
+    def _get_async_client(self, http_client: "httpx.AsyncClient") -> "AsyncOpenAI":
+        """Get this client's AsyncOpenAI, created on first use over the shared pool."""
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(
+                api_key=self._api_key,
+                base_url=self.base_url,
+                http_client=http_client,
+                max_retries=0
+            )
+        return self._async_client
 
     def generate_json(
         self,
@@ -156,8 +1774,12 @@ class LLMClient:
         Returns:
             Parsed JSON dict
         """
-        # Add JSON instruction to system prompt
-        json_system = (system_prompt or "") + "\n\nYou must respond with valid JSON only."
+        # Native JSON mode needs no extra instruction, as long as the prompt
+        # mentions JSON (which OpenAI requires for response_format)
+        if self.enabled and self.supports_json_mode and 'json' in f"{system_prompt or ''}{prompt}".lower():
+            json_system = system_prompt
+        else:
+            json_system = (system_prompt or "") + "\n\nYou must respond with valid JSON only."
 
         response_text = self.generate(
             prompt=prompt,
@@ -167,17 +1789,28 @@ class LLMClient:
         )
 
         try:
-            return json.loads(response_text)
+            return _loads(response_text)
         except json.JSONDecodeError:
-            logger.error(f"Failed to parse JSON response: {response_text[:200]}")
-            return {"error": "Invalid JSON response"}
+            pass
+
+        # Models without native JSON mode may wrap the object in a code fence
+        fenced = _CODE_FENCE_PATTERN.match(response_text.strip())
+        if fenced:
+            try:
+                return _loads(fenced.group(1))
+            except json.JSONDecodeError:
+                pass
+
+        logger.error(f"Failed to parse JSON response: {response_text[:200]}")
+        return {"error": "Invalid JSON response"}
 
     def analyze_product_placement(
         self,
         product: Dict[str, Any],
         location: Dict[str, Any],
         roi_score: float,
-        context: Dict[str, Any]
+        context: Dict[str, Any],
+        stream_to: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Generate natural language analysis of product placement.
@@ -187,34 +1820,102 @@ class LLMClient:
             location: Location details
             roi_score: Predicted ROI score
             context: Additional context (historical data, competitors, etc.)
+            stream_to: Called with each text chunk as it arrives (optional)
 
         Returns:
             Natural language explanation
         """
-        system_prompt = """You are an expert retail analyst specializing in product placement optimization.
-Provide SHORT, CONCISE, and FACTUAL explanations (3-5 bullet points maximum).
+        return self._generate_to(
+            stream_to,
+            prompt=self._placement_prompt(product, location, roi_score),
+            system_prompt=PLACEMENT_ANALYSIS_SYSTEM_PROMPT,
+            temperature=0.5,
+            max_tokens=1000
+        )
 
-Focus on:
-- WHY this placement works (data-driven)
-- Top 3 success factors only
-- 1-2 key considerations
+    async def analyze_product_placement_batch(
+        self,
+        placements: List[Dict[str, Any]],
+        max_concurrency: int = 8
+    ) -> List[str]:
+        """
+        Analyze many product placements concurrently.
 
-Use professional business language. Be direct and brief. NO lengthy paragraphs or sections."""
+        Args:
+            placements: Dicts with the analyze_product_placement() arguments
+                (product, location, roi_score, context)
+            max_concurrency: Maximum number of concurrent requests
 
-        user_prompt = f"""Product: {product['name']} (${product['price']:.2f}, {product['category']})
-Location: {location['zone_name']} ({location['zone_type']})
-Traffic: {location['traffic_level']} ({location['traffic_index']} visitors/day)
-Visibility: {location['visibility_factor']}x
-ROI: {roi_score:.2f}x
+        Returns:
+            Explanations in the same order as placements
+        """
+        return await self.generate_many([
+            {
+                'prompt': self._placement_prompt(p['product'], p['location'], p['roi_score']),
+                'system_prompt': PLACEMENT_ANALYSIS_SYSTEM_PROMPT,
+                'temperature': 0.5,
+                'max_tokens': 1000
+            }
+            for p in placements
+        ], concurrency=max_concurrency)
 
-Explain in 3-5 SHORT bullet points why this placement works. Be concise and factual."""
+    def analyze_product_placement_bulk(
+        self,
+        placements: List[Dict[str, Any]],
+        poll_interval: float = BATCH_POLL_INTERVAL
+    ) -> List[str]:
+        """
+        Analyze a large set of placements for offline jobs.
 
-        return self.generate(
-            prompt=user_prompt,
-            system_prompt=system_prompt,
-            temperature=0.5,
-            max_tokens=1000
-        )
+        More than BATCH_API_MIN_REQUESTS placements go through the Batch API
+        (when the provider offers it), blocking until the batch completes;
+        smaller sets run concurrently like analyze_product_placement_batch().
+
+        Args:
+            placements: Dicts with the analyze_product_placement() arguments
+                (product, location, roi_score, context)
+            poll_interval: Seconds between batch status checks
+
+        Returns:
+            Explanations in the same order as placements
+        """
+        items = [
+            {
+                'prompt': self._placement_prompt(p['product'], p['location'], p['roi_score']),
+                'system_prompt': PLACEMENT_ANALYSIS_SYSTEM_PROMPT,
+                'temperature': 0.5,
+                'max_tokens': 1000
+            }
+            for p in placements
+        ]
+
+        if not self.enabled or not self.supports_batch_api or len(items) <= BATCH_API_MIN_REQUESTS:
+            return self.run_batch(items)
+
+        batch_id = self.submit_batch(items)
+        status = self.poll_batch(batch_id)
+        while status not in BATCH_TERMINAL_STATUSES:
+            time.sleep(poll_interval)
+            status = self.poll_batch(batch_id)
+
+        if status != 'completed':
+            logger.error(f"Batch {batch_id} ended with status {status}")
+        return self.fetch_batch_results(batch_id)
+
+    @staticmethod
+    def _placement_prompt(product: Dict[str, Any], location: Dict[str, Any], roi_score: float) -> str:
+        """Fill the placement analysis user prompt."""
+        return PLACEMENT_ANALYSIS_TEMPLATE.format_map({
+            'name': product['name'],
+            'price': product['price'],
+            'category': product['category'],
+            'zone_name': location['zone_name'],
+            'zone_type': location['zone_type'],
+            'traffic_level': location['traffic_level'],
+            'traffic_index': location['traffic_index'],
+            'visibility_factor': location['visibility_factor'],
+            'roi_score': roi_score
+        })
 
     def generate_competitive_analysis(
         self,
@@ -235,43 +1936,134 @@ Explain in 3-5 SHORT bullet points why this placement works. Be concise and fact
         Returns:
             Natural language competitive analysis
         """
-        system_prompt = """You are a competitive intelligence analyst for retail product placement.
-Analyze competitive positioning and provide strategic insights.
+        system_prompt = COMPETITIVE_ANALYSIS_SYSTEM_PROMPT
 
-Focus on:
-- Market position relative to competitors
-- Pricing strategy implications
-- Differentiation opportunities
-- Competitive advantages/disadvantages
-- Strategic recommendations"""
-
-        competitor_summary = "\n".join([
-            f"- {c['product_name']}: ${c['price']:.2f}, ROI {c['observed_roi']:.2f}"
+        competitor_summary = _format_competitors(tuple(
+            (c['product_name'], c['price'], c['observed_roi'])
             for c in competitors[:5]
-        ])
+        ))
 
-        avg_competitor_roi = sum(c['observed_roi'] for c in competitors) / len(competitors) if competitors else 0
+        avg_competitor_roi = fmean(map(_get_observed_roi, competitors)) if competitors else 0.0
 
-        user_prompt = f"""Analyze competitive positioning for this product placement:
+        user_prompt = COMPETITIVE_ANALYSIS_TEMPLATE.format_map({
+            'name': product['name'],
+            'price': product['price'],
+            'predicted_roi': predicted_roi,
+            'zone_name': location['zone_name'],
+            'competitor_count': len(competitors),
+            'competitor_summary': competitor_summary,
+            'avg_competitor_roi': avg_competitor_roi
+        })
 
-**Our Product:**
-- {product['name']} (${product['price']:.2f})
-- Predicted ROI: {predicted_roi:.2f}
+        return self.generate(
+            prompt=user_prompt,
+            system_prompt=system_prompt,
+            temperature=0.7
+        )
 
-**Location:** {location['zone_name']}
+    def generate_combined_brief(
+        self,
+        product: Dict[str, Any],
+        location: Dict[str, Any],
+        competitors: List[Dict[str, Any]],
+        roi_score: float,
+        context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, str]:
+        """
+        Generate placement rationale, competitive analysis, executive summary
+        and risks in a single request.
 
-**Competitors in this location ({len(competitors)} total):**
-{competitor_summary}
+        The shared product/location context is sent once instead of once per
+        section, and the low temperature lets repeat calls hit the response
+        cache.
 
-**Average Competitor ROI:** {avg_competitor_roi:.2f}
+        Args:
+            product: Product details
+            location: Location details
+            competitors: List of competitor products
+            roi_score: Predicted ROI score
+            context: Additional context (optional)
 
-Provide strategic analysis of our competitive position and recommendations for success."""
+        Returns:
+            Dict with one text per COMBINED_BRIEF_SECTIONS entry (empty
+            strings when the LLM is unavailable or the response is invalid)
+        """
+        if not self.enabled:
+            logger.warning("LLM client not enabled, returning empty brief")
+            return dict.fromkeys(COMBINED_BRIEF_SECTIONS, "")
 
-        return self.generate(
+        competitor_summary = _format_competitors(tuple(
+            (c['product_name'], c['price'], c['observed_roi'])
+            for c in competitors[:5]
+        ))
+
+        user_prompt = COMBINED_BRIEF_TEMPLATE.format_map({
+            'name': product['name'],
+            'price': product['price'],
+            'category': product['category'],
+            'zone_name': location['zone_name'],
+            'zone_type': location['zone_type'],
+            'traffic_level': location['traffic_level'],
+            'traffic_index': location['traffic_index'],
+            'visibility_factor': location['visibility_factor'],
+            'roi_score': roi_score,
+            'competitor_count': len(competitors),
+            'competitor_summary': competitor_summary,
+            'avg_competitor_roi': fmean(map(_get_observed_roi, competitors)) if competitors else 0.0,
+            'context_text': _format_context(context)
+        })
+
+        result = self.generate_json(
             prompt=user_prompt,
-            system_prompt=system_prompt,
-            temperature=0.7
+            system_prompt=COMBINED_BRIEF_SYSTEM_PROMPT,
+            temperature=CACHEABLE_MAX_TEMPERATURE
+        )
+        # A JSON array or scalar is as unusable as invalid JSON
+        if not isinstance(result, dict):
+            logger.error(f"Placement brief is not a JSON object: {str(result)[:200]}")
+            return dict.fromkeys(COMBINED_BRIEF_SECTIONS, "")
+
+        brief = {}
+        for section in COMBINED_BRIEF_SECTIONS:
+            value = result.get(section, "")
+            # Some models answer list-shaped sections with a JSON array
+            brief[section] = "\n".join(map(str, value)) if isinstance(value, list) else str(value)
+        return brief
+
+    def purge_expired(self) -> int:
+        """
+        Delete expired entries from the persistent response cache.
+
+        Returns:
+            Number of entries removed (0 without a persistent cache)
+        """
+        if not self.enabled or self.response_cache is None or self.response_cache.store is None:
+            return 0
+        return self.response_cache.store.purge_expired()
+
+    def load_catalog(self, catalog: Dict[str, Any]):
+        """
+        Attach a static catalog to every follow-up question.
+
+        The catalog is serialized once and appended to the follow-up system
+        prompt, so it forms a stable prefix the provider can cache. Context
+        entries equal to the catalog entry of the same key are then left out
+        of the per-question prompt.
+
+        Args:
+            catalog: Session-wide context (e.g. store locations, competitors)
+        """
+        block = _dumps(catalog, sort_keys=True, default=str)
+        digest = hashlib.sha256(block.encode('utf-8')).hexdigest()
+        if digest == self._catalog_digest:
+            return
+
+        self._catalog = catalog
+        self._catalog_digest = digest
+        self._followup_system_prompt = (
+            f"{FOLLOWUP_SYSTEM_PROMPT}\n\nReference catalog (JSON):\n{block}"
         )
+        logger.info(f"Loaded follow-up catalog ({len(block)} chars)")
 
     def answer_followup_question(
         self,
@@ -279,7 +2071,8 @@ Provide strategic analysis of our competitive position and recommendations for s
         product: Dict[str, Any],
         recommendations: Dict[str, float],
         context: Dict[str, Any],
-        use_knowledge_base: bool = True
+        use_knowledge_base: bool = True,
+        stream_to: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Answer follow-up questions about recommendations using LLM.
@@ -290,54 +2083,244 @@ Provide strategic analysis of our competitive position and recommendations for s
             recommendations: ROI recommendations
             context: Additional context (competitors, historical data, etc.)
             use_knowledge_base: Whether to include research-backed insights
+            stream_to: Called with each text chunk as it arrives (optional)
 
         Returns:
             Natural language answer
         """
-        system_prompt = """You are a retail analytics expert. Answer questions about product placement recommendations.
+        # Paraphrases of an earlier question about the same analysis reuse its answer
+        cache_scope = None
+        if self.enabled and self.semantic_cache is not None:
+            cache_scope = ResponseCache.make_key(
+                product, recommendations, context, use_knowledge_base, self._catalog_digest
+            )
+            cached = self.semantic_cache.get(cache_scope, question)
+            if cached is not None:
+                logger.debug("Follow-up answer served from semantic cache")
+                if stream_to is not None:
+                    stream_to(cached)
+                return cached
+
+        system_prompt = self._followup_system_prompt
+        user_prompt = self._followup_prompt(
+            FOLLOWUP_TEMPLATE, {'question': question}, question,
+            product, recommendations, context, use_knowledge_base, FOLLOWUP_MAX_TOKENS
+        )
 
-Be SHORT and CONCISE (3-5 sentences maximum):
-- Use specific numbers from the analysis
-- Be factual and data-driven
-- Cite research when available (e.g., "Research shows...")
-- Professional business language
-- Direct answers only
+        answer = self._generate_to(
+            stream_to,
+            prompt=user_prompt,
+            system_prompt=system_prompt,
+            temperature=0.5,
+            max_tokens=FOLLOWUP_MAX_TOKENS
+        )
 
-NO lengthy paragraphs or unnecessary details."""
+        if cache_scope is not None and answer and not answer.startswith("Error generating response"):
+            self.semantic_cache.set(cache_scope, question, answer)
+
+        return answer
+
+    def answer_followup_questions(
+        self,
+        questions: List[str],
+        product: Dict[str, Any],
+        recommendations: Dict[str, float],
+        context: Dict[str, Any],
+        use_knowledge_base: bool = True
+    ) -> List[str]:
+        """
+        Answer several follow-up questions with one request per batch.
+
+        Up to FOLLOWUP_BATCH_SIZE questions share a prompt, so the context
+        is sent (and prefilled) once instead of once per question. Questions
+        whose answer is missing from the reply are asked on their own.
+
+        Args:
+            questions: User questions
+            product: Product details
+            recommendations: ROI recommendations
+            context: Additional context (competitors, historical data, etc.)
+            use_knowledge_base: Whether to include research-backed insights
+
+        Returns:
+            One answer per question, in order
+        """
+        if len(questions) <= 1 or not self.enabled:
+            return [
+                self.answer_followup_question(question, product, recommendations, context, use_knowledge_base)
+                for question in questions
+            ]
+
+        answers: List[Optional[str]] = [None] * len(questions)
+
+        # Paraphrases of earlier questions reuse their answers
+        cache_scope = None
+        if self.semantic_cache is not None:
+            cache_scope = ResponseCache.make_key(
+                product, recommendations, context, use_knowledge_base, self._catalog_digest
+            )
+            for i, question in enumerate(questions):
+                answers[i] = self.semantic_cache.get(cache_scope, question)
+
+        pending = [i for i, answer in enumerate(answers) if answer is None]
+        for start in range(0, len(pending), FOLLOWUP_BATCH_SIZE):
+            batch = pending[start:start + FOLLOWUP_BATCH_SIZE]
+            batch_questions = [questions[i] for i in batch]
+            questions_text = "\n".join(
+                f"Q{n}: {question}" for n, question in enumerate(batch_questions, 1)
+            )
+            max_tokens = FOLLOWUP_MAX_TOKENS * len(batch)
+            user_prompt = self._followup_prompt(
+                FOLLOWUP_BATCH_TEMPLATE, {'questions_text': questions_text}, " ".join(batch_questions),
+                product, recommendations, context, use_knowledge_base, max_tokens
+            )
+            response = self.generate(
+                prompt=user_prompt,
+                system_prompt=self._followup_system_prompt,
+                temperature=0.5,
+                max_tokens=max_tokens
+            )
+
+            parsed = _split_numbered_answers(response, len(batch))
+            for i, answer in zip(batch, parsed):
+                if answer is None:
+                    answer = self.answer_followup_question(
+                        questions[i], product, recommendations, context, use_knowledge_base
+                    )
+                elif cache_scope is not None:
+                    self.semantic_cache.set(cache_scope, questions[i], answer)
+                answers[i] = answer
+
+        return answers
+
+    def submit_followup_batch(
+        self,
+        questions: List[str],
+        product: Dict[str, Any],
+        recommendations: Dict[str, float],
+        context: Dict[str, Any],
+        use_knowledge_base: bool = True
+    ) -> Optional[str]:
+        """
+        Queue follow-up questions on the provider's Batch API.
+
+        For background jobs that can wait for answers: batched requests cost
+        half as much but may take hours. Each question gets the same prompt
+        answer_followup_question() would send.
+
+        Args:
+            questions: User questions
+            product: Product details
+            recommendations: ROI recommendations
+            context: Additional context (competitors, historical data, etc.)
+            use_knowledge_base: Whether to include research-backed insights
+
+        Returns:
+            Batch ID for poll_batch() and fetch_batch_results(), or None if
+            the provider has no Batch API
+        """
+        if not self.enabled or not self.supports_batch_api:
+            return None
+
+        return self.submit_batch([
+            {
+                'prompt': self._followup_prompt(
+                    FOLLOWUP_TEMPLATE, {'question': question}, question,
+                    product, recommendations, context, use_knowledge_base, FOLLOWUP_MAX_TOKENS
+                ),
+                'system_prompt': self._followup_system_prompt,
+                'temperature': 0.5,
+                'max_tokens': FOLLOWUP_MAX_TOKENS
+            }
+            for question in questions
+        ])
+
+    def _followup_prompt(
+        self,
+        template: str,
+        question_fields: Dict[str, str],
+        research_query: str,
+        product: Dict[str, Any],
+        recommendations: Dict[str, float],
+        context: Dict[str, Any],
+        use_knowledge_base: bool,
+        max_tokens: int
+    ) -> str:
+        """
+        Build the user prompt for follow-up question(s).
+
+        Args:
+            template: FOLLOWUP_TEMPLATE or FOLLOWUP_BATCH_TEMPLATE
+            question_fields: Template fields carrying the question(s)
+            research_query: Text to look up in the knowledge base
+            product: Product details
+            recommendations: ROI recommendations
+            context: Additional context
+            use_knowledge_base: Whether to include research-backed insights
+            max_tokens: Completion tokens to leave room for
+
+        Returns:
+            User prompt, with the context trimmed to fit the context window
+        """
+        system_prompt = self._followup_system_prompt
+
+        # Only send what the cached catalog does not already carry
+        if self._catalog and context:
+            catalog = self._catalog
+            context = {
+                key: value for key, value in context.items()
+                if key not in catalog or catalog[key] != value
+            }
 
         recommendations_text = "\n".join([
             f"- {loc}: ROI {roi:.2f}"
-            for loc, roi in list(recommendations.items())[:5]
+            for loc, roi in islice(recommendations.items(), 5)
         ])
 
         # Get research-backed insights from knowledge base
         research_context = ""
-        if use_knowledge_base:
+        if use_knowledge_base and self.enabled:
             try:
-                kb = get_knowledge_base()
-                research_context = kb.get_context_for_llm(question, max_sources=2, include_citations=False)
+                kb = _knowledge_base_future().result(timeout=KNOWLEDGE_BASE_TIMEOUT)
+                research_context = kb.get_context_for_llm(research_query, max_sources=2, include_citations=False)
+            except TimeoutError:
+                logger.warning(
+                    f"Knowledge base not loaded after {KNOWLEDGE_BASE_TIMEOUT}s, "
+                    f"answering without research context"
+                )
             except Exception as e:
                 logger.warning(f"Failed to load knowledge base: {e}")
 
-        user_prompt = f"""Question: {question}
-
-Product: {product['name']} (${product['price']:.2f}, {product['category']}, Budget: ${product.get('budget', 'N/A')})
-
-Top Recommendations:
-{recommendations_text}
-
-Analysis Context: {json.dumps(context, indent=2) if context else 'Basic analysis only'}
-
-{research_context}
-
-Answer in 3-5 concise sentences with specific data points. If research is provided, reference it naturally (e.g., "Studies show...")."""
-
-        return self.generate(
-            prompt=user_prompt,
-            system_prompt=system_prompt,
-            temperature=0.5,
-            max_tokens=500
-        )
+        fields = {
+            **question_fields,
+            'name': product['name'],
+            'price': product['price'],
+            'category': product['category'],
+            'budget': product.get('budget', 'N/A'),
+            'recommendations_text': recommendations_text,
+            'context_text': self._followup_context_text(context),
+            'research_context': research_context
+        }
+        user_prompt = template.format_map(fields)
+
+        # Trim the context when the request could exceed the model's window.
+        # UTF-8 byte length bounds the token count, so most prompts skip counting.
+        prompt_limit = self.context_window - max_tokens
+        if context and len(system_prompt.encode('utf-8')) + len(user_prompt.encode('utf-8')) > prompt_limit:
+            fixed_tokens = _count_tokens(system_prompt) + _count_tokens(
+                template.format_map({**fields, 'context_text': ''})
+            )
+            context = _fit_context(context, prompt_limit - fixed_tokens)
+            fields['context_text'] = self._followup_context_text(context)
+            user_prompt = template.format_map(fields)
+
+        return user_prompt
+
+    def _followup_context_text(self, context: Optional[Dict[str, Any]]) -> str:
+        """Render follow-up context, pointing at the catalog when nothing is left."""
+        if not context and self._catalog:
+            return "See reference catalog"
+        return _format_context(context)
 
     def generate_insight_summary(
         self,
@@ -358,31 +2341,20 @@ Answer in 3-5 concise sentences with specific data points. If research is provid
         Returns:
             Structured insight summary
         """
-        system_prompt = """You are an executive analyst preparing a placement strategy summary.
-Generate a JSON response with these sections:
-
-{
-  "executive_summary": "2-3 sentence overview",
-  "key_insights": ["insight 1", "insight 2", "insight 3"],
-  "success_factors": ["factor 1", "factor 2", "factor 3"],
-  "risks": ["risk 1", "risk 2"],
-  "recommendation": "Primary recommendation with rationale"
-}"""
+        system_prompt = INSIGHT_SUMMARY_SYSTEM_PROMPT
 
         locations_text = "\n".join([
             f"- {loc['zone_name']}: ROI {roi_scores.get(loc['zone_name'], 0):.2f}"
             for loc in top_locations[:3]
         ])
 
-        user_prompt = f"""Generate executive summary for this placement analysis:
-
-Product: {product['name']} (${product['price']:.2f}, {product['category']})
-Budget: ${product.get('budget', 'unknown')}
-
-Top Locations:
-{locations_text}
-
-Respond with JSON only."""
+        user_prompt = INSIGHT_SUMMARY_TEMPLATE.format_map({
+            'name': product['name'],
+            'price': product['price'],
+            'category': product['category'],
+            'budget': product.get('budget', 'unknown'),
+            'locations_text': locations_text
+        })
 
         return self.generate_json(
             prompt=user_prompt,
@@ -391,36 +2363,322 @@ Respond with JSON only."""
         )
 
 
+class LLMClientPool(LLMClient):
+    """
+    Routes requests across several LLM clients with automatic failover.
+
+    Each request goes to the member with the fewest in-flight requests
+    relative to its weight. When a member still fails with a transient error
+    after its own retries, or its circuit breaker is open, the next member
+    is tried. A member that hits a rate limit fails over immediately and is
+    rested for the provider's Retry-After period. Members share the first
+    member's response and semantic caches.
+    """
+
+    def __init__(self, clients: List[LLMClient], weights: Optional[List[float]] = None):
+        """
+        Initialize client pool.
+
+        Args:
+            clients: Member clients; disabled clients are skipped
+            weights: Relative capacity of each client (defaults to equal)
+        """
+        weights = weights or [1.0] * len(clients)
+        members = [(c, w) for c, w in zip(clients, weights) if c.enabled and w > 0]
+
+        self.members = [c for c, _ in members]
+        self.weights = [w for _, w in members]
+        self._load = [0] * len(self.members)
+        self._cooldown_until = [0.0] * len(self.members)
+        self._load_lock = threading.Lock()
+
+        if not self.members:
+            # Same state as an LLMClient without an API key
+            self._catalog: Dict[str, Any] = {}
+            self._catalog_digest: Optional[str] = None
+            self._followup_system_prompt = FOLLOWUP_SYSTEM_PROMPT
+            self.enabled = False
+            logger.warning("No enabled LLM clients in pool. LLM features will be disabled.")
+            return
+
+        # The pool is set up as a client of the primary member's endpoint,
+        # which serves requests that are not routed per call (Batch API jobs)
+        primary = self.members[0]
+        super().__init__(
+            api_key=primary._api_key,
+            base_url=primary.base_url,
+            model=primary.model,
+            temperature=primary.temperature,
+            max_tokens=primary.max_tokens,
+            cache_size=0,
+            context_window=min(member.context_window for member in self.members)
+        )
+        self.client = primary.client
+        self.response_cache = primary.response_cache
+        self.semantic_cache = primary.semantic_cache
+        self.supports_json_mode = all(member.supports_json_mode for member in self.members)
+        for member in self.members[1:]:
+            member.response_cache = primary.response_cache
+        if len(self.members) > 1:
+            for member in self.members:
+                member.failover_on_rate_limit = True
+
+        logger.info(f"LLM client pool initialized with {len(self.members)} endpoints")
+
+    def _route(self) -> List[int]:
+        """
+        Return enabled member indices ordered from least to most loaded.
+
+        Members cooling down after a rate limit go last, ordered by how soon
+        they become available again.
+        """
+        now = time.monotonic()
+        with self._load_lock:
+            enabled = [i for i, member in enumerate(self.members) if member.enabled]
+            ready = sorted(
+                (i for i in enabled if self._cooldown_until[i] <= now),
+                key=lambda i: self._load[i] / self.weights[i]
+            )
+            cooling = sorted(
+                (i for i in enabled if self._cooldown_until[i] > now),
+                key=lambda i: self._cooldown_until[i]
+            )
+            return ready + cooling
+
+    def _cool_down(self, index: int, error: Exception) -> None:
+        """Rest a member after a rate limit error."""
+        cooldown = _rate_limit_cooldown(error)
+        if cooldown is None:
+            return
+        with self._load_lock:
+            self._cooldown_until[index] = max(
+                self._cooldown_until[index],
+                time.monotonic() + min(cooldown, RETRY_MAX_DELAY)
+            )
+
+    def warm_up(self):
+        """Warm the connection of the member the next request is routed to."""
+        if not self.enabled:
+            return
+        order = self._route()
+        if order:
+            self.members[order[0]].warm_up()
+
+    def _generate_uncached(
+        self,
+        prompt: str,
+        system_prompt: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        json_mode: bool,
+        kwargs: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Try members in routing order until one succeeds.
+
+        Each member builds its own request (members may run different
+        models); the pool's _generate() caches the reply once.
+        """
+        last_error: Optional[Exception] = None
+
+        for attempt in range(RETRY_ATTEMPTS):
+            for index in self._route():
+                member = self.members[index]
+                with self._load_lock:
+                    self._load[index] += 1
+                try:
+                    return member._generate_uncached(prompt, system_prompt, temperature, max_tokens, json_mode)
+                except Exception as e:
+                    # Transient failures and rejected credentials (which disable
+                    # the member) fall through to the next endpoint
+                    if not isinstance(e, (CircuitOpenError,) + _retryable_errors()) and member.enabled:
+                        raise
+                    last_error = e
+                    self._cool_down(index, e)
+                    logger.warning(f"LLM endpoint {member.base_url or 'default'} failed, trying next: {e}")
+                finally:
+                    with self._load_lock:
+                        self._load[index] -= 1
+
+            # Every endpoint is rate limited: wait for the first to come back
+            if (last_error is None or attempt == RETRY_ATTEMPTS - 1
+                    or _rate_limit_cooldown(last_error) is None):
+                break
+            route = self._route()
+            if not route:
+                break
+            delay = max(self._cooldown_until[route[0]] - time.monotonic(), 0.0)
+            logger.warning(f"All LLM endpoints rate limited, waiting {delay:.1f}s")
+            time.sleep(delay)
+
+        if last_error is None:
+            self.enabled = False
+            raise RuntimeError("No enabled LLM endpoints in pool")
+        raise last_error
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        json_mode: bool = False
+    ) -> Iterator[str]:
+        """Stream from the least loaded member (no failover once streaming)."""
+        route = self._route() if self.enabled else []
+        if not route:
+            # Same single chunk a disabled LLMClient yields
+            return iter((self.generate(prompt, system_prompt, temperature, max_tokens, json_mode),))
+        member = self.members[route[0]]
+        return member.generate_stream(prompt, system_prompt, temperature, max_tokens, json_mode)
+
+    async def generate_many(
+        self,
+        items: List[Dict[str, Any]],
+        concurrency: int = 20
+    ) -> List[str]:
+        """
+        Spread a batch across members in proportion to their weights.
+
+        Each member runs its share with up to `concurrency` requests in flight.
+        """
+        if not self.enabled:
+            logger.warning("LLM client not enabled, returning empty responses")
+            return [""] * len(items)
+
+        # Weighted round-robin assignment of item indices to members
+        shares: List[List[int]] = [[] for _ in self.members]
+        credit = [0.0] * len(self.members)
+        total_weight = sum(self.weights)
+        for i in range(len(items)):
+            for m, weight in enumerate(self.weights):
+                credit[m] += weight
+            chosen = max(range(len(self.members)), key=lambda m: credit[m])
+            credit[chosen] -= total_weight
+            shares[chosen].append(i)
+
+        results: List[str] = [""] * len(items)
+        outputs = await asyncio.gather(*(
+            member.generate_many([items[i] for i in share], concurrency=concurrency)
+            for member, share in zip(self.members, shares) if share
+        ))
+        for share, output in zip((share for share in shares if share), outputs):
+            for i, text in zip(share, output):
+                results[i] = text
+        return results
+
+    def purge_expired(self) -> int:
+        """Delete expired entries from the shared persistent response cache."""
+        if not self.enabled:
+            return 0
+        return self.members[0].purge_expired()
+
+
 # Global LLM client instance
 _llm_client: Optional[LLMClient] = None
+_llm_client_lock = threading.Lock()
+
+
+def _split_keys(value: Optional[str]) -> List[str]:
+    """Parse a comma-separated list of API keys."""
+    return [key.strip() for key in (value or '').split(',') if key.strip()]
+
+
+def _build_llm_client() -> LLMClient:
+    """Create an LLM client from environment settings."""
+    _load_env()
+
+    # Try to initialize with available API keys
+    api_key = os.getenv('OPENAI_API_KEY') or os.getenv('OPENROUTER_API_KEY')
+    base_url = os.getenv('OPENAI_API_BASE')
+    model = os.getenv('LLM_MODEL', "gpt-4o-mini")
+    temperature = float(os.getenv('LLM_TEMPERATURE', '0.7'))
+    max_tokens = int(os.getenv('LLM_MAX_TOKENS', '1500'))
+    cache_size = int(os.getenv('LLM_CACHE_SIZE', '1024'))
+    cache_ttl = float(os.getenv('LLM_CACHE_TTL', '1800'))
+    semantic_threshold = os.getenv('LLM_SEMANTIC_CACHE_THRESHOLD')
+    requests_per_minute = float(os.getenv('LLM_REQUESTS_PER_MINUTE', '500'))
+    cache_db = os.getenv('LLM_CACHE_DB')
+    context_window = int(os.getenv('LLM_CONTEXT_WINDOW', str(DEFAULT_CONTEXT_WINDOW)))
+    batch_window = float(os.getenv('LLM_BATCH_WINDOW_MS', '0')) / 1000.0
+    openrouter_key = os.getenv('OPENROUTER_API_KEY')
+    openrouter_url = "https://openrouter.ai/api/v1"
+    # Default model, use Claude for OpenRouter
+    openrouter_model = "anthropic/claude-3.5-sonnet" if model == "gpt-4o-mini" else model
+
+    # Comma-separated key lists spread load over several rate limits
+    openai_keys = _split_keys(os.getenv('OPENAI_API_KEYS')) or _split_keys(os.getenv('OPENAI_API_KEY'))
+    openrouter_keys = _split_keys(os.getenv('OPENROUTER_API_KEYS')) or _split_keys(openrouter_key)
+    endpoints = (
+        [(key, base_url or "https://api.openai.com/v1", model) for key in openai_keys]
+        + [(key, openrouter_url, openrouter_model) for key in openrouter_keys]
+    )
+
+    # Several keys or providers configured: route across them with failover
+    if len(endpoints) > 1:
+        first_key, first_url, first_model = endpoints[0]
+        return LLMClientPool([
+            LLMClient(
+                api_key=first_key,
+                base_url=first_url,
+                model=first_model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                cache_size=cache_size,
+                cache_ttl=cache_ttl,
+                semantic_cache_threshold=float(semantic_threshold) if semantic_threshold else None,
+                requests_per_minute=requests_per_minute,
+                cache_db=cache_db,
+                context_window=context_window,
+                batch_window=batch_window
+            )
+        ] + [
+            # Share the first client's caches
+            LLMClient(
+                api_key=key,
+                base_url=url,
+                model=endpoint_model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                cache_size=0,
+                requests_per_minute=requests_per_minute,
+                context_window=context_window,
+                batch_window=batch_window
+            )
+            for key, url, endpoint_model in endpoints[1:]
+        ])
+
+    if endpoints:
+        api_key = endpoints[0][0]
+
+    # Use OpenRouter if available (and no custom base URL)
+    if openrouter_keys and not base_url:
+        base_url = openrouter_url
+        model = openrouter_model
+
+    return LLMClient(
+        api_key=api_key,
+        base_url=base_url,
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        cache_size=cache_size,
+        cache_ttl=cache_ttl,
+        semantic_cache_threshold=float(semantic_threshold) if semantic_threshold else None,
+        requests_per_minute=requests_per_minute,
+        cache_db=cache_db,
+        context_window=context_window,
+        batch_window=batch_window
+    )
 
 
 def get_llm_client() -> LLMClient:
     """Get or create global LLM client instance."""
     global _llm_client
-
     if _llm_client is None:
-        # Try to initialize with available API keys
-        api_key = os.getenv('OPENAI_API_KEY') or os.getenv('OPENROUTER_API_KEY')
-        base_url = os.getenv('OPENAI_API_BASE')
-        model = os.getenv('LLM_MODEL', "gpt-4o-mini")
-        temperature = float(os.getenv('LLM_TEMPERATURE', '0.7'))
-        max_tokens = int(os.getenv('LLM_MAX_TOKENS', '1500'))
-
-        # Use OpenRouter if available (and no custom base URL)
-        if os.getenv('OPENROUTER_API_KEY') and not base_url:
-            base_url = "https://openrouter.ai/api/v1"
-            if model == "gpt-4o-mini":  # Default model, use Claude for OpenRouter
-                model = "anthropic/claude-3.5-sonnet"
-
-        _llm_client = LLMClient(
-            api_key=api_key,
-            base_url=base_url,
-            model=model,
-            temperature=temperature,
-            max_tokens=max_tokens
-        )
-
+        with _llm_client_lock:
+            if _llm_client is None:
+                _llm_client = _build_llm_client()
     return _llm_client
 
 
@@ -1,5 +1,5 @@
 """
-State Transition Logger - Logs agent state transitions as JSON files.
+State Transition Logger - Logs agent state transitions as JSON Lines.
 
 Provides comprehensive logging of:
 - Agent inputs and outputs
@@ -11,13 +11,211 @@ Provides comprehensive logging of:
 
 import json
 import logging
+import os
+import queue
+import threading
+import time
+import weakref
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 from pydantic import BaseModel
+from models.schemas import PlacementState
+
+# Use orjson for faster serialization when available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# orjson.Fragment (orjson >= 3.9) embeds pre-encoded JSON
+ORJSON_FRAGMENTS = ORJSON_AVAILABLE and hasattr(orjson, 'Fragment')
 
 logger = logging.getLogger(__name__)
 
+# Per-session log file when not writing one file per event
+SESSION_LOG_FILENAME = "events.jsonl"
+
+# Detail level of each event type (standard logging levels); events below
+# STATE_LOG_LEVEL are skipped before any serialization
+AGENT_IO_LEVEL = logging.DEBUG
+TRANSFORMATION_LEVEL = logging.DEBUG
+TRANSITION_LEVEL = logging.INFO
+DECISION_LEVEL = logging.INFO
+EVENT_LEVEL = logging.INFO
+ERROR_LEVEL = logging.ERROR
+
+# Background writer: records waiting before callers block, and records
+# written per flush
+LOG_QUEUE_SIZE = 10_000
+LOG_BATCH_SIZE = 256
+
+# Batch buffer reused (overwritten in place) by the writer; reallocated at
+# the initial size once a large batch grows it past the soft max
+LOG_BUFFER_INITIAL_SIZE = 128 * 1024
+LOG_BUFFER_SOFT_MAX = 1 << 20
+
+# PlacementState fields logged by default (pydantic include spec); pass
+# full=True to the log_* methods for the whole state
+PLACEMENT_STATE_LOG_FIELDS = {
+    "session_id": True,
+    "product": {"product_name", "category"},
+    "locations": {"__all__": {"name"}},
+    "roi_predictions": True,
+    "final_recommendations": True,
+    "errors": True,
+    "warnings": True,
+}
+
+
+def _parse_log_level(value: Optional[str]) -> int:
+    """Parse a level name ("INFO") or number ("20"), defaulting to DEBUG."""
+    if not value:
+        return logging.DEBUG
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    return level if isinstance(level, int) else logging.DEBUG
+
+
+def _encode_record(record: Dict[str, Any], pretty: bool = False) -> bytes:
+    """
+    Encode a log record as UTF-8 JSON.
+
+    Args:
+        record: Log record
+        pretty: Indent with two spaces instead of writing one compact line
+
+    Returns:
+        Encoded JSON (without trailing newline)
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(record, default=str, option=option)
+    if pretty:
+        return json.dumps(record, indent=2, default=str).encode('utf-8')
+    return json.dumps(record, default=str, separators=(',', ':')).encode('utf-8')
+
+
+def _serialize_value(obj: Any) -> Any:
+    """Convert obj to a JSON-compatible value using the handler for its type."""
+    return _resolve_serializer(type(obj))(obj)
+
+
+def _serialize_identity(obj: Any) -> Any:
+    return obj
+
+
+# Serialized frozen models by id(), each entry dropped when its model is
+# garbage collected so ids are never confused
+_frozen_model_cache: Dict[int, Tuple[weakref.ref, Any]] = {}
+
+
+def _encode_model(obj: BaseModel) -> Any:
+    # Let pydantic-core encode the model in one pass and splice the bytes
+    # into the record, instead of building a dict for orjson to re-walk
+    if ORJSON_FRAGMENTS:
+        return orjson.Fragment(obj.model_dump_json(fallback=str))
+    return obj.model_dump()
+
+
+def _serialize_projection(obj: BaseModel, include: Any) -> Any:
+    # Dump only the included fields, in one pydantic-core pass
+    if ORJSON_FRAGMENTS:
+        return orjson.Fragment(obj.model_dump_json(include=include, fallback=str))
+    return obj.model_dump(include=include)
+
+
+def _serialize_model(obj: BaseModel) -> Any:
+    if not obj.model_config.get('frozen'):
+        return _encode_model(obj)
+
+    # Frozen models cannot change, so each is encoded once however many
+    # events include it
+    key = id(obj)
+    cached = _frozen_model_cache.get(key)
+    if cached is not None and cached[0]() is obj:
+        return cached[1]
+
+    encoded = _encode_model(obj)
+    _frozen_model_cache[key] = (
+        weakref.ref(obj, lambda _, key=key: _frozen_model_cache.pop(key, None)),
+        encoded
+    )
+    return encoded
+
+
+def _serialize_dict(obj: Dict) -> Dict:
+    # Dicts may contain Pydantic models
+    return {key: _serialize_value(value) for key, value in obj.items()}
+
+
+def _serialize_list(obj: Any) -> list:
+    return [_serialize_value(item) for item in obj]
+
+
+def _serialize_datetime(obj: datetime) -> str:
+    return obj.isoformat()
+
+
+def _serialize_object(obj: Any) -> Any:
+    try:
+        return _serialize_value(obj.__dict__)
+    except Exception:
+        return str(obj)
+
+
+@lru_cache(maxsize=256)
+def _resolve_serializer(cls: type) -> Callable[[Any], Any]:
+    """
+    Pick the serializer for a type, walking its MRO once per type.
+
+    Args:
+        cls: Type of the value being serialized
+
+    Returns:
+        Handler converting values of that type
+    """
+    if issubclass(cls, BaseModel):
+        return _serialize_model
+    if issubclass(cls, dict):
+        return _serialize_dict
+    if issubclass(cls, (list, tuple)):
+        return _serialize_list
+    if issubclass(cls, datetime):
+        return _serialize_datetime
+    # Instances carry a __dict__ (plain classes, dataclasses)
+    if getattr(cls, '__dictoffset__', 0):
+        return _serialize_object
+    # Return as-is for primitives
+    return _serialize_identity
+
+
+# Event filenames repeat across sessions (a handful of agents, steps and
+# decision names), so each is built once
+
+@lru_cache(maxsize=64)
+def _agent_io_filename(agent_name: str, step_number: Optional[int], direction: str) -> str:
+    """Filename of an agent input/output event (e.g. "step1_inputagent_input.json")."""
+    prefix = f"step{step_number}_" if step_number is not None else ""
+    return f"{prefix}{agent_name.lower()}_{direction}.json"
+
+
+@lru_cache(maxsize=256)
+def _transition_filename(from_agent: str, to_agent: str) -> str:
+    """Filename of a state transition event."""
+    return f"transition_{from_agent.lower()}_to_{to_agent.lower()}.json"
+
+
+@lru_cache(maxsize=256)
+def _named_event_filename(kind: str, name: str) -> str:
+    """Filename of a named event (e.g. "decision_budget_check.json")."""
+    return f"{kind}_{name.lower().replace(' ', '_')}.json"
+
 
 class StateLogger:
     """
@@ -30,18 +228,51 @@ class StateLogger:
     - Performance metrics
     """
 
-    def __init__(self, log_dir: str = "logs/state_transitions"):
+    def __init__(
+        self,
+        log_dir: str = "logs/state_transitions",
+        legacy_per_file: bool = False,
+        min_level: Optional[int] = None
+    ):
         """
         Initialize state logger.
 
         Args:
             log_dir: Directory to store state transition logs
+            legacy_per_file: Write each event to its own pretty-printed JSON
+                file instead of appending to the session's events.jsonl
+            min_level: Skip events below this logging level (defaults to the
+                STATE_LOG_LEVEL environment variable, else DEBUG: log everything)
         """
+        # Created with the first session, so constructing a logger never
+        # touches the disk
         self.log_dir = Path(log_dir)
-        self.log_dir.mkdir(parents=True, exist_ok=True)
         self.session_log_dir: Optional[Path] = None
+        self.legacy_per_file = legacy_per_file
+        self.min_level = min_level if min_level is not None else _parse_log_level(os.getenv("STATE_LOG_LEVEL"))
+        self._log_queue: Optional[queue.Queue] = None
+        self._log_writer: Optional[threading.Thread] = None
+        self._log_writer_lock = threading.Lock()
+        # (epoch second, its ISO prefix) for _now()
+        self._timestamp_base: Tuple[int, str] = (-1, "")
+        # Logged fields of state models, by model type (see register_projection)
+        self._projections: Dict[type, Any] = {}
+        self.register_projection(PlacementState, PLACEMENT_STATE_LOG_FIELDS)
         logger.info(f"✓ State logger initialized: {self.log_dir}")
 
+    def register_projection(self, model_type: type, fields: Any):
+        """
+        Log only some fields of a state model.
+
+        Applies to the state passed to log_agent_input, log_agent_output and
+        log_state_transition, unless they are called with full=True.
+
+        Args:
+            model_type: Pydantic model class
+            fields: Field names, or a pydantic include dict for nested fields
+        """
+        self._projections[model_type] = fields
+
     def start_session(self, session_id: str):
         """
         Start a new logging session.
@@ -50,6 +281,8 @@ class StateLogger:
             session_id: Unique session identifier
         """
         # Create session-specific directory
+        self._stop_log_writer()
+        _frozen_model_cache.clear()
         self.session_log_dir = self.log_dir / session_id
         self.session_log_dir.mkdir(parents=True, exist_ok=True)
 
@@ -58,7 +291,6 @@ class StateLogger:
             "session_start",
             {
                 "session_id": session_id,
-                "timestamp": datetime.now().isoformat(),
                 "log_directory": str(self.session_log_dir)
             }
         )
@@ -69,7 +301,8 @@ class StateLogger:
         self,
         agent_name: str,
         state: Any,
-        step_number: Optional[int] = None
+        step_number: Optional[int] = None,
+        full: bool = False
     ):
         """
         Log agent input state.
@@ -78,16 +311,20 @@ class StateLogger:
             agent_name: Name of the agent
             state: Input state (Pydantic model or dict)
             step_number: Optional step number in workflow
+            full: Log the whole state instead of its registered projection
         """
+        if not self._should_log(AGENT_IO_LEVEL):
+            return
+
         data = {
             "event": "agent_input",
             "agent": agent_name,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._now(),
             "step": step_number,
-            "state": self._serialize(state)
+            "state": self._serialize_state(state, full)
         }
 
-        filename = f"{self._get_step_prefix(step_number)}{agent_name.lower()}_input.json"
+        filename = _agent_io_filename(agent_name, step_number, "input")
         self._write_log(filename, data)
 
     def log_agent_output(
@@ -95,7 +332,8 @@ class StateLogger:
         agent_name: str,
         state: Any,
         step_number: Optional[int] = None,
-        metrics: Optional[Dict] = None
+        metrics: Optional[Dict] = None,
+        full: bool = False
     ):
         """
         Log agent output state.
@@ -105,17 +343,21 @@ class StateLogger:
             state: Output state (Pydantic model or dict)
             step_number: Optional step number in workflow
             metrics: Optional performance metrics
+            full: Log the whole state instead of its registered projection
         """
+        if not self._should_log(AGENT_IO_LEVEL):
+            return
+
         data = {
             "event": "agent_output",
             "agent": agent_name,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._now(),
             "step": step_number,
-            "state": self._serialize(state),
+            "state": self._serialize_state(state, full),
             "metrics": metrics or {}
         }
 
-        filename = f"{self._get_step_prefix(step_number)}{agent_name.lower()}_output.json"
+        filename = _agent_io_filename(agent_name, step_number, "output")
         self._write_log(filename, data)
 
     def log_state_transition(
@@ -123,7 +365,8 @@ class StateLogger:
         from_agent: str,
         to_agent: str,
         state: Any,
-        decision: Optional[Dict] = None
+        decision: Optional[Dict] = None,
+        full: bool = False
     ):
         """
         Log state transition between agents.
@@ -133,17 +376,21 @@ class StateLogger:
             to_agent: Destination agent name
             state: State being passed
             decision: Optional decision/routing information
+            full: Log the whole state instead of its registered projection
         """
+        if not self._should_log(TRANSITION_LEVEL):
+            return
+
         data = {
             "event": "state_transition",
             "from_agent": from_agent,
             "to_agent": to_agent,
-            "timestamp": datetime.now().isoformat(),
-            "state": self._serialize(state),
+            "timestamp": self._now(),
+            "state": self._serialize_state(state, full),
             "decision": decision or {}
         }
 
-        filename = f"transition_{from_agent.lower()}_to_{to_agent.lower()}.json"
+        filename = _transition_filename(from_agent, to_agent)
         self._write_log(filename, data)
 
     def log_decision_point(
@@ -162,16 +409,19 @@ class StateLogger:
             result: Boolean result (True/False)
             context: Additional context about the decision
         """
+        if not self._should_log(DECISION_LEVEL):
+            return
+
         data = {
             "event": "decision_point",
             "decision": decision_name,
             "condition": condition,
             "result": result,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._now(),
             "context": context or {}
         }
 
-        filename = f"decision_{decision_name.lower().replace(' ', '_')}.json"
+        filename = _named_event_filename("decision", decision_name)
         self._write_log(filename, data)
 
     def log_data_transformation(
@@ -190,16 +440,19 @@ class StateLogger:
             output_data: Output data after transformation
             agent: Optional agent performing transformation
         """
+        if not self._should_log(TRANSFORMATION_LEVEL):
+            return
+
         data = {
             "event": "data_transformation",
             "transformation": transformation,
             "agent": agent,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._now(),
             "input": self._serialize(input_data),
             "output": self._serialize(output_data)
         }
 
-        filename = f"transform_{transformation.lower().replace(' ', '_')}.json"
+        filename = _named_event_filename("transform", transformation)
         self._write_log(filename, data)
 
     def log_error(
@@ -218,10 +471,13 @@ class StateLogger:
             state: State at time of error
             context: Additional error context
         """
+        if not self._should_log(ERROR_LEVEL):
+            return
+
         data = {
             "event": "error",
             "agent": agent_name,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._now(),
             "error_type": type(error).__name__,
             "error_message": str(error),
             "state": self._serialize(state),
@@ -239,13 +495,16 @@ class StateLogger:
             event_name: Name of the event
             data: Event data
         """
+        if not self._should_log(EVENT_LEVEL):
+            return
+
         log_data = {
             "event": event_name,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._now(),
             **data
         }
 
-        filename = f"event_{event_name.lower().replace(' ', '_')}.json"
+        filename = _named_event_filename("event", event_name)
         self._write_log(filename, data=log_data)
 
     def end_session(self, summary: Optional[Dict] = None):
@@ -255,15 +514,90 @@ class StateLogger:
         Args:
             summary: Optional session summary
         """
-        data = {
-            "event": "session_end",
-            "timestamp": datetime.now().isoformat(),
-            "summary": summary or {}
-        }
-
-        self.log_event("session_end", data)
+        self.log_event("session_end", {"summary": summary or {}})
+        self._stop_log_writer()
         logger.info(f"✓ Ended logging session: {self.session_log_dir}")
 
+    def _log_queue_for_session(self) -> queue.Queue:
+        """Return the writer queue, starting the background writer if needed."""
+        with self._log_writer_lock:
+            if self._log_writer is None:
+                self._log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+                self._log_writer = threading.Thread(
+                    target=self._drain,
+                    args=(self._log_queue, self.session_log_dir / SESSION_LOG_FILENAME),
+                    name="state-log-writer",
+                    daemon=True
+                )
+                self._log_writer.start()
+            return self._log_queue
+
+    def _stop_log_writer(self):
+        """Write out queued records and stop the background writer, if running."""
+        with self._log_writer_lock:
+            if self._log_writer is None:
+                return
+            self._log_queue.put(None)
+            self._log_writer.join()
+            self._log_queue = None
+            self._log_writer = None
+
+    @staticmethod
+    def _drain(log_queue: queue.Queue, log_path: Path):
+        """
+        Append queued records to log_path until a None sentinel arrives.
+
+        Everything already queued (up to LOG_BATCH_SIZE records) is copied
+        into one reused buffer and written with a single unbuffered write.
+
+        Args:
+            log_queue: Queue of encoded records (JSON lines without newline)
+            log_path: Session JSONL file
+        """
+        try:
+            log_file = open(log_path, 'ab', buffering=0)
+        except Exception as e:
+            logger.error(f"Failed to open session log {log_path}: {e}")
+            log_file = None
+
+        buf = bytearray(LOG_BUFFER_INITIAL_SIZE)
+        stopping = False
+        while not stopping:
+            item = log_queue.get()
+            end = 0
+            count = 0
+            while True:
+                if item is None:
+                    stopping = True
+                    break
+                # Overwrite in place; the buffer only grows past its end
+                buf[end:end + len(item)] = item
+                end += len(item)
+                buf[end:end + 1] = b"\n"
+                end += 1
+                count += 1
+                if count >= LOG_BATCH_SIZE:
+                    break
+                try:
+                    item = log_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if end and log_file is not None:
+                try:
+                    with memoryview(buf)[:end] as view:
+                        written = log_file.write(view)
+                        while written < end:
+                            written += log_file.write(view[written:])
+                except Exception as e:
+                    logger.error(f"Failed to write session log {log_path}: {e}")
+
+            if len(buf) > LOG_BUFFER_SOFT_MAX:
+                buf = bytearray(LOG_BUFFER_INITIAL_SIZE)
+
+        if log_file is not None:
+            log_file.close()
+
     def _serialize(self, obj: Any) -> Any:
         """
         Serialize object to JSON-compatible format.
@@ -272,54 +606,76 @@ class StateLogger:
             obj: Object to serialize (Pydantic model, dict, or primitive)
 
         Returns:
-            JSON-serializable object
+            JSON-serializable object (Pydantic models become pre-encoded
+            orjson fragments when orjson is available)
         """
-        # Handle Pydantic models
-        if isinstance(obj, BaseModel):
-            return obj.model_dump()
+        return _serialize_value(obj)
 
-        # Handle dicts (may contain Pydantic models)
-        if isinstance(obj, dict):
-            return {
-                key: self._serialize(value)
-                for key, value in obj.items()
-            }
-
-        # Handle lists
-        if isinstance(obj, list):
-            return [self._serialize(item) for item in obj]
+    def _serialize_state(self, state: Any, full: bool) -> Any:
+        """
+        Serialize a logged state, projected to its registered fields.
 
-        # Handle datetime
-        if isinstance(obj, datetime):
-            return obj.isoformat()
+        Args:
+            state: State to serialize
+            full: Skip the projection
 
-        # Handle other types that have __dict__
-        if hasattr(obj, '__dict__'):
-            try:
-                return self._serialize(obj.__dict__)
-            except:
-                return str(obj)
+        Returns:
+            JSON-serializable object
+        """
+        include = None if full else self._projections.get(type(state))
+        if include is None:
+            return _serialize_value(state)
+        return _serialize_projection(state, include)
+
+    def _should_log(self, level: int) -> bool:
+        """Check the level gate and active session before building an event."""
+        if level < self.min_level:
+            return False
+        if not self.session_log_dir:
+            logger.warning("No active session, skipping log write")
+            return False
+        return True
 
-        # Return as-is for primitives
-        return obj
+    def _now(self) -> str:
+        """
+        Current local time in ISO 8601 with microseconds.
 
-    def _get_step_prefix(self, step_number: Optional[int]) -> str:
+        The date/time part is formatted once per second; only the
+        microseconds are filled in per call.
+        """
+        ns = time.time_ns()
+        second = ns // 1_000_000_000
+        base_second, base_iso = self._timestamp_base
+        if second != base_second:
+            base_iso = datetime.fromtimestamp(second).isoformat()
+            self._timestamp_base = (second, base_iso)
+        return f"{base_iso}.{ns // 1000 % 1_000_000:06d}"
+
+    def split_session(self, session_id: str) -> int:
         """
-        Get filename prefix for step number.
+        Expand a session's events.jsonl into one JSON file per event.
 
         Args:
-            step_number: Step number
+            session_id: Session identifier
 
         Returns:
-            Prefix string (e.g., "step1_")
+            Number of files written
         """
-        if step_number is not None:
-            return f"step{step_number}_"
-        return ""
+        if self.session_log_dir == self.log_dir / session_id:
+            # Flush everything queued for the running session first
+            self._stop_log_writer()
+        return split_session_log(self.log_dir / session_id)
 
     def _write_log(self, filename: str, data: Dict):
         """
-        Write log data to file.
+        Write log data to the session log.
+
+        Queues one compact JSON line for events.jsonl, recording the legacy
+        per-event filename under "_file" (scripts/split_state_log.py expands
+        it back into separate files). The record is encoded here, so the
+        caller's metrics/decision/context dicts can change afterwards
+        without affecting the log; a background thread does the writing and
+        callers only block when the queue is full.
 
         Args:
             filename: Log filename
@@ -329,15 +685,78 @@ class StateLogger:
             logger.warning("No active session, skipping log write")
             return
 
-        filepath = self.session_log_dir / filename
+        if not self.legacy_per_file:
+            try:
+                line = _encode_record({"_file": filename, **data})
+            except Exception as e:
+                logger.error(f"Failed to write log {filename}: {e}")
+                return
+            self._log_queue_for_session().put(line)
+            return
 
         try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            with open(self.session_log_dir / filename, 'wb') as f:
+                f.write(_encode_record(data, pretty=True))
         except Exception as e:
             logger.error(f"Failed to write log {filename}: {e}")
 
 
+def split_session_log(session_dir: Path) -> int:
+    """
+    Write each record of session_dir/events.jsonl to its own file.
+
+    Recreates the per-event files (e.g. step3_analyzeragentv2_output.json)
+    from the "_file" field. Later records with the same filename overwrite
+    earlier ones, as the per-event logger did.
+
+    Args:
+        session_dir: Session log directory
+
+    Returns:
+        Number of files written
+    """
+    written = 0
+    with open(Path(session_dir) / SESSION_LOG_FILENAME, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            filename = record.pop("_file")
+            with open(Path(session_dir) / filename, 'w') as out:
+                json.dump(record, out, indent=2, default=str)
+            written += 1
+    return written
+
+
+class NullStateLogger:
+    """
+    Stand-in for StateLogger when state logging is disabled.
+
+    Falsy, so `if self.state_logger:` guards skip logging entirely; calls
+    that get through are discarded.
+    """
+
+    log_dir: Optional[Path] = None
+    session_log_dir: Optional[Path] = None
+
+    def __bool__(self) -> bool:
+        return False
+
+    def _discard(self, *args, **kwargs):
+        return None
+
+    register_projection = _discard
+    start_session = _discard
+    end_session = _discard
+    log_agent_input = _discard
+    log_agent_output = _discard
+    log_state_transition = _discard
+    log_decision_point = _discard
+    log_data_transformation = _discard
+    log_error = _discard
+    log_event = _discard
+
+
 # Global state logger instance
 _global_logger: Optional[StateLogger] = None
 
@@ -10,31 +10,52 @@ Advanced multi-agent workflow with:
 - State transition logging
 """
 
+import asyncio
+import functools
+import hashlib
+import json
 import logging
-from typing import Dict, Any, TypedDict, Annotated, Optional
-from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode
-from agents.input_agent import InputAgent
-from agents.filter_agent import LocationFilterAgent
-from agents.analyzer_agent import AnalyzerAgentV2
-from agents.explainer_agent import ExplainerAgent
-from models.schemas import ProductInput, PlacementState, Recommendation
-from utils.state_logger import get_state_logger, init_state_logger
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, List, Any, Tuple, TypedDict, Annotated, Optional, Union
+from uuid import uuid4
+from models.schemas import ProductInput, PlacementState, Recommendation, Explanation
+from utils.state_logger import NullStateLogger, StateLogger, get_state_logger, init_state_logger
+
+# Agents (pandas/polars, LLM SDKs) and LangGraph are imported when the first
+# orchestrator is built, so importing this module stays cheap
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+    from langgraph.graph import StateGraph
+    from agents.base_agent import BaseAgent
 
 logger = logging.getLogger("OrchestratorV2")
 
+# Console format used when the orchestrator is asked to configure logging
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Recommendations reused for repeated identical product inputs
+RESULT_CACHE_SIZE = 128
+RESULT_CACHE_TTL = 1800.0
+
 
 class WorkflowState(TypedDict):
     """
     State passed between workflow nodes.
 
-    LangGraph requires TypedDict for state management.
+    LangGraph requires TypedDict for state management. The PlacementState
+    itself stays in the orchestrator's context store; only its key travels
+    through the graph.
     """
-    # Input
-    product_input: Dict[str, Any]
+    # Input (a raw dict is validated by the first node)
+    product_input: Union[ProductInput, Dict[str, Any]]
 
     # Processing state
-    placement_state: Any  # PlacementState object
+    context_id: str  # Key of the PlacementState in OrchestratorV2._contexts
     step: str
     errors: list
     warnings: list
@@ -44,6 +65,30 @@ class WorkflowState(TypedDict):
     metadata: Dict[str, Any]
 
 
+def _bound(method_name: str) -> Callable[[WorkflowState, "RunnableConfig"], Any]:
+    """
+    Wrap an OrchestratorV2 method as an instance-independent graph callback.
+
+    The orchestrator running the workflow is passed in the invoke config,
+    so one compiled graph can serve every OrchestratorV2 instance.
+
+    Args:
+        method_name: Name of the OrchestratorV2 node or routing method
+
+    Returns:
+        Callback taking (state, config)
+    """
+    # LangGraph injects the config by the annotation, so it must be the class
+    from langchain_core.runnables import RunnableConfig
+
+    def callback(state: WorkflowState, config: RunnableConfig) -> Any:
+        orchestrator = config["configurable"]["orchestrator"]
+        return getattr(orchestrator, method_name)(state)
+
+    callback.__name__ = method_name
+    return callback
+
+
 class OrchestratorV2:
     """
     LangGraph-based orchestrator for multi-agent workflow.
@@ -56,7 +101,17 @@ class OrchestratorV2:
     - Streaming progress updates
     """
 
-    def __init__(self, data_dir: str = "data", config_dir: str = "config", enable_state_logging: bool = True):
+    # Agents by (data_dir, config_dir), shared across instances
+    _agent_pool: Dict[Tuple[str, str], Tuple["BaseAgent", ...]] = {}
+    _agent_pool_lock = threading.Lock()
+    # Bumped by reset_pool(), so results computed from reloaded data differ
+    _agent_pool_generation = 0
+    # Runs ExplainerAgent.prewarm() alongside ROI scoring (LLMClient.warm_up
+    # skips connections that are still warm)
+    _prewarm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explainer-prewarm")
+
+    def __init__(self, data_dir: str = "data", config_dir: str = "config", enable_state_logging: bool = True,
+                 configure_logging: bool = False):
         """
         Initialize orchestrator with agents.
 
@@ -64,54 +119,118 @@ class OrchestratorV2:
             data_dir: Data directory path
             config_dir: Configuration directory path
             enable_state_logging: Enable state transition logging
+            configure_logging: Set up INFO-level console logging if the
+                application hasn't attached a root handler yet
         """
+        if configure_logging and not logging.getLogger().handlers:
+            logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
         logger.info("Initializing LangGraph Orchestrator V2")
 
         # Initialize state logger
         self.enable_state_logging = enable_state_logging
-        if enable_state_logging:
-            self.state_logger = init_state_logger()
-        else:
-            self.state_logger = None
-
-        # Initialize agents with state logging
-        self.input_agent = InputAgent()
-        self.input_agent.step_number = 1
-
-        self.filter_agent = LocationFilterAgent()
-        self.filter_agent.step_number = 2
-
-        self.analyzer_agent = AnalyzerAgentV2(
-            data_dir=data_dir,
-            config_dir=config_dir
+        # Passed to the shared agents on every call. Disabling logging only
+        # affects this orchestrator, not the global logger.
+        self.state_logger = init_state_logger() if enable_state_logging else NullStateLogger()
+
+        # Agents (data loading, LLM clients) are built once per data/config
+        # directory and shared by later instances
+        agents = self._pooled_agents(data_dir, config_dir)
+        # Data the agents were built from, part of every result cache key
+        self._data_version = (
+            os.path.abspath(data_dir), os.path.abspath(config_dir), self._agent_pool_generation
         )
-        self.analyzer_agent.step_number = 3
-
-        self.explainer_agent = ExplainerAgent(data_dir=data_dir)
-        self.explainer_agent.step_number = 4
-
-        # Build workflow graph
+        self.input_agent, self.filter_agent, self.analyzer_agent, self.explainer_agent = agents
+
+        # PlacementState and state logger of each running workflow, by
+        # WorkflowState context_id
+        self._contexts: Dict[str, PlacementState] = {}
+        self._context_loggers: Dict[str, Union[StateLogger, NullStateLogger]] = {}
+        # The state logger records one session at a time; held from
+        # start_session() to end_session()
+        self._session_lock = threading.Lock()
+
+        # Product fingerprint -> (expires_at, Recommendation), least recently
+        # used first
+        self._result_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+
+        # Compiled workflow graph (built once, shared by all instances)
         self.workflow = self._build_workflow()
 
         logger.info("✓ Orchestrator initialized")
 
-    def _build_workflow(self) -> StateGraph:
+    @classmethod
+    def _pooled_agents(cls, data_dir: str, config_dir: str) -> Tuple["BaseAgent", ...]:
+        """
+        Get the shared agents for a data/config directory, creating them once.
+
+        Args:
+            data_dir: Data directory path
+            config_dir: Configuration directory path
+
+        Returns:
+            (input, filter, analyzer, explainer) agents
+        """
+        key = (os.path.abspath(data_dir), os.path.abspath(config_dir))
+        with cls._agent_pool_lock:
+            agents = cls._agent_pool.get(key)
+            if agents is None:
+                from agents.input_agent import InputAgent
+                from agents.filter_agent import LocationFilterAgent
+                from agents.analyzer_agent import AnalyzerAgentV2
+                from agents.explainer_agent import ExplainerAgent
+
+                input_agent = InputAgent()
+                input_agent.step_number = 1
+
+                filter_agent = LocationFilterAgent()
+                filter_agent.step_number = 2
+
+                analyzer_agent = AnalyzerAgentV2(
+                    data_dir=data_dir,
+                    config_dir=config_dir
+                )
+                analyzer_agent.step_number = 3
+
+                explainer_agent = ExplainerAgent(data_dir=data_dir)
+                explainer_agent.step_number = 4
+
+                agents = (input_agent, filter_agent, analyzer_agent, explainer_agent)
+                cls._agent_pool[key] = agents
+            return agents
+
+    @classmethod
+    def reset_pool(cls):
+        """Drop the shared agents, so the next instance reloads its data."""
+        with cls._agent_pool_lock:
+            cls._agent_pool.clear()
+            cls._agent_pool_generation += 1
+
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _build_workflow(cls) -> "StateGraph":
         """
         Build LangGraph state machine.
 
+        The graph shape is static, so it is compiled once per process. Nodes
+        resolve the orchestrator from the invoke config (see _bound).
+
         Returns:
             Compiled workflow graph
         """
+        from langgraph.graph import StateGraph, END
+
         # Create graph
         workflow = StateGraph(WorkflowState)
 
         # Add nodes
-        workflow.add_node("validate_input", self._validate_input_node)
-        workflow.add_node("filter_locations", self._filter_locations_node)
-        workflow.add_node("check_data_quality", self._check_data_quality_node)
-        workflow.add_node("analyze_roi", self._analyze_roi_node)
-        workflow.add_node("explain", self._explain_node)
-        workflow.add_node("handle_error", self._handle_error_node)
+        workflow.add_node("validate_input", _bound("_validate_input_node"))
+        workflow.add_node("filter_locations", _bound("_filter_locations_node"))
+        workflow.add_node("check_data_quality", _bound("_check_data_quality_node"))
+        workflow.add_node("analyze_roi", _bound("_analyze_roi_node"))
+        workflow.add_node("explain", _bound("_explain_node"))
+        workflow.add_node("handle_error", _bound("_handle_error_node"))
 
         # Define edges
         workflow.set_entry_point("validate_input")
@@ -119,7 +238,7 @@ class OrchestratorV2:
         # From validation → filter
         workflow.add_conditional_edges(
             "validate_input",
-            self._should_continue_from_validation,
+            _bound("_should_continue_from_validation"),
             {
                 "continue": "filter_locations",
                 "error": "handle_error"
@@ -132,7 +251,7 @@ class OrchestratorV2:
         # From data quality check → analysis
         workflow.add_conditional_edges(
             "check_data_quality",
-            self._route_based_on_quality,
+            _bound("_route_based_on_quality"),
             {
                 "analyze": "analyze_roi",
                 "warning": "analyze_roi",  # Continue with warning
@@ -143,7 +262,7 @@ class OrchestratorV2:
         # From ROI analysis
         workflow.add_conditional_edges(
             "analyze_roi",
-            self._should_continue_from_analysis,
+            _bound("_should_continue_from_analysis"),
             {
                 "continue": "explain",
                 "error": "handle_error"
@@ -169,30 +288,36 @@ class OrchestratorV2:
         Returns:
             Updated state
         """
-        logger.info("[STEP 1/4] Validating input...")
+        logger.info("[STEP 1/5] Validating input...")
 
         try:
-            # Convert dict to ProductInput
-            product_input = ProductInput(**state['product_input'])
+            # Validated models pass straight through (ProductInput is frozen)
+            product_input = state['product_input']
+            if not isinstance(product_input, ProductInput):
+                product_input = ProductInput(**product_input)
 
             # Create PlacementState
             placement_state = PlacementState(product=product_input)
 
             # Run validation with state logging
-            placement_state = self.input_agent.execute_with_logging(placement_state)
+            placement_state = self.input_agent.execute_with_logging(
+                placement_state, state_logger=self._context_loggers[state['context_id']]
+            )
 
             # Load locations from analyzer agent (needed for filtering)
             placement_state.locations = self.analyzer_agent.locations
 
-            state['placement_state'] = placement_state
+            self._contexts[state['context_id']] = placement_state
             state['step'] = 'validated'
+            # Shared with the PlacementState (agents update it in place), so
+            # later agents' errors and warnings show up here without copying
             state['errors'] = placement_state.errors
             state['warnings'] = placement_state.warnings
 
             logger.info("✓ Input validation complete")
 
         except Exception as e:
-            logger.error(f"✗ Input validation failed: {e}")
+            logger.error("✗ Input validation failed: %s", e)
             state['errors'] = [str(e)]
             state['step'] = 'validation_error'
 
@@ -211,19 +336,21 @@ class OrchestratorV2:
         logger.info("[STEP 2/5] Filtering illogical placements...")
 
         try:
-            placement_state = state['placement_state']
+            placement_state = self._contexts[state['context_id']]
 
             # Run filter agent with state logging
-            placement_state = self.filter_agent.execute_with_logging(placement_state)
+            placement_state = self.filter_agent.execute_with_logging(
+                placement_state, state_logger=self._context_loggers[state['context_id']]
+            )
 
-            state['placement_state'] = placement_state
-            state['warnings'].extend(placement_state.warnings)
+            self._contexts[state['context_id']] = placement_state
             state['step'] = 'filtered'
 
-            logger.info(f"✓ Location filtering complete: {len(placement_state.locations)} valid locations")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✓ Location filtering complete: %d valid locations", len(placement_state.locations))
 
         except Exception as e:
-            logger.error(f"✗ Location filtering error: {e}")
+            logger.error("✗ Location filtering error: %s", e)
             # Don't fail the whole workflow, just warn
             state['warnings'].append(f"Location filtering failed: {e}")
             state['step'] = 'filter_warning'
@@ -250,8 +377,9 @@ class OrchestratorV2:
                 quality = metadata['data_quality']
                 state['metadata'] = {'data_quality': quality}
 
-                logger.info(f"Data quality: {quality['quality_level']}")
-                logger.info(f"Confidence: {quality['confidence_score']:.1%}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Data quality: %s", quality['quality_level'])
+                    logger.info("Confidence: %.1f%%", quality['confidence_score'] * 100)
 
                 if quality['quality_level'] in ['poor']:
                     state['warnings'].append(quality['recommendation'])
@@ -276,24 +404,28 @@ class OrchestratorV2:
         logger.info("[STEP 4/5] Analyzing ROI...")
 
         try:
-            placement_state = state['placement_state']
+            placement_state = self._contexts[state['context_id']]
+
+            # Overlap the explainer's LLM connection setup with ROI scoring
+            self._prewarm_executor.submit(self.explainer_agent.prewarm)
 
             # Run analysis with state logging
-            placement_state = self.analyzer_agent.execute_with_logging(placement_state)
+            placement_state = self.analyzer_agent.execute_with_logging(
+                placement_state, state_logger=self._context_loggers[state['context_id']]
+            )
 
-            state['placement_state'] = placement_state
-            state['errors'].extend(placement_state.errors)
+            self._contexts[state['context_id']] = placement_state
             state['step'] = 'analyzed'
 
             if placement_state.errors:
-                logger.error(f"✗ ROI analysis failed: {placement_state.errors}")
-            else:
-                logger.info(f"✓ Generated {len(placement_state.roi_predictions)} ROI predictions")
+                logger.error("✗ ROI analysis failed: %s", placement_state.errors)
+            elif logger.isEnabledFor(logging.INFO):
+                logger.info("✓ Generated %d ROI predictions", len(placement_state.roi_predictions))
 
         except Exception as e:
             import traceback
-            logger.error(f"✗ ROI analysis error: {e}")
-            logger.error(f"Full traceback:\n{traceback.format_exc()}")
+            logger.error("✗ ROI analysis error: %s", e)
+            logger.error("Full traceback:\n%s", traceback.format_exc())
             state['errors'].append(str(e))
             state['step'] = 'analysis_error'
 
@@ -312,26 +444,23 @@ class OrchestratorV2:
         logger.info("[STEP 5/5] Generating explanations...")
 
         try:
-            placement_state = state['placement_state']
+            placement_state = self._contexts[state['context_id']]
 
             # Generate explanation with state logging
-            placement_state = self.explainer_agent.execute_with_logging(placement_state)
+            placement_state = self.explainer_agent.execute_with_logging(
+                placement_state, state_logger=self._context_loggers[state['context_id']]
+            )
 
-            state['placement_state'] = placement_state
+            self._contexts[state['context_id']] = placement_state
             state['step'] = 'complete'
 
-            # Create final recommendation
-            state['recommendation'] = {
-                'recommendations': placement_state.final_recommendations,
-                'explanation': placement_state.explanation.dict() if placement_state.explanation else None,
-                'session_id': placement_state.session_id,
-                'timestamp': placement_state.timestamp.isoformat()
-            }
+            # The Recommendation is assembled by execute() from the
+            # PlacementState once the run is known to have succeeded
 
             logger.info("✓ Explanation generated")
 
         except Exception as e:
-            logger.error(f"✗ Explanation generation error: {e}")
+            logger.error("✗ Explanation generation error: %s", e)
             state['errors'].append(str(e))
             state['step'] = 'explanation_error'
 
@@ -347,7 +476,7 @@ class OrchestratorV2:
         Returns:
             Updated state with error info
         """
-        logger.error(f"[ERROR HANDLER] Step: {state['step']}, Errors: {state['errors']}")
+        logger.error("[ERROR HANDLER] Step: %s, Errors: %s", state['step'], state['errors'])
 
         state['recommendation'] = {
             'success': False,
@@ -391,6 +520,10 @@ class OrchestratorV2:
         """
         Execute workflow (backward compatible API).
 
+        Runs with a state logging session wait for any other logged run of
+        this orchestrator to finish; runs without one log nothing and never
+        wait.
+
         Args:
             product_input: Product input
             session_id: Optional session ID for state logging
@@ -398,18 +531,51 @@ class OrchestratorV2:
         Returns:
             Recommendation object
         """
-        logger.info("=" * 80)
-        logger.info("STARTING LANGGRAPH WORKFLOW")
-        logger.info("=" * 80)
+        if self.state_logger and session_id:
+            with self._session_lock:
+                return self._execute(product_input, session_id, self.state_logger)
+        return self._execute(product_input, session_id, NullStateLogger())
+
+    def _execute(self, product_input: ProductInput, session_id: Optional[str],
+                 state_logger: Union[StateLogger, NullStateLogger]) -> Recommendation:
+        """
+        Run the workflow, logging to state_logger's session if it is enabled.
+
+        Args:
+            product_input: Product input
+            session_id: Session ID for state logging
+            state_logger: Logger the agents write to for this run
+
+        Returns:
+            Recommendation object
+        """
+        cache_key = self._result_cache_key(product_input)
+        cached = self._cached_result(cache_key)
+        if cached is not None:
+            logger.info("Reusing recommendation for identical product input")
+            if state_logger:
+                state_logger.start_session(session_id)
+                state_logger.end_session(summary={
+                    "status": "success",
+                    "cache_hit": True,
+                    "top_recommendation": next(iter(cached.recommendations), None),
+                    "recommendations_count": len(cached.recommendations)
+                })
+            return cached
+
+        logger.info("Starting LangGraph workflow")
 
         # Start state logging session if enabled
-        if self.state_logger and session_id:
-            self.state_logger.start_session(session_id)
-            logger.info(f"✓ State logging enabled for session: {session_id}")
+        if state_logger:
+            state_logger.start_session(session_id)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("✓ State logging enabled for session: %s", session_id)
 
-        # Convert to dict for LangGraph
+        context_id = uuid4().hex
+        self._context_loggers[context_id] = state_logger
         initial_state = {
-            'product_input': product_input.dict(),
+            'product_input': product_input,
+            'context_id': context_id,
             'step': 'init',
             'errors': [],
             'warnings': [],
@@ -419,7 +585,10 @@ class OrchestratorV2:
 
         # Run workflow
         try:
-            final_state = self.workflow.invoke(initial_state)
+            final_state = self.workflow.invoke(
+                initial_state,
+                config={"configurable": {"orchestrator": self}}
+            )
 
             # Check for success
             if final_state['errors']:
@@ -427,52 +596,227 @@ class OrchestratorV2:
                 raise ValueError(f"Workflow failed: {'; '.join(final_state['errors'])}")
 
             # Extract recommendation
-            placement_state = final_state['placement_state']
+            placement_state = self._contexts[context_id]
 
-            recommendation = Recommendation(
-                recommendations=placement_state.final_recommendations,
-                explanation=placement_state.explanation,
-                session_id=placement_state.session_id,
-                timestamp=placement_state.timestamp
-            )
+            # Fields come from the validated PlacementState; only a missing
+            # result needs the validating constructor (to raise)
+            recommendation_fields = {
+                'recommendations': placement_state.final_recommendations,
+                'explanation': placement_state.explanation,
+                'session_id': placement_state.session_id,
+                'timestamp': placement_state.timestamp
+            }
+            if placement_state.final_recommendations is not None and placement_state.explanation is not None:
+                recommendation = Recommendation.model_construct(**recommendation_fields)
+            else:
+                recommendation = Recommendation(**recommendation_fields)
 
-            logger.info("=" * 80)
-            logger.info("WORKFLOW COMPLETED SUCCESSFULLY")
-            logger.info("=" * 80)
+            logger.info("Workflow completed successfully")
+            # The caller may modify the returned object; cache a private copy
+            self._store_result(cache_key, recommendation.model_copy(deep=True))
 
             # Log warnings
-            if final_state['warnings']:
-                logger.warning("Workflow warnings:")
-                for warning in final_state['warnings']:
-                    logger.warning(f"  - {warning}")
+            if final_state['warnings'] and logger.isEnabledFor(logging.WARNING):
+                logger.warning("Workflow warnings:\n%s", "\n".join(f"  - {warning}" for warning in final_state['warnings']))
 
             # End state logging session
-            if self.state_logger and session_id:
+            if state_logger:
                 summary = {
                     "status": "success",
-                    "top_recommendation": list(recommendation.recommendations.keys())[0] if recommendation.recommendations else None,
+                    "top_recommendation": next(iter(recommendation.recommendations), None),
                     "recommendations_count": len(recommendation.recommendations),
                     "errors_count": len(final_state['errors']),
                     "warnings_count": len(final_state['warnings'])
                 }
-                self.state_logger.end_session(summary=summary)
-                logger.info(f"✓ State logging completed for session: {session_id}")
+                state_logger.end_session(summary=summary)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("✓ State logging completed for session: %s", session_id)
 
             return recommendation
 
         except Exception as e:
-            logger.error(f"Workflow execution failed: {e}")
+            logger.error("Workflow execution failed: %s", e)
 
             # End state logging session with error
-            if self.state_logger and session_id:
+            if state_logger:
                 summary = {
                     "status": "error",
                     "error": str(e)
                 }
-                self.state_logger.end_session(summary=summary)
+                state_logger.end_session(summary=summary)
 
             raise
 
+        finally:
+            self._contexts.pop(context_id, None)
+            self._context_loggers.pop(context_id, None)
+
+    def _result_cache_key(self, product_input: Union[ProductInput, Dict[str, Any]]) -> str:
+        """Fingerprint a product input by its field values and the agents' data."""
+        fields = product_input.model_dump() if isinstance(product_input, ProductInput) else product_input
+        payload = json.dumps([self._data_version, fields], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _cached_result(self, key: str) -> Optional[Recommendation]:
+        """
+        Return a deep copy of a cached recommendation with a fresh session ID.
+
+        Args:
+            key: Product input fingerprint
+
+        Returns:
+            Recommendation, or None if missing or expired
+        """
+        with self._result_cache_lock:
+            entry = self._result_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, recommendation = entry
+            if expires_at < time.monotonic():
+                del self._result_cache[key]
+                return None
+            self._result_cache.move_to_end(key)
+
+        return recommendation.model_copy(deep=True, update={
+            'session_id': str(uuid4()),
+            'timestamp': datetime.now()
+        })
+
+    def _store_result(self, key: str, recommendation: Recommendation):
+        """Cache a recommendation, evicting the least recently used if full."""
+        with self._result_cache_lock:
+            self._result_cache[key] = (time.monotonic() + RESULT_CACHE_TTL, recommendation)
+            self._result_cache.move_to_end(key)
+            while len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
+    async def aexecute(self, product_input: ProductInput, session_id: Optional[str] = None) -> Recommendation:
+        """
+        Execute workflow without blocking the event loop.
+
+        Runs execute() in a worker thread, so async callers (the API) keep
+        serving other requests while agents compute and wait on the LLM.
+
+        Args:
+            product_input: Product input
+            session_id: Optional session ID for state logging
+
+        Returns:
+            Recommendation object
+        """
+        return await asyncio.to_thread(self.execute, product_input, session_id)
+
+    def answer_followup(self, session_id: str, question: str, state: PlacementState = None) -> str:
+        """
+        Answer a follow-up question about a recommendation.
+
+        Args:
+            session_id: Session ID from original recommendation
+            question: User's follow-up question
+            state: Original PlacementState
+
+        Returns:
+            Answer to the question
+        """
+        return self.answer_followups_batch(session_id, [question], state)[0]
+
+    def answer_followups_batch(self, session_id: str, questions: List[str], state: PlacementState = None) -> List[str]:
+        """
+        Answer several follow-up questions, sharing LLM requests between them.
+
+        Args:
+            session_id: Session ID from original recommendation
+            questions: User's follow-up questions
+            state: Original PlacementState
+
+        Returns:
+            One answer per question, in order
+        """
+        if state is None:
+            return ["Session not found. Please run a new analysis."] * len(questions)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Answering %d follow-up question(s) for session %s", len(questions), session_id)
+
+        return self.explainer_agent.answer_followup_questions(state, questions)
+
+    def submit_followups(self, session_id: str, questions: List[str], state: PlacementState = None) -> Optional[str]:
+        """
+        Queue follow-up questions for background answering at batch pricing.
+
+        Returns immediately; answers can take hours, so interactive callers
+        should use answer_followups_batch() instead. Collect the answers by
+        calling poll_followups() until it returns a list.
+
+        Args:
+            session_id: Session ID from original recommendation
+            questions: Follow-up questions
+            state: Original PlacementState
+
+        Returns:
+            Batch ID, or None if the LLM provider offers no Batch API
+        """
+        if state is None:
+            return None
+
+        batch_id = self.explainer_agent.submit_followup_questions(state, questions)
+        if batch_id and logger.isEnabledFor(logging.INFO):
+            logger.info("Queued %d follow-up question(s) for session %s as batch %s",
+                        len(questions), session_id, batch_id)
+        return batch_id
+
+    def poll_followups(self, batch_id: str, questions: List[str], state: PlacementState) -> Optional[List[str]]:
+        """
+        Get the answers of a batch queued with submit_followups().
+
+        Args:
+            batch_id: ID returned by submit_followups()
+            questions: The submitted questions, in order
+            state: PlacementState the questions were submitted with
+
+        Returns:
+            One answer per question, or None while the batch is still running
+        """
+        return self.explainer_agent.fetch_followup_answers(state, batch_id, questions)
+
+    def explain_locations(self, session_id: str, state: PlacementState = None, top_k: int = 5) -> Dict[str, Explanation]:
+        """
+        Explain each of the top recommended locations, not just the first.
+
+        Args:
+            session_id: Session ID from original recommendation
+            state: Original PlacementState
+            top_k: Number of top recommendations to explain
+
+        Returns:
+            Location -> Explanation, in ranking order
+        """
+        if state is None:
+            return {}
+
+        return asyncio.run(self.aexplain_locations(session_id, state, top_k))
+
+    async def aexplain_locations(self, session_id: str, state: PlacementState = None,
+                                 top_k: int = 5) -> Dict[str, Explanation]:
+        """
+        Async variant of explain_locations() for use inside an event loop.
+
+        Args:
+            session_id: Session ID from original recommendation
+            state: Original PlacementState
+            top_k: Number of top recommendations to explain
+
+        Returns:
+            Location -> Explanation, in ranking order
+        """
+        if state is None:
+            return {}
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Explaining top %d location(s) for session %s", top_k, session_id)
+
+        return await self.explainer_agent.aexplain_locations(state, top_k)
+
     def get_status(self) -> Dict[str, Any]:
         """
         Get orchestrator status.